@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the AVI Test Automation Framework
+
+Runs a generated suite against a local mock controller once per engine and
+reports cases/sec, p50/p99 stage latency and peak RSS. Each engine runs in
+its own process so peak RSS is not polluted by the previous run.
+"""
+
+import sys
+import json
+import copy
+import logging
+import argparse
+import resource
+import subprocess
+import time
+
+from framework.mock_controller import MockController
+from framework.test_runner import TestRunner
+from framework.utils import load_config, percentile
+
+ENGINES = TestRunner.ENGINES + ('sharded',)
+STAGES = ('pre_fetcher', 'pre_validation', 'trigger', 'post_validation')
+
+def build_test_cases(count: int, virtual_services: int):
+    test_cases = []
+    for i in range(count):
+        # Pre-validation checks a field the trigger leaves alone, so the
+        # same VS can be hit repeatedly without failing the next case.
+        test_cases.append({
+            'name': f"bench_case_{i + 1}",
+            'target_virtual_service': f"backend-vs-t1r_1000-{i % virtual_services + 1}",
+            'stages': {
+                'pre_fetcher': {'enabled': True, 'components': ['tenants', 'virtual_services', 'service_engines']},
+                'pre_validation': {'enabled': True, 'validate': 'traffic_enabled', 'expected_value': True},
+                'trigger': {'enabled': True, 'action': 'disable', 'payload': {'enabled': False}},
+                'post_validation': {'enabled': True, 'validate': 'enabled', 'expected_value': False}
+            },
+            'mock_operations': []
+        })
+    return test_cases
+
+def run_child(args):
+    from framework.api_client import APIClient
+    from framework.sharding import ShardedRunner
+    
+    logging.basicConfig(level=logging.WARNING)
+    
+    config = copy.deepcopy(load_config(args.config))
+    config['api']['base_url'] = args.base_url
+    config['api'].pop('rate_limit', None)
+    config['framework']['max_workers'] = args.max_workers
+    credentials = {'username': 'bench_user', 'password': 'bench_pass', 'cache_token': False}
+    test_cases = build_test_cases(args.cases, args.virtual_services)
+    
+    start = time.perf_counter()
+    if args.engine == 'sharded':
+        runner = ShardedRunner(config, credentials, {}, workers=args.workers)
+    else:
+        api_client = APIClient.from_config(config['api'], credentials, concurrency=args.max_workers)
+        if not api_client.authenticate():
+            raise SystemExit("benchmark: authentication against mock controller failed")
+        runner = TestRunner(api_client, config, {}, engine=args.engine)
+    results = runner.run_all(test_cases)
+    elapsed = time.perf_counter() - start
+    
+    stage_latency = {}
+    for stage in STAGES:
+        samples = [r['stages'][stage]['duration'] for r in results if stage in r.get('stages', {})]
+        stage_latency[stage] = {
+            'p50': percentile(samples, 50),
+            'p99': percentile(samples, 99)
+        }
+    durations = [r['duration'] for r in results]
+    
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if args.engine == 'sharded':
+        peak_rss_kb = max(peak_rss_kb, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    
+    print(json.dumps({
+        'engine': args.engine,
+        'cases': len(results),
+        'passed': sum(1 for r in results if r['status'] == 'PASS'),
+        'elapsed': elapsed,
+        'cases_per_sec': len(results) / elapsed if elapsed else 0.0,
+        'case_p50': percentile(durations, 50),
+        'case_p99': percentile(durations, 99),
+        'stages': stage_latency,
+        'peak_rss_mb': peak_rss_kb / 1024.0
+    }))
+
+def run_engine(args, engine: str):
+    with MockController(
+        tenants=args.tenants,
+        virtual_services=args.virtual_services,
+        service_engines=args.service_engines,
+        latency=args.latency,
+        error_rate=args.error_rate
+    ) as controller:
+        cmd = [
+            sys.executable, __file__, '--child',
+            '--engine', engine,
+            '--base-url', controller.url,
+            '--config', args.config,
+            '--cases', str(args.cases),
+            '--virtual-services', str(args.virtual_services),
+            '--max-workers', str(args.max_workers),
+            '--workers', str(args.workers)
+        ]
+        output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def print_report(reports):
+    header = f"{'engine':<12}{'cases/s':>10}{'pass':>8}{'case p50':>10}{'case p99':>10}{'rss MB':>9}"
+    print(header)
+    print('-' * len(header))
+    for report in reports:
+        print(f"{report['engine']:<12}{report['cases_per_sec']:>10.1f}"
+              f"{report['passed']:>5}/{report['cases']:<3}"
+              f"{report['case_p50'] * 1000:>8.1f}ms{report['case_p99'] * 1000:>8.1f}ms"
+              f"{report['peak_rss_mb']:>9.1f}")
+    
+    print("\nStage latency (p50 / p99, ms)")
+    print(f"{'engine':<12}" + ''.join(f"{stage:>22}" for stage in STAGES))
+    for report in reports:
+        cells = ''.join(
+            f"{report['stages'][stage]['p50'] * 1000:>10.1f} / {report['stages'][stage]['p99'] * 1000:<9.1f}"
+            for stage in STAGES
+        )
+        print(f"{report['engine']:<12}{cells}")
+
+def main():
+    parser = argparse.ArgumentParser(description='AVI Test Framework benchmark')
+    parser.add_argument('--engines', default=','.join(TestRunner.ENGINES),
+                        help=f"Comma-separated engines to benchmark ({', '.join(ENGINES)})")
+    parser.add_argument('--cases', type=int, default=200, help='Number of generated test cases')
+    parser.add_argument('--tenants', type=int, default=5)
+    parser.add_argument('--virtual-services', type=int, default=2000)
+    parser.add_argument('--service-engines', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='Mock controller latency per request (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Mock controller 503 rate')
+    parser.add_argument('--max-workers', type=int, default=8, help='Concurrency for the threaded engine')
+    parser.add_argument('--workers', type=int, default=4, help='Processes for the sharded engine')
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--output', help='Write the raw JSON report to this file')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--engine', help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    
+    args = parser.parse_args()
+    
+    if args.child:
+        run_child(args)
+        return
+    
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)}")
+    
+    reports = []
+    for engine in engines:
+        print(f"Benchmarking {engine}...", file=sys.stderr)
+        reports.append(run_engine(args, engine))
+    
+    print_report(reports)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(reports, f, indent=2)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,52 +1,220 @@
 import requests
+import contextvars
+import functools
 import logging
-from typing import List, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 from requests.auth import HTTPBasicAuth
+from requests.structures import CaseInsensitiveDict
+
+from .auth import TokenCache
+from .cancellation import CancelToken, Cancelled, sleep
+from .coalesce import SingleFlight
+from .http_cache import ResponseCache, cache_from_config, install as install_http_cache, scope_digest
+from .inventory import VirtualServiceInventory
+from .metrics import RequestMetrics
+from .rate_limiter import TokenBucket
+from .records import DEFAULT_FIELDS, Record, record_type
+from .transport import Timeouts, bind_cancel_token, session_from_config
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ENDPOINTS = {
+    'register': '/register',
+    'login': '/login1',
+    'tenants': '/api/tenant',
+    'virtual_services': '/api/virtualservice',
+    'service_engines': '/api/serviceengine'
+}
+
+class CollectionFetchError(Exception):
+    """A page of a paginated collection could not be fetched, so the walk is
+    incomplete. An empty collection is an empty first page, never this."""
+    
+    def __init__(self, url: str, status: Optional[int] = None, reason: Optional[str] = None):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        detail = f"returned {status}" if reason is None else f"failed: {reason}"
+        super().__init__(f"GET {url} {detail}")
+
 class APIClient:
-    def __init__(self, base_url: str, credentials: Dict):
+    THROTTLE_STATUSES = (429, 503)
+    AUTH_ENDPOINTS = ('register', 'login')
+    
+    def __init__(self, base_url: str, credentials: Dict, inventory_ttl: Optional[float] = 300,
+                 page_size: int = 200, prefetch_pages: bool = False,
+                 rate_limiter: Optional[TokenBucket] = None, throttle_retries: int = 3,
+                 session: Optional[requests.Session] = None, timeouts: Optional[Timeouts] = None,
+                 endpoints: Optional[Dict[str, str]] = None, token_cache: Optional[TokenCache] = None,
+                 delta_refresh: Optional[Dict] = None, projection: Optional[Dict[str, Iterable[str]]] = None,
+                 http_cache: Optional[ResponseCache] = None, cache_endpoints: Iterable[str] = ('tenants', 'service_engines'),
+                 coalesce: bool = True):
         self.base_url = base_url.rstrip('/')
         self.credentials = credentials
-        self.session = requests.Session()
+        self.session = session or requests.Session()
+        self.timeouts = timeouts or Timeouts()
+        self.endpoints = {**DEFAULT_ENDPOINTS, **(endpoints or {})}
         self.token = None
+        self.token_cache = token_cache
+        self._auth_lock = threading.Lock()
+        self.metrics = RequestMetrics()
+        
+        # Incremental VS refresh: conditional page GETs and/or a modified-since filter
+        delta_refresh = delta_refresh or {}
+        self.delta_refresh = delta_refresh.get('enabled', False)
+        self.modified_since_param = delta_refresh.get('modified_since_param')
+        self.full_refresh_interval = delta_refresh.get('full_refresh_interval', 600)
+        self._last_full_refresh: Optional[float] = None
+        self._page_etags: Dict[str, Tuple[str, List[Dict], Optional[str]]] = {}
+        self._page_lock = threading.Lock()
+        self.inventory = VirtualServiceInventory(ttl=inventory_ttl)
+        self.page_size = page_size
+        self.prefetch_pages = prefetch_pages
+        self.rate_limiter = rate_limiter
+        self.throttle_retries = throttle_retries
+        # Identical GETs (and VS refreshes) issued concurrently share one round-trip
+        self._flights = SingleFlight() if coalesce else None
+        # Bumped by every write to an endpoint. Flight keys include it, so a read
+        # issued after a write never joins one that started before it
+        self._write_epochs: Dict[Optional[str], int] = {}
+        self._write_lock = threading.Lock()
+        self.cancel_token: Optional[CancelToken] = None
+        
+        # Collections listed here are fetched with fields= and kept as slot records
+        self._record_types: Dict[str, type] = {}
+        for endpoint, fields in (projection or {}).items():
+            self.project(endpoint, fields)
         
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         })
+        
+        # Opt-in response cache for rarely changing collections (tenants, SEs)
+        self.http_cache = http_cache
+        self._cache_adapter = None
+        if http_cache is not None:
+            self._cache_adapter = install_http_cache(
+                self.session, self.base_url, http_cache,
+                [self._url(endpoint) for endpoint in cache_endpoints], self._cache_scope
+            )
+    
+    @classmethod
+    def from_config(cls, api_config: Dict, credentials: Dict, concurrency: int = 1) -> 'APIClient':
+        http_cache, cache_endpoints = cache_from_config(api_config.get('http_cache'))
+        return cls(
+            base_url=api_config['base_url'],
+            credentials=credentials,
+            inventory_ttl=api_config.get('inventory_ttl', 300),
+            page_size=api_config.get('page_size', 200),
+            prefetch_pages=api_config.get('prefetch_pages', False),
+            rate_limiter=TokenBucket.from_config(api_config.get('rate_limit')),
+            session=session_from_config(api_config, concurrency),
+            timeouts=Timeouts.from_config(api_config),
+            endpoints=api_config.get('endpoints'),
+            token_cache=TokenCache.from_credentials(credentials),
+            delta_refresh=api_config.get('delta_refresh'),
+            projection=cls._projection_from_config(api_config.get('projection')),
+            http_cache=http_cache,
+            cache_endpoints=cache_endpoints,
+            coalesce=api_config.get('coalesce_requests', True)
+        )
+    
+    @staticmethod
+    def _projection_from_config(config: Optional[Dict]) -> Optional[Dict[str, Iterable[str]]]:
+        if not config or not config.get('enabled', False):
+            return None
+        return {**DEFAULT_FIELDS, **(config.get('fields') or {})}
+    
+    def project(self, endpoint: str, fields: Optional[Iterable[str]]):
+        """Fetch only ``fields`` of ``endpoint`` objects from now on (None for full objects)."""
+        if fields is None:
+            self._record_types.pop(endpoint, None)
+        else:
+            name = ''.join(part.title() for part in endpoint.split('_')) + 'Record'
+            self._record_types[endpoint] = record_type(name, fields, functools.partial(self.get_object, endpoint))
+        self._drop_cached_pages(endpoint)
+    
+    def extend_projection(self, endpoint: str, fields: Iterable[str]) -> bool:
+        record_cls = self._record_types.get(endpoint)
+        if record_cls is None:
+            return False
+        missing = [field for field in fields if field not in record_cls.FIELD_SET]
+        if not missing:
+            return False
+        logger.debug(f"Extending {endpoint} projection with {missing}")
+        self.project(endpoint, [*record_cls.FIELDS, *missing])
+        return True
+    
+    def projected_fields(self, endpoint: str) -> Optional[Tuple[str, ...]]:
+        record_cls = self._record_types.get(endpoint)
+        return record_cls.FIELDS if record_cls else None
+    
+    def to_record(self, endpoint: str, obj: Optional[Mapping]):
+        record_cls = self._record_types.get(endpoint)
+        if record_cls is None or obj is None or isinstance(obj, record_cls):
+            return obj
+        return record_cls(obj)
+    
+    def _drop_cached_pages(self, endpoint: str):
+        prefix = self._url(endpoint)
+        with self._page_lock:
+            for key in [key for key in self._page_etags if key.startswith(prefix)]:
+                del self._page_etags[key]
+        if endpoint == 'virtual_services':
+            # Held records lack the new fields; force a full reload
+            self.inventory.clear()
     
     def authenticate(self) -> bool:
+        if not self.token_cache:
+            return self._login()
+        
         try:
-            # Try to register first
-            register_url = f"{self.base_url}/register"
-            payload = {
-                "username": self.credentials['username'],
-                "password": self.credentials['password']
-            }
-            
-            try:
-                self.session.post(register_url, json=payload, timeout=10)
-            except:
-                pass
+            with self.token_cache.lock():
+                token = self.token_cache.load(self._token_scope())
+                if token:
+                    logger.debug("Using cached authentication token")
+                    self._set_token(token)
+                    return True
+                return self._login()
+        except OSError as e:
+            logger.warning(f"Token cache unavailable ({str(e)}), logging in directly")
+            return self._login()
+    
+    def _login(self, register: bool = True) -> bool:
+        try:
+            if register:
+                # Try to register first
+                register_url = self._url('register')
+                payload = {
+                    "username": self.credentials['username'],
+                    "password": self.credentials['password']
+                }
+                
+                try:
+                    self._request('POST', register_url, endpoint='register', json=payload)
+                except:
+                    pass
             
             # Login to get token
-            login_url = f"{self.base_url}/login1"
-            response = self.session.post(
+            login_url = self._url('login')
+            response = self._request(
+                'POST',
                 login_url,
-                auth=HTTPBasicAuth(self.credentials['username'], self.credentials['password']),
-                timeout=10
+                endpoint='login',
+                auth=HTTPBasicAuth(self.credentials['username'], self.credentials['password'])
             )
             
             if response.status_code == 200:
-                data = response.json()
-                self.token = data.get('token')
+                token = response.json().get('token')
                 
-                if self.token:
-                    self.session.headers.update({
-                        'Authorization': f'Bearer {self.token}'
-                    })
+                if token:
+                    self._set_token(token)
+                    if self.token_cache:
+                        self.token_cache.store(self._token_scope(), token)
                     return True
             return False
             
@@ -54,46 +222,398 @@ class APIClient:
             logger.error(f"Authentication error: {str(e)}")
             return False
     
+    def _refresh_token(self, rejected_token: Optional[str]) -> bool:
+        # Single flight: the first worker to see a 401 logs in, everyone
+        # queued behind it picks up the new token instead of logging in again.
+        with self._auth_lock:
+            if self.token and self.token != rejected_token:
+                return True
+            
+            logger.info("Authentication token rejected, re-authenticating")
+            if not self.token_cache:
+                return self._login(register=False)
+            
+            with self.token_cache.lock():
+                scope = self._token_scope()
+                cached = self.token_cache.load(scope)
+                if cached and cached != rejected_token:
+                    # Another process already refreshed it
+                    self._set_token(cached)
+                    return True
+                self.token_cache.invalidate(scope, rejected_token)
+                return self._login(register=False)
+    
+    def _set_token(self, token: str):
+        self.token = token
+        self.session.headers.update({
+            'Authorization': f'Bearer {token}'
+        })
+    
+    def _token_scope(self) -> str:
+        return f"{self.base_url}|{self.credentials['username']}"
+    
+    def _cache_scope(self) -> str:
+        # Hashed so usernames do not end up in the disk tier
+        return scope_digest(self._token_scope())
+    
+    def _cached_fresh(self, method: str, url: str, kwargs: Dict) -> bool:
+        """Whether this request will be answered from the HTTP cache without a round-trip."""
+        if self._cache_adapter is None or method != 'GET':
+            return False
+        if any(header in (kwargs.get('headers') or {}) for header in ('If-None-Match', 'If-Modified-Since')):
+            return False
+        prepared_url = requests.Request(method, url, params=kwargs.get('params')).prepare().url
+        if self._cache_adapter.cacheable_prefix(prepared_url) is None:
+            return False
+        return self.http_cache.is_fresh(ResponseCache.key(self._cache_scope(), method, prepared_url))
+    
+    def _url(self, endpoint: str, suffix: str = '') -> str:
+        return f"{self.base_url}{self.endpoints[endpoint]}{suffix}"
+    
+    def bind_cancel_token(self, token: Optional[CancelToken]):
+        """Fail this client's requests with ``Cancelled`` once ``token`` is cancelled,
+        aborting those already on the wire. None unbinds."""
+        self.cancel_token = token
+        bind_cancel_token(self.session, token)
+    
+    @property
+    def coalesced_requests(self) -> int:
+        return self._flights.coalesced if self._flights else 0
+    
+    def _write_epoch(self, endpoint: Optional[str]) -> int:
+        with self._write_lock:
+            return self._write_epochs.get(endpoint, 0)
+    
+    def _request(self, method: str, url: str, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+        if method != 'GET':
+            try:
+                return self._request_once(method, url, endpoint, **kwargs)
+            finally:
+                with self._write_lock:
+                    self._write_epochs[endpoint] = self._write_epochs.get(endpoint, 0) + 1
+        if self._flights is None:
+            return self._request_once(method, url, endpoint, **kwargs)
+        
+        key = (
+            method,
+            requests.Request(method, url, params=kwargs.get('params')).prepare().url,
+            tuple(sorted((kwargs.get('headers') or {}).items())),
+            self._write_epoch(endpoint)
+        )
+        response = self._flights.do(key, functools.partial(self._shared_request, method, url, endpoint, kwargs))
+        return self._copy_response(response)
+    
+    def _shared_request(self, method: str, url: str, endpoint: Optional[str], kwargs: Dict) -> requests.Response:
+        response = self._request_once(method, url, endpoint, **kwargs)
+        # Read the body before the response is handed to other threads so
+        # nobody touches the stream afterwards
+        response.content
+        return response
+    
+    @staticmethod
+    def _copy_response(response: requests.Response) -> requests.Response:
+        # Every waiter gets the same response from the flight; hand each
+        # caller its own so changing headers or cookies stays local
+        copy = requests.Response()
+        copy.__dict__.update(response.__dict__)
+        copy.headers = CaseInsensitiveDict(response.headers)
+        copy.cookies = response.cookies.copy()
+        copy.history = list(response.history)
+        return copy
+    
+    def _request_once(self, method: str, url: str, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeouts.for_endpoint(endpoint))
+        token_used = self.token
+        response = self._send(method, url, endpoint, **kwargs)
+        
+        if response.status_code == 401 and token_used and endpoint not in self.AUTH_ENDPOINTS:
+            if self._refresh_token(token_used):
+                response = self._send(method, url, endpoint, **kwargs)
+        return response
+    
+    def _send(self, method: str, url: str, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+        attempt = 0
+        while True:
+            if self.cancel_token is not None:
+                self.cancel_token.raise_if_cancelled()
+            # Cache hits never reach the controller, so they don't spend rate budget
+            if self.rate_limiter and not self._cached_fresh(method, url, kwargs):
+                self.rate_limiter.acquire(cancel_token=self.cancel_token)
+            
+            response = self._timed_request(method, url, endpoint, **kwargs)
+            
+            if response.status_code not in self.THROTTLE_STATUSES:
+                if self.rate_limiter and not getattr(response, 'from_cache', False):
+                    self.rate_limiter.reward()
+                return response
+            
+            retry_after = self._retry_after(response)
+            if self.rate_limiter:
+                self.rate_limiter.penalize(retry_after)
+            
+            if attempt >= self.throttle_retries:
+                return response
+            attempt += 1
+            
+            if not self.rate_limiter:
+                # Without a shared limiter, back off locally before retrying
+                sleep(retry_after if retry_after is not None else 2 ** attempt * 0.5, self.cancel_token)
+            logger.debug("%s %s throttled (%s), retry %s/%s", method, url, response.status_code,
+                         attempt, self.throttle_retries)
+    
+    def _timed_request(self, method: str, url: str, endpoint: Optional[str], **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            self.metrics.record(method, endpoint, None, time.perf_counter() - start)
+            if self.cancel_token is not None:
+                # The connection may have been shut down under us by the cancellation
+                try:
+                    self.cancel_token.raise_if_cancelled()
+                except Cancelled as cancelled:
+                    raise cancelled from e
+            raise
+        
+        if getattr(response, 'from_cache', False):
+            # Request metrics count controller round-trips; the cache keeps its own counters
+            return response
+        
+        body = response.request.body or b''
+        self.metrics.record(
+            method,
+            endpoint,
+            response.status_code,
+            time.perf_counter() - start,
+            bytes_sent=len(body),
+            # Content-Length is the on-the-wire size when the body was gzipped
+            bytes_received=int(response.headers.get('Content-Length') or len(response.content))
+        )
+        return response
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+    
+    def iter_tenants(self, page_size: Optional[int] = None,
+                     prefetch: Optional[bool] = None) -> Iterator[Dict]:
+        return self._iter_collection('tenants', page_size, prefetch)
+    
+    def iter_virtual_services(self, page_size: Optional[int] = None,
+                              prefetch: Optional[bool] = None) -> Iterator[Dict]:
+        return self._iter_collection('virtual_services', page_size, prefetch)
+    
+    def iter_service_engines(self, page_size: Optional[int] = None,
+                             prefetch: Optional[bool] = None) -> Iterator[Dict]:
+        return self._iter_collection('service_engines', page_size, prefetch)
+    
     def get_tenants(self) -> List[Dict]:
+        return list(self.iter_tenants())
+    
+    def get_virtual_services(self, refresh: bool = False) -> List[Dict]:
+        # The objects are the inventory's own, frozen and shared with every
+        # caller; copy one (dict(vs)) to build a payload from it
+        if not refresh and self.inventory.is_fresh():
+            self._refresh_stale_virtual_services()
+            return self.inventory.all()
+        
+        if self._flights is None:
+            return list(self._reload_virtual_services())
+        # Parallel test cases tend to refresh together; the first one does the
+        # work and the rest get their own list over the same objects
+        key = ('refresh', 'virtual_services', self._write_epoch('virtual_services'))
+        return list(self._flights.do(key, self._reload_virtual_services))
+    
+    def _reload_virtual_services(self) -> Tuple[Dict, ...]:
+        if self.delta_refresh and self.inventory.loaded:
+            self._delta_refresh_virtual_services()
+            return tuple(self.inventory.all())
+        
         try:
-            response = self.session.get(f"{self.base_url}/api/tenant", timeout=10)
-            if response.status_code == 200:
-                return response.json().get('results', [])
-            return []
-        except:
-            return []
+            virtual_services = tuple(self._iter_collection('virtual_services', conditional=self.delta_refresh))
+        except CollectionFetchError as e:
+            if not self.inventory.loaded:
+                raise
+            # A partial listing is not a listing; stay on the last complete one
+            logger.warning(f"Virtual service refresh failed, keeping previous inventory: {str(e)}")
+            return tuple(self.inventory.all())
+        if virtual_services:
+            self.inventory.load(virtual_services)
+            self._last_full_refresh = time.monotonic()
+            return tuple(self.inventory.all())
+        return virtual_services
     
-    def get_virtual_services(self) -> List[Dict]:
+    def get_virtual_service(self, uuid: str) -> Optional[Dict]:
+        return self.get_object('virtual_services', uuid)
+    
+    def get_object(self, endpoint: str, uuid: str) -> Optional[Dict]:
+        """Full (unprojected) object by uuid; also backs lazy loads of records."""
         try:
-            response = self.session.get(f"{self.base_url}/api/virtualservice", timeout=10)
+            url = self._url(endpoint, f"/{uuid}")
+            response = self._request('GET', url, endpoint=endpoint)
             if response.status_code == 200:
-                return response.json().get('results', [])
-            return []
-        except:
-            return []
+                return response.json()
+            logger.debug("GET %s returned %s", url, response.status_code)
+            return None
+        except Exception as e:
+            logger.warning(f"GET {endpoint} {uuid} failed: {str(e)}")
+            return None
     
     def get_service_engines(self) -> List[Dict]:
-        try:
-            response = self.session.get(f"{self.base_url}/api/serviceengine", timeout=10)
-            if response.status_code == 200:
-                return response.json().get('results', [])
-            return []
-        except:
-            return []
+        return list(self.iter_service_engines())
     
     def get_virtual_service_by_name(self, name: str) -> Optional[Dict]:
-        virtual_services = self.get_virtual_services()
-        for vs in virtual_services:
-            if vs.get('name') == name:
-                return vs
-        return None
+        if not self.inventory.is_fresh():
+            self.get_virtual_services(refresh=True)
+        
+        vs = self.inventory.get_by_name(name)
+        if vs is not None and self.inventory.is_stale(vs.get('uuid')):
+            vs = self._refresh_virtual_service(vs.get('uuid'))
+        return vs
+    
+    def invalidate_inventory(self, uuid: Optional[str] = None):
+        self.inventory.invalidate(uuid)
     
     def update_virtual_service(self, uuid: str, payload: Dict) -> Optional[Dict]:
         try:
-            url = f"{self.base_url}/api/virtualservice/{uuid}"
-            response = self.session.put(url, json=payload, timeout=10)
+            url = self._url('virtual_services', f"/{uuid}")
+            response = self._request('PUT', url, endpoint='virtual_services', json=payload)
             if response.status_code == 200:
+                # The PUT response is not guaranteed to be the full object,
+                # so re-read this entry on its next lookup.
+                self.inventory.invalidate(uuid)
                 return response.json()
+            logger.warning(f"PUT {url} returned {response.status_code}")
             return None
-        except:
-            return None
\ No newline at end of file
+        except Exception as e:
+            logger.warning(f"PUT virtual service {uuid} failed: {str(e)}")
+            return None
+    
+    def _refresh_virtual_service(self, uuid: str) -> Optional[Dict]:
+        vs = self.get_virtual_service(uuid)
+        if vs is not None:
+            self.inventory.upsert(self.to_record('virtual_services', vs))
+            return self.inventory.get_by_uuid(uuid)
+        
+        # Fall back to a full reload if the single-object endpoint is unavailable
+        self.get_virtual_services(refresh=True)
+        return self.inventory.get_by_uuid(uuid)
+    
+    def _delta_refresh_virtual_services(self):
+        full_refresh_due = (self._last_full_refresh is None or
+                            time.monotonic() - self._last_full_refresh >= self.full_refresh_interval)
+        
+        # Both walks are applied only once they reached the last page: merging
+        # a partial listing would drop every VS it missed, and patching one
+        # would move last_modified past changes that were never fetched.
+        if self.modified_since_param and self.inventory.last_modified and not full_refresh_due:
+            # Only objects changed since the newest one we hold; deletions are
+            # picked up by the periodic full refresh below.
+            try:
+                changed = list(self._iter_collection(
+                    'virtual_services',
+                    params={self.modified_since_param: self.inventory.last_modified}
+                ))
+            except CollectionFetchError as e:
+                logger.warning(f"Delta refresh failed, keeping previous inventory: {str(e)}")
+                return
+            patched = self.inventory.patch(changed)
+            logger.debug(f"Delta refresh patched {patched} virtual services")
+            return
+        
+        # Full walk, but pages the controller reports unchanged (304) are
+        # served from the previous listing and unchanged objects are kept.
+        try:
+            virtual_services = list(self._iter_collection('virtual_services', conditional=True))
+        except CollectionFetchError as e:
+            logger.warning(f"Full refresh failed, keeping previous inventory: {str(e)}")
+            return
+        if virtual_services:
+            self.inventory.merge(virtual_services)
+            self._last_full_refresh = time.monotonic()
+    
+    def _refresh_stale_virtual_services(self):
+        for uuid in self.inventory.stale_uuids():
+            if self.inventory.is_stale(uuid):
+                self._refresh_virtual_service(uuid)
+    
+    def _iter_collection(self, endpoint: str, page_size: Optional[int] = None,
+                         prefetch: Optional[bool] = None, params: Optional[Dict] = None,
+                         conditional: bool = False) -> Iterator[Dict]:
+        # Raises CollectionFetchError if any page fails, so a caller that
+        # consumes the whole walk either sees every object or none
+        page_size = page_size or self.page_size
+        prefetch = self.prefetch_pages if prefetch is None else prefetch
+        record_cls = self._record_types.get(endpoint)
+        if record_cls is not None:
+            # Controllers carry fields= over into the next links
+            params = {**(params or {}), 'fields': ','.join(record_cls.FIELDS)}
+        
+        first_url = self._url(endpoint)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = self._fetch_page(first_url, endpoint, {**(params or {}), 'page': 1, 'page_size': page_size},
+                                    conditional)
+            seen = {first_url}
+            while True:
+                results, next_url = page
+                if next_url in seen:
+                    next_url = None
+                
+                # Start downloading the next page while the caller consumes this one
+                pending = None
+                if executor and next_url:
+                    # Run in a copy of this context so the request is still
+                    # attributed to the caller's stage metrics
+                    pending = executor.submit(contextvars.copy_context().run, self._fetch_page, next_url, endpoint,
+                                              None, conditional)
+                
+                for obj in results:
+                    yield obj
+                
+                if not next_url:
+                    break
+                seen.add(next_url)
+                page = pending.result() if pending else self._fetch_page(next_url, endpoint, None, conditional)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+    
+    def _fetch_page(self, url: str, endpoint: str, params: Optional[Dict] = None,
+                    conditional: bool = False) -> Tuple[List[Dict], Optional[str]]:
+        cache_key = requests.Request('GET', url, params=params).prepare().url if conditional else None
+        headers = {}
+        if cache_key:
+            with self._page_lock:
+                cached = self._page_etags.get(cache_key)
+            if cached:
+                headers['If-None-Match'] = cached[0]
+        
+        try:
+            response = self._request('GET', url, endpoint=endpoint, params=params, headers=headers)
+        except Exception as e:
+            raise CollectionFetchError(url, reason=str(e)) from e
+        if response.status_code == 304 and cache_key and cached:
+            return cached[1], cached[2]
+        if response.status_code != 200:
+            raise CollectionFetchError(url, response.status_code)
+        
+        try:
+            data = response.json()
+            results, next_url = data.get('results', []), data.get('next')
+            record_cls = self._record_types.get(endpoint)
+            if record_cls is not None:
+                results = [record_cls(obj) for obj in results]
+        except Exception as e:
+            raise CollectionFetchError(url, response.status_code, f"unreadable page: {str(e)}") from e
+        etag = response.headers.get('ETag')
+        if cache_key and etag:
+            with self._page_lock:
+                self._page_etags[cache_key] = (etag, results, next_url)
+        return results, next_url
\ No newline at end of file
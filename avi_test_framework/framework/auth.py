@@ -0,0 +1,120 @@
+import base64
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+def token_expiry(token: str, default_ttl: float) -> float:
+    """Return the token's expiry as a unix timestamp.
+
+    JWT tokens carry an ``exp`` claim; anything else is assumed to live for
+    ``default_ttl`` seconds from now.
+    """
+    parts = token.split('.')
+    if len(parts) == 3:
+        try:
+            payload = parts[1] + '=' * (-len(parts[1]) % 4)
+            claims = json.loads(base64.urlsafe_b64decode(payload))
+            if isinstance(claims.get('exp'), (int, float)):
+                return float(claims['exp'])
+        except (ValueError, TypeError):
+            pass
+    return time.time() + default_ttl
+
+class TokenCache:
+    """On-disk bearer token cache shared by every process using the same file.
+
+    Reads and writes happen under an exclusive ``flock`` on a sidecar lock
+    file, so concurrent workers see a consistent cache and only one of them
+    logs in when the token needs replacing.
+    """
+
+    def __init__(self, path: str, default_ttl: float = 3600, expiry_skew: float = 60):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.default_ttl = default_ttl
+        self.expiry_skew = expiry_skew
+        self._thread_lock = threading.RLock()
+
+    @classmethod
+    def from_credentials(cls, credentials: Dict) -> Optional['TokenCache']:
+        if not credentials.get('cache_token'):
+            return None
+        return cls(
+            credentials.get('token_cache_file', '.token_cache'),
+            default_ttl=credentials.get('token_ttl', 3600)
+        )
+
+    @contextmanager
+    def lock(self):
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def load(self, scope: str) -> Optional[str]:
+        entry = self._read().get(scope)
+        if not entry:
+            return None
+        if entry.get('expires_at', 0) - self.expiry_skew <= time.time():
+            logger.debug(f"Cached token for {scope} has expired")
+            return None
+        return entry.get('token')
+
+    def store(self, scope: str, token: str):
+        entries = self._read()
+        entries[scope] = {
+            'token': token,
+            'expires_at': token_expiry(token, self.default_ttl)
+        }
+        self._write(entries)
+
+    def invalidate(self, scope: str, token: Optional[str] = None):
+        entries = self._read()
+        entry = entries.get(scope)
+        if entry and (token is None or entry.get('token') == token):
+            del entries[scope]
+            self._write(entries)
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable token cache {self.path}: {str(e)}")
+            return {}
+
+    def _write(self, entries: Dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.token_cache.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write token cache {self.path}: {str(e)}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
\ No newline at end of file
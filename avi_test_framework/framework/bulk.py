@@ -0,0 +1,141 @@
+import contextvars
+import fnmatch
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from .cancellation import Cancelled, shield
+
+logger = logging.getLogger(__name__)
+
+def ref_uuid(ref: Optional[str]) -> Optional[str]:
+    # Avi refs look like https://ctrl/api/tenant/tenant-<uuid>#admin
+    if not ref:
+        return None
+    return ref.split('#', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+
+def ref_name(ref: Optional[str]) -> Optional[str]:
+    if not ref or '#' not in ref:
+        return None
+    return ref.split('#', 1)[1]
+
+def _matches_ref(ref: Optional[str], wanted: str, names_by_uuid: Mapping[str, str]) -> bool:
+    uuid = ref_uuid(ref)
+    if uuid is None:
+        return False
+    name = ref_name(ref) or names_by_uuid.get(uuid)
+    return fnmatch.fnmatchcase(uuid, wanted) or (name is not None and fnmatch.fnmatchcase(name, wanted))
+
+def select_virtual_services(virtual_services: Iterable[Mapping], selector: Dict,
+                            tenants: Optional[Iterable[Mapping]] = None) -> List[Mapping]:
+    """Filter virtual services by a selector.
+
+    Supported keys are ``name`` (glob), ``tenant`` (name or uuid, glob) and
+    ``se_group`` (name or uuid, glob); all given keys must match.
+    """
+    tenant_names = {t.get('uuid'): t.get('name') for t in (tenants or [])}
+    name_glob = selector.get('name')
+    tenant = selector.get('tenant')
+    se_group = selector.get('se_group')
+    
+    selected = []
+    for vs in virtual_services:
+        if name_glob and not fnmatch.fnmatchcase(vs.get('name') or '', name_glob):
+            continue
+        if tenant and not _matches_ref(vs.get('tenant_ref'), tenant, tenant_names):
+            continue
+        if se_group and not _matches_ref(vs.get('se_group_ref'), se_group, {}):
+            continue
+        selected.append(vs)
+    return selected
+
+class BulkResult:
+    def __init__(self):
+        self.succeeded: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.rolled_back: List[str] = []
+        self.rollback_failed: Dict[str, str] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def to_dict(self) -> Dict:
+        return {
+            'succeeded': len(self.succeeded),
+            'failed': len(self.failed),
+            'rolled_back': len(self.rolled_back),
+            'rollback_failed': len(self.rollback_failed),
+            'failures': dict(self.failed)
+        }
+
+class BulkExecutor:
+    """Applies one payload to many virtual services with bounded concurrency.
+
+    If any update fails and ``rollback`` is set, every update that did
+    succeed is reverted to the VS's original values for the payload keys.
+    """
+
+    def __init__(self, api_client, concurrency: int = 10, rollback: bool = True):
+        self.api_client = api_client
+        self.concurrency = max(1, concurrency)
+        self.rollback = rollback
+
+    def apply(self, virtual_services: List[Mapping], payload: Dict) -> BulkResult:
+        result = BulkResult()
+        originals = {vs['uuid']: {key: vs.get(key) for key in payload} for vs in virtual_services}
+        # PUTs cut off by a cancellation may still have been applied
+        interrupted = []
+        
+        for uuid, error in self._put_all({uuid: payload for uuid in originals}):
+            if error is None:
+                result.succeeded.append(uuid)
+            elif isinstance(error, Cancelled):
+                interrupted.append(uuid)
+                result.failed[uuid] = f"cancelled: {str(error)}"
+            else:
+                result.failed[uuid] = error
+        
+        revert = result.succeeded + interrupted
+        if result.failed and self.rollback and revert:
+            logger.warning(f"Bulk update failed for {len(result.failed)} VS(s), "
+                           f"rolling back {len(revert)} update(s)")
+            # The run's token is cancelled under fail-fast/Ctrl-C; the rollback must still go out
+            with shield():
+                for uuid, error in self._put_all({uuid: originals[uuid] for uuid in revert}):
+                    if error is None:
+                        result.rolled_back.append(uuid)
+                    else:
+                        result.rollback_failed[uuid] = str(error)
+        
+        token = getattr(self.api_client, 'cancel_token', None)
+        if token is not None and token.cancelled:
+            logger.warning(f"Bulk update cancelled after {len(result.succeeded)} update(s): rolled back "
+                           f"{len(result.rolled_back)}, rollback failed for {len(result.rollback_failed)}")
+            token.raise_if_cancelled()
+        return result
+
+    def _put_all(self, payloads: Dict[str, Dict]):
+        token = getattr(self.api_client, 'cancel_token', None)
+        
+        def put(uuid):
+            started = False
+            try:
+                if token is not None:
+                    token.raise_if_cancelled()
+                started = True
+                response = self.api_client.update_virtual_service(uuid, payloads[uuid])
+                return uuid, None if response is not None else 'update rejected by controller'
+            except Cancelled as e:
+                # Only a PUT that may have reached the controller needs reverting
+                return uuid, e if started else f"cancelled before update: {str(e)}"
+            except Exception as e:
+                return uuid, str(e)
+        
+        if len(payloads) <= 1:
+            return [put(uuid) for uuid in payloads]
+        
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(payloads)),
+                                thread_name_prefix='avi-bulk') as executor:
+            futures = [executor.submit(contextvars.copy_context().run, put, uuid) for uuid in payloads]
+            return [future.result() for future in futures]
\ No newline at end of file
@@ -0,0 +1,82 @@
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_shielded = contextvars.ContextVar('cancel_shielded', default=False)
+
+class Cancelled(BaseException):
+    """Raised inside work whose run was cancelled (fail-fast, Ctrl-C).
+
+    Like ``asyncio.CancelledError`` it is not an ``Exception``, so the broad
+    handlers that turn HTTP errors into ``None`` let it through to the runner.
+    """
+
+class CancelToken:
+    """One-shot cancellation signal shared by everything in a run.
+
+    The first ``cancel`` wins: it records the reason, wakes ``wait``-ers and
+    runs the ``on_cancel`` callbacks (which abort in-flight HTTP calls).
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = 'cancelled') -> bool:
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Cancel callback failed: {str(e)}")
+        return True
+
+    def on_cancel(self, callback: Callable[[], None]):
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set() and not _shielded.get():
+            raise Cancelled(self.reason)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+@contextlib.contextmanager
+def shield():
+    """Let cleanup that must finish (rollback PUTs) run in a cancelled run.
+
+    Context-local, so it covers this thread and work submitted with a copy
+    of its context, and nothing else.
+    """
+    reset = _shielded.set(True)
+    try:
+        yield
+    finally:
+        _shielded.reset(reset)
+
+def sleep(seconds: float, token: Optional[CancelToken] = None):
+    """``time.sleep`` that raises ``Cancelled`` as soon as ``token`` is cancelled."""
+    if token is None or _shielded.get():
+        time.sleep(seconds)
+    elif token.wait(seconds):
+        raise Cancelled(token.reason)
\ No newline at end of file
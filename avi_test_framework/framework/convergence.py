@@ -0,0 +1,109 @@
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+from .cancellation import sleep
+
+logger = logging.getLogger(__name__)
+
+class ConvergenceResult:
+    __slots__ = ('uuid', 'converged', 'elapsed', 'polls', 'last')
+
+    def __init__(self, uuid: str, converged: bool = False, elapsed: float = 0.0, polls: int = 0,
+                 last: Optional[Dict] = None):
+        self.uuid = uuid
+        self.converged = converged
+        self.elapsed = elapsed
+        self.polls = polls
+        self.last = last
+
+    def to_dict(self) -> Dict:
+        return {
+            'converged': self.converged,
+            'time_to_converge': self.elapsed,
+            'polls': self.polls
+        }
+
+class ConvergenceWaiter:
+    """Polls virtual services by UUID until a predicate holds or a timeout expires.
+
+    Delays between rounds grow exponentially from ``initial_delay`` up to
+    ``max_delay``. Each round re-reads only the objects that have not yet
+    converged, concurrently up to ``concurrency`` requests.
+    """
+
+    def __init__(self, api_client, timeout: float = 30, initial_delay: float = 0.5,
+                 max_delay: float = 5.0, factor: float = 2.0, concurrency: int = 8):
+        self.api_client = api_client
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.concurrency = max(1, concurrency)
+
+    @classmethod
+    def from_config(cls, api_client, config: Optional[Dict]) -> 'ConvergenceWaiter':
+        config = config or {}
+        return cls(
+            api_client,
+            timeout=config.get('timeout', 30),
+            initial_delay=config.get('initial_delay', 0.5),
+            max_delay=config.get('max_delay', 5.0),
+            factor=config.get('factor', 2.0),
+            concurrency=config.get('concurrency', 8)
+        )
+
+    def wait(self, uuid: str, predicate: Callable[[Dict], bool]) -> ConvergenceResult:
+        return self.wait_many([uuid], predicate)[uuid]
+
+    def wait_many(self, uuids: Iterable[str], predicate: Callable[[Dict], bool]) -> Dict[str, ConvergenceResult]:
+        results = {uuid: ConvergenceResult(uuid) for uuid in uuids}
+        pending = list(results)
+        start = time.monotonic()
+        deadline = start + self.timeout
+        delay = self.initial_delay
+        
+        executor = ThreadPoolExecutor(max_workers=min(self.concurrency, len(pending)) or 1,
+                                      thread_name_prefix='avi-converge') if len(pending) > 1 else None
+        try:
+            while pending:
+                for uuid, vs in self._poll(pending, executor):
+                    result = results[uuid]
+                    result.polls += 1
+                    result.elapsed = time.monotonic() - start
+                    if vs is not None:
+                        result.last = vs
+                        if predicate(vs):
+                            result.converged = True
+                
+                pending = [uuid for uuid in pending if not results[uuid].converged]
+                remaining = deadline - time.monotonic()
+                if not pending or remaining <= 0:
+                    break
+                
+                sleep(min(delay, remaining), getattr(self.api_client, 'cancel_token', None))
+                delay = min(delay * self.factor, self.max_delay)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+        
+        if pending:
+            logger.debug(f"{len(pending)} virtual service(s) did not converge within {self.timeout}s")
+        return results
+
+    def _poll(self, uuids, executor):
+        if executor is None:
+            return [(uuid, self._read(uuid)) for uuid in uuids]
+        futures = [
+            (uuid, executor.submit(contextvars.copy_context().run, self._read, uuid))
+            for uuid in uuids
+        ]
+        return [(uuid, future.result()) for uuid, future in futures]
+
+    def _read(self, uuid: str) -> Optional[Dict]:
+        vs = self.api_client.get_virtual_service(uuid)
+        if vs is not None:
+            self.api_client.inventory.upsert(self.api_client.to_record('virtual_services', vs))
+        return vs
\ No newline at end of file
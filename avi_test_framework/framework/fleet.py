@@ -0,0 +1,275 @@
+import logging
+import time
+from array import array
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional
+
+from .bulk import ref_uuid
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+logger = logging.getLogger(__name__)
+
+OPER_UP = 'OPER_UP'
+ORPHAN_SAMPLE_SIZE = 10
+
+class _Interner:
+    """Maps hashable keys to dense integer codes in first-seen order."""
+    __slots__ = ('codes', 'keys')
+
+    def __init__(self):
+        self.codes: Dict[Hashable, int] = {}
+        self.keys: List[Hashable] = []
+
+    def code(self, key: Hashable) -> int:
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.keys)
+            self.keys.append(key)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def rekey(self, key_func) -> List[int]:
+        """Re-intern under ``key_func(key)``; returns the old-to-new code map."""
+        keys = self.keys
+        self.codes, self.keys = {}, []
+        return [self.code(key_func(key)) for key in keys]
+
+def _column(values: List[int], typecode: str = 'i'):
+    if np is not None:
+        return np.array(values, dtype=np.int32 if typecode == 'i' else np.int8)
+    return array(typecode, values)
+
+def _remap(codes: List[int], mapping: List[int]):
+    if np is not None:
+        return np.array(mapping, dtype=np.int32)[np.array(codes, dtype=np.int32)] if codes else _column([])
+    return array('i', [mapping[code] for code in codes])
+
+def _bincount(codes, size: int, weights=None) -> List[int]:
+    if np is not None:
+        if len(codes) == 0:
+            return [0] * size
+        return np.bincount(codes, weights=weights, minlength=size)[:size].astype(np.int64).tolist()
+    counts = [0] * size
+    if weights is None:
+        for code in codes:
+            counts[code] += 1
+    else:
+        for code, weight in zip(codes, weights):
+            counts[code] += weight
+    return counts
+
+class FleetTable:
+    """Column-oriented snapshot of the virtual service and service engine
+    collections.
+
+    Each VS and SE becomes one row. Refs are interned to integer codes, and
+    SE placements are kept as parallel (se_row, vs_row) edge arrays, so fleet
+    aggregates reduce to bincounts over flat int columns. NumPy is used when
+    installed; otherwise the columns are ``array`` instances.
+    """
+
+    def __init__(self):
+        self.vs_uuids: List[str] = []
+        self.vs_names: List[str] = []
+        self.vs_rows: Dict[str, int] = {}
+        self.se_uuids: List[str] = []
+        self.se_names: List[str] = []
+        self.tenants = _Interner()
+        self.se_groups = _Interner()
+        self.tenant_names: Dict[str, str] = {}
+        self.known_tenants: Optional[set] = None
+        self.orphaned_vs_refs: List[Dict] = []
+        self.orphaned_vs_ref_count = 0
+        self.build_seconds = 0.0
+        self.vs_tenant = self.vs_se_group = self.edge_se = self.edge_vs = _column([])
+        self.vs_enabled = self.vs_oper_up = _column([], 'b')
+        self.se_se_group = _column([])
+        self.se_oper_up = _column([], 'b')
+
+    @property
+    def backend(self) -> str:
+        return 'numpy' if np is not None else 'array'
+
+    @classmethod
+    def build(cls, virtual_services: Iterable[Mapping], service_engines: Iterable[Mapping],
+              tenants: Optional[Iterable[Mapping]] = None) -> 'FleetTable':
+        start = time.perf_counter()
+        table = cls()
+        if tenants is not None:
+            tenants = list(tenants)
+            table.tenant_names = {t.get('uuid'): t.get('name') for t in tenants}
+            table.known_tenants = set(table.tenant_names)
+
+        vs_rows = table.vs_rows
+        vs_uuids, vs_names = table.vs_uuids, table.vs_names
+        tenant_code, se_group_code = table.tenants.code, table.se_groups.code
+        vs_tenant: List[int] = []
+        vs_se_group: List[int] = []
+        vs_enabled: List[int] = []
+        vs_oper_up: List[int] = []
+        for vs in virtual_services:
+            uuid = vs.get('uuid')
+            if uuid is None or uuid in vs_rows:
+                continue
+            vs_rows[uuid] = len(vs_uuids)
+            vs_uuids.append(uuid)
+            vs_names.append(vs.get('name'))
+            # Intern the raw refs and resolve each distinct one to a uuid afterwards
+            vs_tenant.append(tenant_code(vs.get('tenant_ref')))
+            vs_se_group.append(se_group_code(vs.get('se_group_ref')))
+            vs_enabled.append(1 if vs.get('enabled', True) else 0)
+            oper_status = vs.get('oper_status')
+            vs_oper_up.append(1 if isinstance(oper_status, dict) and oper_status.get('state') == OPER_UP else 0)
+
+        se_uuids, se_names = table.se_uuids, table.se_names
+        se_se_group: List[int] = []
+        se_oper_up: List[int] = []
+        edge_se: List[int] = []
+        edge_vs: List[int] = []
+        for se in service_engines:
+            row = len(se_uuids)
+            se_uuids.append(se.get('uuid'))
+            se_names.append(se.get('name'))
+            se_se_group.append(se_group_code(se.get('se_group_ref')))
+            oper_status = se.get('oper_status')
+            se_oper_up.append(1 if isinstance(oper_status, dict) and oper_status.get('state') == OPER_UP else 0)
+            for ref in se.get('vs_refs') or ():
+                # Plain "/api/virtualservice/<uuid>" refs skip the full parse
+                vs_row = vs_rows.get(ref[ref.rfind('/') + 1:])
+                if vs_row is None:
+                    vs_row = vs_rows.get(ref_uuid(ref), -1)
+                if vs_row < 0:
+                    table.orphaned_vs_ref_count += 1
+                    if len(table.orphaned_vs_refs) < ORPHAN_SAMPLE_SIZE:
+                        table.orphaned_vs_refs.append({'service_engine': se.get('name'), 'vs_ref': ref})
+                    continue
+                edge_se.append(row)
+                edge_vs.append(vs_row)
+
+        tenant_map = table.tenants.rekey(ref_uuid)
+        se_group_map = table.se_groups.rekey(ref_uuid)
+        table.vs_tenant = _remap(vs_tenant, tenant_map)
+        table.vs_se_group = _remap(vs_se_group, se_group_map)
+        table.vs_enabled = _column(vs_enabled, 'b')
+        table.vs_oper_up = _column(vs_oper_up, 'b')
+        table.se_se_group = _remap(se_se_group, se_group_map)
+        table.se_oper_up = _column(se_oper_up, 'b')
+        table.edge_se = _column(edge_se)
+        table.edge_vs = _column(edge_vs)
+        table.build_seconds = time.perf_counter() - start
+        logger.debug(f"Fleet table built: {len(vs_uuids)} virtual services, {len(se_uuids)} service engines, "
+                     f"{len(edge_vs)} placements in {table.build_seconds:.3f}s")
+        return table
+
+    def __len__(self) -> int:
+        return len(self.vs_uuids)
+
+    def scan(self) -> Dict:
+        start = time.perf_counter()
+        report = {
+            'backend': self.backend,
+            'virtual_services': len(self.vs_uuids),
+            'service_engines': len(self.se_uuids),
+            'enabled': int(sum(self.vs_enabled)) if np is None else int(self.vs_enabled.sum()),
+            'oper_up': int(sum(self.vs_oper_up)) if np is None else int(self.vs_oper_up.sum()),
+            'tenants': self._tenant_counts(),
+            'placement': self._placement(),
+            'orphans': self._orphans()
+        }
+        report['build_seconds'] = self.build_seconds
+        report['scan_seconds'] = time.perf_counter() - start
+        return report
+
+    def _tenant_counts(self) -> Dict[str, Dict]:
+        size = len(self.tenants)
+        totals = _bincount(self.vs_tenant, size)
+        enabled = _bincount(self.vs_tenant, size, self.vs_enabled)
+        oper_up = _bincount(self.vs_tenant, size, self.vs_oper_up)
+
+        counts = {}
+        for code, tenant in enumerate(self.tenants.keys):
+            label = self.tenant_names.get(tenant) or tenant or '<none>'
+            counts[label] = {
+                'total': totals[code],
+                'enabled': enabled[code],
+                'disabled': totals[code] - enabled[code],
+                'oper_up': oper_up[code],
+                'oper_down': totals[code] - oper_up[code]
+            }
+        return counts
+
+    def _placement(self) -> Dict:
+        vs_count, se_count = len(self.vs_uuids), len(self.se_uuids)
+        if np is not None:
+            ses_per_vs = np.bincount(self.edge_vs, minlength=vs_count) if len(self.edge_vs) else np.zeros(vs_count, np.int64)
+            vs_per_se = np.bincount(self.edge_se, minlength=se_count) if len(self.edge_se) else np.zeros(se_count, np.int64)
+            unplaced = ses_per_vs == 0
+            unplaced_count = int(unplaced.sum())
+            unplaced_enabled = int((unplaced & (self.vs_enabled == 1)).sum())
+            histogram = np.bincount(ses_per_vs).tolist() if vs_count else []
+            se_load = vs_per_se.tolist()
+        else:
+            ses_per_vs = _bincount(self.edge_vs, vs_count)
+            se_load = _bincount(self.edge_se, se_count)
+            unplaced_count = unplaced_enabled = 0
+            histogram = [0] * (max(ses_per_vs, default=0) + 1)
+            for placements, enabled in zip(ses_per_vs, self.vs_enabled):
+                histogram[placements] += 1
+                if not placements:
+                    unplaced_count += 1
+                    unplaced_enabled += enabled
+
+        return {
+            'placements': len(self.edge_vs),
+            'unplaced': unplaced_count,
+            'unplaced_enabled': unplaced_enabled,
+            'ses_per_vs': {str(k): count for k, count in enumerate(histogram) if count},
+            'vs_per_se': {
+                'min': min(se_load, default=0),
+                'mean': len(self.edge_vs) / se_count if se_count else 0.0,
+                'max': max(se_load, default=0)
+            },
+            'busiest_se': self.se_names[se_load.index(max(se_load))] if se_load and max(se_load) else None
+        }
+
+    def _orphans(self) -> Dict:
+        orphans = {
+            'se_vs_refs': self.orphaned_vs_ref_count,
+            'se_vs_ref_sample': list(self.orphaned_vs_refs)
+        }
+
+        # VS se_group refs that no service engine belongs to
+        se_groups_with_ses = set(_bincount_keys(self.se_se_group, len(self.se_groups)))
+        group_counts = _bincount(self.vs_se_group, len(self.se_groups))
+        orphaned_groups = [code for code, count in enumerate(group_counts)
+                           if count and code not in se_groups_with_ses and self.se_groups.keys[code] is not None]
+        orphans['vs_se_group_refs'] = sum(group_counts[code] for code in orphaned_groups)
+        orphans['vs_se_group_sample'] = [self.se_groups.keys[code] for code in orphaned_groups[:ORPHAN_SAMPLE_SIZE]]
+
+        if self.known_tenants is not None:
+            tenant_counts = _bincount(self.vs_tenant, len(self.tenants))
+            orphaned_tenants = [code for code, tenant in enumerate(self.tenants.keys)
+                                if tenant is not None and tenant not in self.known_tenants]
+            orphans['vs_tenant_refs'] = sum(tenant_counts[code] for code in orphaned_tenants)
+            orphans['vs_tenant_sample'] = [self.tenants.keys[code] for code in orphaned_tenants[:ORPHAN_SAMPLE_SIZE]]
+        return orphans
+
+def _bincount_keys(codes, size: int) -> List[int]:
+    return [code for code, count in enumerate(_bincount(codes, size)) if count]
+
+def scan_fleet(api_client) -> Dict:
+    """Fetch tenants, virtual services and service engines and scan them."""
+    fetch_start = time.perf_counter()
+    tenants = api_client.get_tenants()
+    virtual_services = api_client.get_virtual_services()
+    service_engines = api_client.get_service_engines()
+    fetch_seconds = time.perf_counter() - fetch_start
+
+    report = FleetTable.build(virtual_services, service_engines, tenants).scan()
+    report['fetch_seconds'] = fetch_seconds
+    return report
\ No newline at end of file
@@ -0,0 +1,359 @@
+import base64
+import email.utils
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# Stored bodies are already decoded, so these no longer describe them
+_DROPPED_HEADERS = ('Content-Encoding', 'Content-Length', 'Transfer-Encoding', 'Connection')
+_CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since')
+_UNSAFE_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+DISK_FORMAT_VERSION = 2
+
+def _cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+class CacheEntry:
+    __slots__ = ('key', 'url', 'status', 'headers', 'content', 'stored_at', 'expires_at')
+
+    def __init__(self, key: str, url: str, status: int, headers: Dict[str, str], content: bytes,
+                 stored_at: float, expires_at: float):
+        self.key = key
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+    def fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def to_dict(self) -> Dict:
+        return {
+            'key': self.key,
+            'url': self.url,
+            'status': self.status,
+            'headers': self.headers,
+            'content': base64.b64encode(self.content).decode('ascii'),
+            'stored_at': self.stored_at,
+            'expires_at': self.expires_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CacheEntry':
+        return cls(str(data['key']), str(data['url']), int(data['status']),
+                   {str(k): str(v) for k, v in data['headers'].items()},
+                   base64.b64decode(data['content'], validate=True),
+                   float(data['stored_at']), float(data['expires_at']))
+
+class ResponseCache:
+    """LRU of GET responses with an optional on-disk tier.
+
+    Keys combine the auth scope, method and full URL, so one user's view is
+    never served to another. Freshness follows Cache-Control max-age (or
+    Expires); stale or no-cache entries that carry an ETag or Last-Modified
+    are revalidated with a conditional request. ``default_ttl`` applies
+    when the server gives no freshness information at all.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None, default_ttl: float = 0.0):
+        self.max_entries = max(1, max_entries)
+        self.disk_dir = os.path.expanduser(disk_dir) if disk_dir else None
+        self.default_ttl = default_ttl
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {
+            'hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'invalidations': 0,
+            'disk_loads': 0
+        }
+
+    @staticmethod
+    def key(scope: str, method: str, url: str) -> str:
+        return f"{scope}|{method}|{url}"
+
+    def count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.counters[counter] += amount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._entries)
+        # Fresh hits skip the controller entirely; revalidations still cost a round-trip
+        stats['round_trips_saved'] = stats['hits']
+        return stats
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._load(key)
+        if entry is not None:
+            self.count('disk_loads')
+            self._remember(entry)
+        return entry
+
+    def is_fresh(self, key: str) -> bool:
+        entry = self.get(key)
+        return entry is not None and entry.fresh(time.time())
+
+    def store(self, key: str, response: requests.Response) -> Optional[CacheEntry]:
+        lifetime = self.lifetime(response.headers)
+        if lifetime is None:
+            return None
+        headers = {k: v for k, v in response.headers.items() if k not in _DROPPED_HEADERS}
+        now = time.time()
+        entry = CacheEntry(key, response.url, response.status_code, headers, response.content, now, now + lifetime)
+        self._remember(entry)
+        self._save(entry)
+        self.count('stores')
+        return entry
+
+    def refresh(self, entry: CacheEntry, not_modified: requests.Response) -> CacheEntry:
+        """Apply a 304's headers (new validators, new freshness) to ``entry``."""
+        headers = dict(entry.headers)
+        headers.update((k, v) for k, v in not_modified.headers.items() if k not in _DROPPED_HEADERS)
+        lifetime = self.lifetime(headers)
+        now = time.time()
+        refreshed = CacheEntry(entry.key, entry.url, entry.status, headers, entry.content, now,
+                               now + (lifetime or 0.0))
+        self._remember(refreshed)
+        self._save(refreshed)
+        return refreshed
+
+    def lifetime(self, headers) -> Optional[float]:
+        """Seconds a response stays fresh; None when it must not be stored."""
+        directives = _cache_control(headers.get('Cache-Control'))
+        if 'no-store' in directives or headers.get('Vary') == '*':
+            return None
+        has_validator = bool(headers.get('ETag') or headers.get('Last-Modified'))
+        if 'no-cache' in directives:
+            return 0.0 if has_validator else None
+
+        max_age = directives.get('max-age')
+        if max_age is not None:
+            try:
+                return max(0.0, float(max_age))
+            except ValueError:
+                pass
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                return max(0.0, email.utils.parsedate_to_datetime(expires).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return 0.0 if has_validator else None
+        if self.default_ttl or has_validator:
+            return float(self.default_ttl)
+        return None
+
+    def invalidate(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry.url.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            self.counters['invalidations'] += len(keys)
+        for key in keys:
+            self._unlink(key)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+        for key in keys:
+            self._unlink(key)
+
+    def _remember(self, entry: CacheEntry):
+        with self._lock:
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            while len(self._entries) > self.max_entries:
+                # Evicted entries stay on disk and can be promoted again
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'r') as f:
+                data = json.load(f)
+            if data.get('version') != DISK_FORMAT_VERSION:
+                return None
+            entry = CacheEntry.from_dict(data['entry'])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            # Truncated, hand-edited or from another version: fetch it again
+            logger.debug(f"Ignoring unreadable HTTP cache entry for {key}: {str(e)}")
+            return None
+        return entry if entry.key == key else None
+
+    def _save(self, entry: CacheEntry):
+        if not self.disk_dir:
+            return
+        try:
+            # Cached bodies are whatever the controller showed this user
+            os.makedirs(self.disk_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+        except OSError as e:
+            logger.debug(f"HTTP cache disk tier unavailable: {str(e)}")
+            return
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': DISK_FORMAT_VERSION, 'entry': entry.to_dict()}, f)
+            os.replace(tmp_path, self._disk_path(entry.key))
+        except OSError as e:
+            logger.debug(f"HTTP cache write failed: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _unlink(self, key: str):
+        if self.disk_dir:
+            try:
+                os.unlink(self._disk_path(key))
+            except OSError:
+                pass
+
+class CachingAdapter(BaseAdapter):
+    """Transport adapter that answers cacheable GETs from a ``ResponseCache``.
+
+    Wraps the session's existing adapter, so pooling and retries are
+    unchanged. Only URLs under ``prefixes`` are cached; a write through this
+    adapter to one of them drops the in-memory responses under the same
+    prefix. Requests that
+    already carry their own validators pass straight through.
+    """
+
+    def __init__(self, inner: BaseAdapter, cache: ResponseCache, prefixes: Iterable[str],
+                 scope: Callable[[], str]):
+        super().__init__()
+        self.inner = inner
+        self.cache = cache
+        self.prefixes = tuple(prefixes)
+        self.scope = scope
+
+    def cacheable_prefix(self, url: str) -> Optional[str]:
+        for prefix in self.prefixes:
+            if url.startswith(prefix) and url[len(prefix):len(prefix) + 1] in ('', '?', '/'):
+                return prefix
+        return None
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        prefix = self.cacheable_prefix(request.url)
+        if prefix is None:
+            return self.inner.send(request, **kwargs)
+        if request.method in _UNSAFE_METHODS:
+            response = self.inner.send(request, **kwargs)
+            if response.status_code < 400:
+                self.cache.invalidate(prefix)
+            return response
+        if request.method != 'GET' or any(header in request.headers for header in _CONDITIONAL_HEADERS):
+            return self.inner.send(request, **kwargs)
+
+        key = ResponseCache.key(self.scope(), request.method, request.url)
+        entry = self.cache.get(key)
+        request_directives = _cache_control(request.headers.get('Cache-Control'))
+        if entry is not None and entry.fresh(time.time()) and 'no-cache' not in request_directives:
+            self.cache.count('hits')
+            return self._build_response(request, entry)
+
+        if entry is not None and (entry.etag or entry.last_modified):
+            conditional = request.copy()
+            if entry.etag:
+                conditional.headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                conditional.headers['If-Modified-Since'] = entry.last_modified
+            response = self.inner.send(conditional, **kwargs)
+            if response.status_code == 304:
+                response.close()
+                self.cache.count('revalidated')
+                return self._build_response(request, self.cache.refresh(entry, response), revalidated=True)
+        else:
+            response = self.inner.send(request, **kwargs)
+
+        self.cache.count('misses')
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+    def _build_response(self, request: requests.PreparedRequest, entry: CacheEntry,
+                        revalidated: bool = False) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry.status
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.headers['Content-Length'] = str(len(entry.content))
+        response._content = entry.content
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(0)
+        # A revalidated response did reach the controller; a fresh hit did not
+        response.from_cache = not revalidated
+        response.revalidated = revalidated
+        return response
+
+    def close(self):
+        self.inner.close()
+
+def install(session: requests.Session, base_url: str, cache: ResponseCache, prefixes: Iterable[str],
+            scope: Callable[[], str]) -> CachingAdapter:
+    """Mount a ``CachingAdapter`` for ``base_url`` in front of the session's adapter."""
+    adapter = CachingAdapter(session.get_adapter(base_url), cache, prefixes, scope)
+    session.mount(base_url, adapter)
+    return adapter
+
+def scope_digest(*parts: str) -> str:
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+def cache_from_config(config: Optional[Dict]) -> Tuple[Optional[ResponseCache], Tuple[str, ...]]:
+    """(cache, endpoint names) from ``api.http_cache``; no cache unless enabled."""
+    config = config or {}
+    if not config.get('enabled', False):
+        return None, ()
+    cache = ResponseCache(
+        max_entries=config.get('max_entries', 256),
+        disk_dir=config.get('disk_dir'),
+        default_ttl=config.get('default_ttl', 0)
+    )
+    return cache, tuple(config.get('endpoints') or ('tenants', 'service_engines'))
\ No newline at end of file
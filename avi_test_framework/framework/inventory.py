@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .records import freeze
+
+logger = logging.getLogger(__name__)
+
+class VirtualServiceInventory:
+    """Client-side cache of the virtual service collection.
+
+    Keeps name and uuid indexes over the last fetched list so lookups do not
+    re-download the whole collection. Entries expire as a whole after ``ttl``
+    seconds, or individually when marked stale via ``invalidate``. Stored
+    objects are frozen: every caller shares them, so none may change them.
+    """
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._by_uuid: Dict[str, Dict] = {}
+        self._by_name: Dict[str, str] = {}
+        self._stale: Set[str] = set()
+        self._loaded_at: Optional[float] = None
+        self.last_modified: Optional[str] = None
+
+    def is_fresh(self) -> bool:
+        with self._lock:
+            if self._loaded_at is None:
+                return False
+            if self.ttl is None:
+                return True
+            return (time.monotonic() - self._loaded_at) < self.ttl
+
+    def load(self, virtual_services: List[Dict]):
+        with self._lock:
+            self._by_uuid = {}
+            self._by_name = {}
+            for vs in virtual_services:
+                self._index(vs)
+            self._stale.clear()
+            self._loaded_at = time.monotonic()
+            self.last_modified = self._max_last_modified(self._by_uuid.values())
+        logger.debug(f"Inventory loaded with {len(virtual_services)} virtual services")
+
+    @property
+    def loaded(self) -> bool:
+        with self._lock:
+            return self._loaded_at is not None or bool(self._by_uuid)
+
+    def touch(self):
+        with self._lock:
+            self._loaded_at = time.monotonic()
+
+    def merge(self, virtual_services: Iterable[Dict]) -> Tuple[int, int, int]:
+        """Reconcile with a full listing, replacing only objects whose
+        ``_last_modified`` changed. Returns (added, changed, removed)."""
+        with self._lock:
+            merged: Dict[str, Dict] = {}
+            added = changed = 0
+            for vs in virtual_services:
+                uuid = vs.get('uuid')
+                if uuid is None:
+                    continue
+                current = self._by_uuid.get(uuid)
+                if current is None:
+                    added += 1
+                    merged[uuid] = vs
+                elif (uuid not in self._stale and vs.get('_last_modified') is not None
+                        and current.get('_last_modified') == vs.get('_last_modified')):
+                    merged[uuid] = current
+                else:
+                    changed += 1
+                    merged[uuid] = vs
+            removed = len(self._by_uuid.keys() - merged.keys())
+            
+            self._by_uuid = {}
+            self._by_name = {}
+            for vs in merged.values():
+                self._index(vs)
+            self._stale.clear()
+            self._loaded_at = time.monotonic()
+            self.last_modified = self._max_last_modified(merged.values())
+        logger.debug(f"Inventory merged: {added} added, {changed} changed, {removed} removed")
+        return added, changed, removed
+
+    def patch(self, virtual_services: Iterable[Dict]) -> int:
+        """Upsert objects returned by a modified-since query."""
+        count = 0
+        with self._lock:
+            for vs in virtual_services:
+                self.upsert(vs)
+                count += 1
+            self._loaded_at = time.monotonic()
+            self.last_modified = self._max_last_modified(self._by_uuid.values())
+        return count
+
+    def upsert(self, vs: Dict):
+        with self._lock:
+            previous = self._by_uuid.get(vs.get('uuid'))
+            if previous is not None and previous.get('name') != vs.get('name'):
+                self._by_name.pop(previous.get('name'), None)
+            self._index(vs)
+            self._stale.discard(vs.get('uuid'))
+
+    def remove(self, uuid: str):
+        with self._lock:
+            vs = self._by_uuid.pop(uuid, None)
+            if vs is not None:
+                self._by_name.pop(vs.get('name'), None)
+            self._stale.discard(uuid)
+
+    def clear(self):
+        with self._lock:
+            self._by_uuid = {}
+            self._by_name = {}
+            self._stale.clear()
+            self._loaded_at = None
+            self.last_modified = None
+
+    def invalidate(self, uuid: Optional[str] = None):
+        with self._lock:
+            if uuid is None:
+                self._loaded_at = None
+                self._stale.clear()
+            elif uuid in self._by_uuid:
+                self._stale.add(uuid)
+
+    def is_stale(self, uuid: str) -> bool:
+        with self._lock:
+            return uuid in self._stale
+
+    def stale_uuids(self) -> List[str]:
+        with self._lock:
+            return list(self._stale)
+
+    def get_by_uuid(self, uuid: str) -> Optional[Dict]:
+        with self._lock:
+            return self._by_uuid.get(uuid)
+
+    def get_by_name(self, name: str) -> Optional[Dict]:
+        with self._lock:
+            uuid = self._by_name.get(name)
+            return self._by_uuid.get(uuid) if uuid is not None else None
+
+    def all(self) -> List[Dict]:
+        with self._lock:
+            return list(self._by_uuid.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_uuid)
+
+    def _index(self, vs: Dict):
+        uuid = vs.get('uuid')
+        if uuid is None:
+            return
+        self._by_uuid[uuid] = freeze(vs)
+        name = vs.get('name')
+        if name is not None:
+            self._by_name[name] = uuid
+
+    @staticmethod
+    def _max_last_modified(virtual_services: Iterable[Dict]) -> Optional[str]:
+        # Avi reports _last_modified as microseconds since the epoch, as a string
+        latest = None
+        for vs in virtual_services:
+            value = vs.get('_last_modified')
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                continue
+            if latest is None or value > latest:
+                latest = value
+        return str(latest) if latest is not None else None
\ No newline at end of file
@@ -0,0 +1,206 @@
+import bisect
+import contextvars
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in milliseconds; the final bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+class LatencyHistogram:
+    def __init__(self, bounds_ms=LATENCY_BUCKETS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(self.bounds_ms, seconds * 1000.0)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other: 'LatencyHistogram'):
+        if other.bounds_ms != self.bounds_ms:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound (seconds) of the bucket holding the pct-th sample."""
+        if not self.count:
+            return 0.0
+        target = pct / 100.0 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(self.bounds_ms):
+                    return min(self.bounds_ms[index] / 1000.0, self.max)
+                return self.max
+        return self.max
+
+    def to_dict(self) -> Dict:
+        buckets = {f"le_{bound}ms": count for bound, count in zip(self.bounds_ms, self.counts)}
+        buckets['inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min or 0.0,
+            'max': self.max or 0.0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'buckets': buckets
+        }
+
+class StageStats:
+    """Request counters for one stage; requests from fan-out threads update them concurrently."""
+
+    __slots__ = ('requests', 'bytes_sent', 'bytes_received', 'errors', '_lock')
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, errors: int = 0, bytes_sent: int = 0, bytes_received: int = 0):
+        with self._lock:
+            self.requests += 1
+            self.errors += errors
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'bytes_sent': self.bytes_sent,
+                'bytes_received': self.bytes_received,
+                'errors': self.errors
+            }
+
+_current_stage: contextvars.ContextVar[Optional[StageStats]] = contextvars.ContextVar('avi_stage_stats', default=None)
+
+@contextmanager
+def stage_scope(stats: StageStats):
+    """Attribute every APIClient request made in this context to ``stats``."""
+    token = _current_stage.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stage.reset(token)
+
+class RequestMetrics:
+    """Per-endpoint request counters and latency histograms for one APIClient."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict] = {}
+
+    def record(self, method: str, endpoint: Optional[str], status: Optional[int], seconds: float,
+               bytes_sent: int = 0, bytes_received: int = 0):
+        key = f"{method} {endpoint or 'other'}"
+        is_error = status is None or status >= 400
+        with self._lock:
+            entry = self._endpoints.get(key)
+            if entry is None:
+                entry = self._endpoints[key] = {
+                    'requests': 0,
+                    'errors': 0,
+                    'bytes_sent': 0,
+                    'bytes_received': 0,
+                    'latency': LatencyHistogram()
+                }
+            entry['requests'] += 1
+            entry['errors'] += int(is_error)
+            entry['bytes_sent'] += bytes_sent
+            entry['bytes_received'] += bytes_received
+            entry['latency'].record(seconds)
+        
+        stage = _current_stage.get()
+        if stage is not None:
+            stage.add(int(is_error), bytes_sent, bytes_received)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                key: {**{k: v for k, v in entry.items() if k != 'latency'}, 'latency': entry['latency'].to_dict()}
+                for key, entry in sorted(self._endpoints.items())
+            }
+
+    def drain(self) -> Dict[str, Dict]:
+        """Return the raw counters recorded so far and start again from zero.
+
+        The result pickles, so worker processes can hand it to the parent's ``merge``.
+        """
+        with self._lock:
+            endpoints, self._endpoints = self._endpoints, {}
+        return endpoints
+
+    def merge(self, endpoints: Dict[str, Dict]):
+        with self._lock:
+            for key, other in endpoints.items():
+                entry = self._endpoints.get(key)
+                if entry is None:
+                    entry = self._endpoints[key] = {
+                        'requests': 0,
+                        'errors': 0,
+                        'bytes_sent': 0,
+                        'bytes_received': 0,
+                        'latency': LatencyHistogram(other['latency'].bounds_ms)
+                    }
+                for field in ('requests', 'errors', 'bytes_sent', 'bytes_received'):
+                    entry[field] += other[field]
+                entry['latency'].merge(other['latency'])
+
+    @property
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(entry['requests'] for entry in self._endpoints.values())
+
+@contextmanager
+def profiling(output_dir: str, run_id: str, cprofile: bool = False, trace_memory: bool = False,
+              top: int = 20):
+    """Optional cProfile/tracemalloc hooks around a run; dumps results to ``output_dir``."""
+    profiler = cProfile.Profile() if cprofile else None
+    if trace_memory:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            os.makedirs(output_dir, exist_ok=True)
+            path = os.path.join(output_dir, f"profile_{run_id}.pstats")
+            profiler.dump_stats(path)
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(top)
+            logger.info(f"cProfile written to {path}\n{stream.getvalue()}")
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            lines: List[str] = [f"tracemalloc: current {current / 1024 / 1024:.1f} MB, peak {peak / 1024 / 1024:.1f} MB"]
+            for stat in snapshot.statistics('lineno')[:top]:
+                lines.append(f"  {stat}")
+            logger.info("\n".join(lines))
\ No newline at end of file
@@ -0,0 +1,420 @@
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import random
+import sys
+import threading
+import time
+import uuid as uuid_lib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+logger = logging.getLogger(__name__)
+
+class MockControllerState:
+    """In-memory Avi object model served by MockController."""
+
+    def __init__(self, tenants: int = 5, virtual_services: int = 100, service_engines: int = 10,
+                 ses_per_vs: int = 2, seed: int = 42):
+        rng = random.Random(seed)
+        self.lock = threading.RLock()
+        self.users: Dict[str, str] = {}
+        self.tokens: Dict[str, float] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.faults: List[Dict] = []
+
+        self.tenants: List[Dict] = []
+        for i in range(max(1, tenants)):
+            self.tenants.append(self._stamp({
+                'uuid': f"tenant-{self._uuid(rng)}",
+                'name': 'admin' if i == 0 else f"tenant-{i}"
+            }))
+
+        self.se_groups = [f"serviceenginegroup-{self._uuid(rng)}" for _ in range(max(1, service_engines // 5))]
+
+        self.service_engines: List[Dict] = []
+        for i in range(max(1, service_engines)):
+            self.service_engines.append(self._stamp({
+                'uuid': f"serviceengine-{self._uuid(rng)}",
+                'name': f"avi-se-{i + 1}",
+                'tenant_ref': f"/api/tenant/{self.tenants[0]['uuid']}",
+                'se_group_ref': f"/api/serviceenginegroup/{self.se_groups[i % len(self.se_groups)]}",
+                'enable_state': 'SE_STATE_ENABLED',
+                'oper_status': {'state': 'OPER_UP'},
+                'vs_refs': []
+            }))
+
+        self.virtual_services: List[Dict] = []
+        self.vs_by_uuid: Dict[str, Dict] = {}
+        for i in range(virtual_services):
+            tenant = self.tenants[i % len(self.tenants)]
+            vs = self._stamp({
+                'uuid': f"virtualservice-{self._uuid(rng)}",
+                'name': f"backend-vs-t1r_1000-{i + 1}",
+                'tenant_ref': f"/api/tenant/{tenant['uuid']}",
+                'se_group_ref': f"/api/serviceenginegroup/{self.se_groups[i % len(self.se_groups)]}",
+                'enabled': True,
+                'traffic_enabled': True,
+                'oper_status': {'state': 'OPER_UP' if rng.random() > 0.05 else 'OPER_DOWN'},
+                'services': [{'port': 80, 'enable_ssl': False}, {'port': 443, 'enable_ssl': True}],
+                'pool': {
+                    'name': f"pool-{i + 1}",
+                    'members': [
+                        {'ip': f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}", 'port': 8080 + m,
+                         'state': 'UP' if rng.random() > 0.02 else 'DOWN'}
+                        for m in range(3)
+                    ]
+                }
+            })
+            self.virtual_services.append(vs)
+            self.vs_by_uuid[vs['uuid']] = vs
+            for s in range(min(ses_per_vs, len(self.service_engines))):
+                se = self.service_engines[(i + s) % len(self.service_engines)]
+                se['vs_refs'].append(f"/api/virtualservice/{vs['uuid']}")
+
+    @staticmethod
+    def _uuid(rng: random.Random) -> str:
+        return str(uuid_lib.UUID(int=rng.getrandbits(128), version=4))
+
+    @staticmethod
+    def _stamp(obj: Dict) -> Dict:
+        obj['_last_modified'] = str(int(time.time() * 1_000_000))
+        return obj
+
+    def take_fault(self, method: str, path: str, page: Optional[int]) -> Optional[Dict]:
+        with self.lock:
+            for fault in self.faults:
+                if fault['path'] != path or fault['method'] not in (None, method):
+                    continue
+                if fault['page'] is not None and fault['page'] != page:
+                    continue
+                fault['remaining'] -= 1
+                if not fault['remaining']:
+                    self.faults.remove(fault)
+                return fault
+        return None
+
+    def update_virtual_service(self, uuid: str, payload: Dict) -> Optional[Dict]:
+        with self.lock:
+            vs = self.vs_by_uuid.get(uuid)
+            if vs is None:
+                return None
+            vs.update({k: v for k, v in payload.items() if k not in ('uuid', '_last_modified')})
+            self._stamp(vs)
+            return dict(vs)
+
+MODIFIED_SINCE_PARAM = '_last_modified.gt'
+
+class MockControllerHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+    server_version = 'MockAviController/1.0'
+
+    COLLECTIONS = {
+        '/api/tenant': 'tenants',
+        '/api/virtualservice': 'virtual_services',
+        '/api/serviceengine': 'service_engines'
+    }
+
+    def log_message(self, format, *args):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s %s", self.address_string(), format % args)
+
+    @property
+    def state(self) -> MockControllerState:
+        return self.server.state
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self._read_json()
+        if not self._pre_dispatch(path):
+            return
+
+        if path == '/register':
+            username = (body or {}).get('username')
+            if not username:
+                return self._send_json(400, {'error': 'username required'})
+            with self.state.lock:
+                if username in self.state.users:
+                    return self._send_json(400, {'error': 'user exists'})
+                self.state.users[username] = (body or {}).get('password', '')
+            return self._send_json(201, {'message': 'registered'})
+
+        if path == '/login1':
+            username, password = self._basic_auth()
+            with self.state.lock:
+                known = self.state.users.get(username)
+                if known is not None and known != password:
+                    return self._send_json(401, {'error': 'invalid credentials'})
+                token = uuid_lib.uuid4().hex
+                self.state.tokens[token] = time.time() + self.server.token_ttl
+            return self._send_json(200, {'token': token})
+
+        self._send_json(404, {'error': 'not found'})
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip('/')
+        query = parse_qs(parsed.query)
+        if not self._pre_dispatch(path, query) or not self._authorized():
+            return
+
+        if path in self.COLLECTIONS:
+            return self._send_collection(path, getattr(self.state, self.COLLECTIONS[path]), query)
+
+        collection, _, uuid = path.rpartition('/')
+        if collection in self.COLLECTIONS:
+            with self.state.lock:
+                if collection == '/api/virtualservice':
+                    obj = self.state.vs_by_uuid.get(uuid)
+                else:
+                    obj = next((o for o in getattr(self.state, self.COLLECTIONS[collection]) if o['uuid'] == uuid), None)
+                obj = self._project(obj, self._fields(query)) if obj is not None else None
+            if obj is None:
+                return self._send_json(404, {'error': 'not found'})
+            return self._send_json(200, obj)
+
+        self._send_json(404, {'error': 'not found'})
+
+    def do_PUT(self):
+        path = urlparse(self.path).path.rstrip('/')
+        body = self._read_json()
+        if not self._pre_dispatch(path) or not self._authorized():
+            return
+
+        if path.startswith('/api/virtualservice/'):
+            vs = self.state.update_virtual_service(path.rsplit('/', 1)[1], body or {})
+            if vs is None:
+                return self._send_json(404, {'error': 'not found'})
+            return self._send_json(200, vs)
+
+        self._send_json(404, {'error': 'not found'})
+
+    def _pre_dispatch(self, path: str, query: Optional[Dict] = None) -> bool:
+        with self.state.lock:
+            self.state.request_counts[path] = self.state.request_counts.get(path, 0) + 1
+
+        server = self.server
+        if server.latency or server.latency_jitter:
+            time.sleep(server.latency + random.uniform(0, server.latency_jitter))
+        page = int((query or {}).get('page', ['1'])[0]) if path in self.COLLECTIONS else None
+        fault = self.state.take_fault(self.command, path, page)
+        if fault is not None:
+            if fault['delay']:
+                time.sleep(fault['delay'])
+            if fault['status'] is not None:
+                self._send_json(fault['status'], {'error': 'injected failure'}, fault['headers'])
+                return False
+        if server.error_rate and random.random() < server.error_rate:
+            self._send_json(server.error_status, {'error': 'injected failure'}, {'Retry-After': '0'})
+            return False
+        return True
+
+    def _authorized(self) -> bool:
+        header = self.headers.get('Authorization', '')
+        token = header[7:] if header.startswith('Bearer ') else None
+        with self.state.lock:
+            expires_at = self.state.tokens.get(token)
+        if expires_at is None or expires_at < time.time():
+            self._send_json(401, {'error': 'authentication required'})
+            return False
+        return True
+
+    def _send_collection(self, path: str, objects: List[Dict], query: Dict):
+        page = max(1, int(query.get('page', ['1'])[0]))
+        page_size = max(1, min(int(query.get('page_size', ['25'])[0]), self.server.max_page_size))
+        modified_since = query.get(MODIFIED_SINCE_PARAM, [None])[0]
+        fields = self._fields(query)
+
+        with self.state.lock:
+            if modified_since is not None:
+                objects = [obj for obj in objects if int(obj['_last_modified']) > int(modified_since)]
+            total = len(objects)
+            page_objects = objects[(page - 1) * page_size:page * page_size]
+            # Weak validator over the page's identities and modification stamps
+            digest = hashlib.sha1(f"{total}:{','.join(fields or ())}".encode())
+            for obj in page_objects:
+                digest.update(f"{obj['uuid']}:{obj['_last_modified']};".encode())
+            etag = f'W/"{digest.hexdigest()}"'
+            if self.headers.get('If-None-Match') == etag:
+                return self._send_not_modified(etag)
+            results = [self._project(obj, fields) for obj in page_objects]
+
+        data = {'count': total, 'results': results}
+        if page * page_size < total:
+            host = self.headers.get('Host', f"{self.server.server_address[0]}:{self.server.server_address[1]}")
+            next_query = {key: values[0] for key, values in query.items()}
+            next_query.update({'page': page + 1, 'page_size': page_size})
+            data['next'] = f"http://{host}{path}?{urlencode(next_query)}"
+        headers = {'ETag': etag}
+        if self.server.cache_max_age and path != '/api/virtualservice':
+            headers['Cache-Control'] = f"private, max-age={self.server.cache_max_age}"
+        self._send_json(200, data, headers)
+
+    @staticmethod
+    def _fields(query: Dict) -> Optional[List[str]]:
+        # Avi's fields= projection; uuid always comes back
+        fields = query.get('fields', [None])[0]
+        if not fields:
+            return None
+        return ['uuid', *(field for field in fields.split(',') if field and field != 'uuid')]
+
+    @staticmethod
+    def _project(obj: Dict, fields: Optional[List[str]]) -> Dict:
+        if fields is None:
+            return dict(obj)
+        return {field: obj[field] for field in fields if field in obj}
+
+    def _send_not_modified(self, etag: str):
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _basic_auth(self):
+        header = self.headers.get('Authorization', '')
+        if not header.startswith('Basic '):
+            return None, None
+        try:
+            username, _, password = base64.b64decode(header[6:]).decode().partition(':')
+            return username, password
+        except ValueError:
+            return None, None
+
+    def _read_json(self) -> Optional[Dict]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def _send_json(self, status: int, data, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+class MockHTTPServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops SYNs when many clients connect at once
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        # Cancelled runs shut their sockets down mid-response; that is expected
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+class MockController:
+    """Local stand-in for an Avi controller, used by benchmarks and dev runs.
+
+    Serves /register, /login1 and paginated tenant, virtual service and
+    service engine collections (honoring ``fields=``) with optional latency
+    and error injection. ``inject_fault`` scripts failures for tests.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, tenants: int = 5,
+                 virtual_services: int = 100, service_engines: int = 10, latency: float = 0.0,
+                 latency_jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 max_page_size: int = 1000, token_ttl: float = 3600, seed: int = 42,
+                 cache_max_age: Optional[int] = None):
+        self.state = MockControllerState(tenants, virtual_services, service_engines, seed=seed)
+        self.server = MockHTTPServer((host, port), MockControllerHandler)
+        self.server.daemon_threads = True
+        self.server.state = self.state
+        self.server.latency = latency
+        self.server.latency_jitter = latency_jitter
+        self.server.error_rate = error_rate
+        self.server.error_status = error_status
+        self.server.max_page_size = max_page_size
+        self.server.token_ttl = token_ttl
+        # Advertised freshness for tenant and SE listings (VS listings change under tests)
+        self.server.cache_max_age = cache_max_age
+        self._thread: Optional[threading.Thread] = None
+
+    def inject_fault(self, path: str, status: Optional[int] = None, times: int = 1, page: Optional[int] = None,
+                     delay: float = 0.0, headers: Optional[Dict[str, str]] = None, method: Optional[str] = None):
+        """Answer the next ``times`` matching requests with ``status`` after ``delay``.
+
+        Without a status the request is only delayed and then served
+        normally. ``page`` limits a collection fault to that page.
+        """
+        with self.state.lock:
+            self.state.faults.append({
+                'path': path.rstrip('/'),
+                'method': method,
+                'page': page,
+                'status': status,
+                'delay': delay,
+                'headers': headers,
+                'remaining': times
+            })
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockController':
+        # A short poll interval lets stop() return promptly
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), name='mock-controller',
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Local mock Avi controller')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--tenants', type=int, default=5)
+    parser.add_argument('--virtual-services', type=int, default=2000)
+    parser.add_argument('--service-engines', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='Fixed per-request latency in seconds')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help='Extra random latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--cache-max-age', type=int, help='Send Cache-Control max-age on tenant/SE listings')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    controller = MockController(
+        host=args.host,
+        port=args.port,
+        tenants=args.tenants,
+        virtual_services=args.virtual_services,
+        service_engines=args.service_engines,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        cache_max_age=args.cache_max_age
+    )
+    logger.info(f"Mock controller listening on {controller.url}")
+    try:
+        controller.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        controller.server.server_close()
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,361 @@
+import contextvars
+import logging
+import os
+import shlex
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .mock_connections import MockRDP, MockSSH
+
+try:
+    import paramiko
+except ImportError:  # pragma: no cover - paramiko is optional
+    paramiko = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = 'localhost'
+RDP_PORT = 3389
+
+class OperationResult:
+    __slots__ = ('host', 'type', 'operation', 'ok', 'output', 'error', 'exit_status', 'duration', 'skipped')
+
+    def __init__(self, host: str, type: str, operation: str, ok: bool = True, output: str = '',
+                 error: Optional[str] = None, exit_status: Optional[int] = None, duration: float = 0.0,
+                 skipped: bool = False):
+        self.host = host
+        self.type = type
+        self.operation = operation
+        self.ok = ok
+        self.output = output
+        self.error = error
+        self.exit_status = exit_status
+        self.duration = duration
+        # Not attempted because an earlier step on the host failed
+        self.skipped = skipped
+
+    def to_dict(self) -> Dict:
+        return {
+            'host': self.host,
+            'type': self.type,
+            'operation': self.operation,
+            'ok': self.ok,
+            'exit_status': self.exit_status,
+            'error': self.error,
+            'duration': self.duration,
+            'skipped': self.skipped
+        }
+
+class MockBackend:
+    """Default backend: logs through MockSSH/MockRDP and always succeeds."""
+
+    name = 'mock'
+
+    def __init__(self):
+        self.ssh = MockSSH()
+        self.rdp = MockRDP()
+
+    def run(self, host: str, op: Dict, timeout: float) -> OperationResult:
+        kind, operation = op.get('type'), op.get('operation')
+        if kind == 'ssh' and operation == 'connect':
+            self.ssh.connect(host)
+        elif kind == 'ssh' and operation == 'execute_command':
+            self.ssh.execute_command(op.get('command', ''))
+        elif kind == 'rdp' and operation == 'validate_connection':
+            self.rdp.validate_connection(host)
+        else:
+            logger.info(f"  MOCK: {kind}/{operation} on {host}")
+        return OperationResult(host, kind, operation)
+
+    def close(self):
+        pass
+
+class LocalBackend:
+    """Runs commands on this machine with the host exported as AVI_TARGET_HOST.
+
+    A stand-in for SSH targets in tests and dev runs: connect and RDP checks
+    always succeed, commands are split with ``shlex`` and run under the
+    timeout. Shell syntax (pipes, ``&&``) needs ``local_shell: true``.
+    """
+
+    name = 'local'
+
+    def __init__(self, shell: bool = False):
+        self.shell = shell
+
+    def run(self, host: str, op: Dict, timeout: float) -> OperationResult:
+        kind, operation = op.get('type'), op.get('operation')
+        if operation != 'execute_command':
+            return OperationResult(host, kind, operation)
+        command = op.get('command', '')
+        try:
+            completed = subprocess.run(
+                command if self.shell else shlex.split(command), shell=self.shell, capture_output=True,
+                text=True, timeout=timeout, env={**os.environ, 'AVI_TARGET_HOST': host}
+            )
+        except subprocess.TimeoutExpired:
+            return OperationResult(host, kind, operation, ok=False, error=f"timed out after {timeout}s")
+        except (OSError, ValueError) as e:
+            return OperationResult(host, kind, operation, ok=False, error=str(e))
+        return OperationResult(
+            host, kind, operation,
+            ok=completed.returncode == 0,
+            output=completed.stdout,
+            error=(completed.stderr.strip() or f"exit status {completed.returncode}") if completed.returncode else None,
+            exit_status=completed.returncode
+        )
+
+    def close(self):
+        pass
+
+class SSHConnectionPool:
+    """One reusable paramiko client per host.
+
+    Clients are shared between threads: each command opens its own channel
+    on the host's transport, so only (re)connecting is serialized per host.
+    """
+
+    def __init__(self, username: Optional[str] = None, password: Optional[str] = None, port: int = 22,
+                 key_filename: Optional[str] = None, connect_timeout: float = 10,
+                 accept_unknown_hosts: bool = False, keepalive: int = 30):
+        if paramiko is None:
+            raise RuntimeError("The ssh operations backend requires paramiko (pip install paramiko)")
+        self.username = username
+        self.password = password
+        self.port = port
+        self.key_filename = key_filename
+        self.connect_timeout = connect_timeout
+        self.accept_unknown_hosts = accept_unknown_hosts
+        self.keepalive = keepalive
+        self._clients: Dict[str, 'paramiko.SSHClient'] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> 'paramiko.SSHClient':
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            client = self._clients.get(host)
+            transport = client.get_transport() if client else None
+            if transport is not None and transport.is_active():
+                return client
+            if client is not None:
+                client.close()
+
+            client = paramiko.SSHClient()
+            client.load_system_host_keys()
+            client.set_missing_host_key_policy(
+                paramiko.AutoAddPolicy() if self.accept_unknown_hosts else paramiko.RejectPolicy()
+            )
+            client.connect(
+                host, port=self.port, username=self.username, password=self.password,
+                key_filename=self.key_filename, timeout=self.connect_timeout,
+                banner_timeout=self.connect_timeout, auth_timeout=self.connect_timeout
+            )
+            if self.keepalive:
+                client.get_transport().set_keepalive(self.keepalive)
+            self._clients[host] = client
+            logger.debug(f"SSH session opened to {host}")
+            return client
+
+    def discard(self, host: str):
+        with self._lock:
+            client = self._clients.pop(host, None)
+        if client is not None:
+            client.close()
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for client in clients.values():
+            client.close()
+
+class SSHBackend:
+    """Runs SSH operations over pooled sessions; RDP checks probe the RDP port."""
+
+    name = 'ssh'
+
+    def __init__(self, pool: SSHConnectionPool, rdp_port: int = RDP_PORT):
+        self.pool = pool
+        self.rdp_port = rdp_port
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'SSHBackend':
+        ssh = config.get('ssh') or {}
+        return cls(
+            SSHConnectionPool(
+                username=ssh.get('username'),
+                password=ssh.get('password'),
+                port=ssh.get('port', 22),
+                key_filename=ssh.get('key_filename'),
+                connect_timeout=ssh.get('connect_timeout', 10),
+                accept_unknown_hosts=ssh.get('accept_unknown_hosts', False),
+                keepalive=ssh.get('keepalive', 30)
+            ),
+            rdp_port=config.get('rdp_port', RDP_PORT)
+        )
+
+    def run(self, host: str, op: Dict, timeout: float) -> OperationResult:
+        kind, operation = op.get('type'), op.get('operation')
+        if kind == 'rdp' and operation == 'validate_connection':
+            try:
+                with socket.create_connection((host, op.get('port', self.rdp_port)), timeout=timeout):
+                    return OperationResult(host, kind, operation)
+            except OSError as e:
+                return OperationResult(host, kind, operation, ok=False, error=str(e))
+
+        if kind != 'ssh':
+            return OperationResult(host, kind, operation, ok=False, error=f"Unsupported operation {kind}/{operation}")
+        try:
+            client = self.pool.get(host)
+            if operation == 'connect':
+                return OperationResult(host, kind, operation)
+            if operation != 'execute_command':
+                return OperationResult(host, kind, operation, ok=False, error=f"Unsupported operation ssh/{operation}")
+
+            _, stdout, stderr = client.exec_command(op.get('command', ''), timeout=timeout)
+            output = stdout.read().decode(errors='replace')
+            exit_status = stdout.channel.recv_exit_status()
+            return OperationResult(
+                host, kind, operation,
+                ok=exit_status == 0,
+                output=output,
+                error=(stderr.read().decode(errors='replace').strip() or f"exit status {exit_status}") if exit_status else None,
+                exit_status=exit_status
+            )
+        except socket.timeout:
+            return OperationResult(host, kind, operation, ok=False, error=f"timed out after {timeout}s")
+        except Exception as e:
+            # Drop the session so the next operation reconnects
+            self.pool.discard(host)
+            return OperationResult(host, kind, operation, ok=False, error=str(e))
+
+    def close(self):
+        self.pool.close()
+
+BACKENDS = {
+    'mock': lambda config: MockBackend(),
+    'local': lambda config: LocalBackend(shell=config.get('local_shell', False)),
+    'ssh': SSHBackend.from_config
+}
+
+class OperationExecutor:
+    """Runs a test case's ``mock_operations`` through a pluggable backend.
+
+    Operations are grouped by host. Each host's operations run in order,
+    and up to ``max_parallel_hosts`` hosts run at once. ``timeout`` bounds
+    each operation and, summed, each host's whole sequence, timed from when
+    the host actually starts (the pool is shared by every running case, so
+    hosts may queue first). Steps past the budget are reported as timed out
+    and steps after a failed one as skipped; neither is run.
+    """
+
+    def __init__(self, backend=None, max_parallel_hosts: int = 16, timeout: float = 30,
+                 enabled_types: Optional[Dict[str, bool]] = None):
+        self.backend = backend or MockBackend()
+        self.max_parallel_hosts = max(1, max_parallel_hosts)
+        self.timeout = timeout
+        self.enabled_types = enabled_types or {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, framework_config: Optional[Dict]) -> 'OperationExecutor':
+        framework_config = framework_config or {}
+        config = framework_config.get('operations') or {}
+        backend_name = config.get('backend', 'mock')
+        if backend_name not in BACKENDS:
+            raise ValueError(f"Unknown operations backend '{backend_name}' (expected one of {', '.join(BACKENDS)})")
+        components = framework_config.get('mock_components') or {}
+        return cls(
+            BACKENDS[backend_name](config),
+            max_parallel_hosts=config.get('max_parallel_hosts', 16),
+            timeout=config.get('timeout', 30),
+            enabled_types={'ssh': components.get('ssh_enabled', True), 'rdp': components.get('rdp_enabled', True)}
+        )
+
+    def run(self, operations: List[Dict]) -> List[OperationResult]:
+        plan = self._plan(operations)
+        if not plan:
+            return []
+        if len(plan) == 1:
+            host, ops = next(iter(plan.items()))
+            return self._run_host(host, ops)
+
+        executor = self._pool()
+        futures = [
+            executor.submit(contextvars.copy_context().run, self._run_host, host, ops)
+            for host, ops in plan.items()
+        ]
+        # Each host enforces its own budget, so waiting here is bounded
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False)
+        self.backend.close()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Shared across test cases so fan-out threads are not re-created per case
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_parallel_hosts, thread_name_prefix='avi-ops')
+            return self._executor
+
+    def _plan(self, operations: List[Dict]) -> Dict[str, List[Tuple[Dict, float]]]:
+        plan: Dict[str, List[Tuple[Dict, float]]] = {}
+        # Host-less operations follow the last connect of the same type
+        current: Dict[str, List[str]] = {}
+        for op in operations:
+            kind = op.get('type')
+            if not self.enabled_types.get(kind, True):
+                logger.debug(f"Skipping {kind} operation {op.get('operation')} ({kind}_enabled is false)")
+                continue
+            hosts = op.get('hosts') or ([op['host']] if op.get('host') else current.get(kind) or [DEFAULT_HOST])
+            if op.get('operation') == 'connect':
+                current[kind] = list(hosts)
+            timeout = op.get('timeout', self.timeout)
+            for host in hosts:
+                plan.setdefault(host, []).append((op, timeout))
+        return plan
+
+    def _run_host(self, host: str, ops: List[Tuple[Dict, float]]) -> List[OperationResult]:
+        results = []
+        budget = sum(timeout for _, timeout in ops)
+        deadline = time.perf_counter() + budget
+        for position, (op, timeout) in enumerate(ops):
+            start = time.perf_counter()
+            if start >= deadline:
+                # The host's budget is spent: report the remaining steps instead of running them
+                results.extend(
+                    OperationResult(host, pending.get('type'), pending.get('operation'), ok=False,
+                                    error=f"host did not finish within {budget}s")
+                    for pending, _ in ops[position:]
+                )
+                break
+            try:
+                result = self.backend.run(host, op, min(timeout, deadline - start))
+            except Exception as e:
+                result = OperationResult(host, op.get('type'), op.get('operation'), ok=False, error=str(e))
+            result.duration = time.perf_counter() - start
+            if op.get('ignore_errors'):
+                result.ok = True
+            results.append(result)
+            if not result.ok:
+                # Later steps on this host usually depend on the failed one
+                results.extend(
+                    OperationResult(host, pending.get('type'), pending.get('operation'), ok=False,
+                                    error=f"skipped: {op.get('type')}/{op.get('operation')} failed", skipped=True)
+                    for pending, _ in ops[position + 1:]
+                )
+                break
+        return results
\ No newline at end of file
@@ -0,0 +1,85 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+from colorama import Fore
+
+from .records import freeze
+from .validators import rules_from_stage
+
+logger = logging.getLogger(__name__)
+
+COMPONENT_FETCHERS = {
+    'tenants': 'get_tenants',
+    'virtual_services': 'get_virtual_services',
+    'service_engines': 'get_service_engines'
+}
+
+class PrefetchSnapshot:
+    """Read-only collections fetched once per run and shared by every TestCase."""
+
+    __slots__ = ('_collections', 'fetched_at', 'fetch_seconds')
+
+    def __init__(self, collections: Dict[str, Iterable[Dict]], fetch_seconds: float = 0.0):
+        frozen = {
+            component: tuple(freeze(obj) for obj in objects)
+            for component, objects in collections.items()
+        }
+        object.__setattr__(self, '_collections', MappingProxyType(frozen))
+        object.__setattr__(self, 'fetched_at', time.time())
+        object.__setattr__(self, 'fetch_seconds', fetch_seconds)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PrefetchSnapshot is immutable")
+
+    def has(self, component: str) -> bool:
+        return component in self._collections
+
+    def get(self, component: str) -> Tuple[Mapping, ...]:
+        return self._collections[component]
+
+    @property
+    def components(self) -> List[str]:
+        return list(self._collections)
+
+def required_components(test_cases: List[Dict]) -> List[str]:
+    components = []
+    for test_case in test_cases:
+        pre_fetcher = test_case.get('stages', {}).get('pre_fetcher', {})
+        for component in pre_fetcher.get('components', []):
+            if component in COMPONENT_FETCHERS and component not in components:
+                components.append(component)
+    return components
+
+def required_fields(test_cases: List[Dict]) -> Set[str]:
+    """Top-level VS fields read by validation rules and trigger payloads (for rollback)."""
+    fields = set()
+    for test_case in test_cases:
+        stages = test_case.get('stages', {})
+        for stage in ('pre_validation', 'post_validation'):
+            try:
+                fields |= rules_from_stage(stages.get(stage)).fields
+            except ValueError:
+                pass  # reported when the test case runs
+        fields.update((stages.get('trigger') or {}).get('payload') or {})
+    return {field for field in fields if isinstance(field, str) and field.isidentifier()}
+
+def build_snapshot(api_client, components: List[str], concurrent: bool = True) -> PrefetchSnapshot:
+    start = time.perf_counter()
+    
+    def fetch(component):
+        return component, getattr(api_client, COMPONENT_FETCHERS[component])()
+    
+    if concurrent and len(components) > 1:
+        with ThreadPoolExecutor(max_workers=len(components), thread_name_prefix='avi-prefetch') as executor:
+            collections = dict(executor.map(fetch, components))
+    else:
+        collections = dict(fetch(component) for component in components)
+    
+    snapshot = PrefetchSnapshot(collections, fetch_seconds=time.perf_counter() - start)
+    logger.info(f"{Fore.BLUE}Shared pre-fetch: "
+                + ", ".join(f"{len(snapshot.get(c))} {c}" for c in components)
+                + f" ({snapshot.fetch_seconds:.2f}s)")
+    return snapshot
\ No newline at end of file
@@ -0,0 +1,81 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from .cancellation import CancelToken, sleep
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Thread-safe token bucket with AIMD backoff.
+
+    ``penalize`` halves the effective rate (and honours ``Retry-After``) when
+    the controller signals overload; ``reward`` walks it back up towards the
+    configured rate one step per successful request.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None, min_rate: Optional[float] = None,
+                 backoff_factor: float = 0.5, recovery_step: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(1, int(burst if burst is not None else rate))
+        self.min_rate = float(min_rate) if min_rate else max(self.base_rate / 20, 0.1)
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step if recovery_step else self.base_rate / 20
+        
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional['TokenBucket']:
+        if not config or not config.get('requests_per_second'):
+            return None
+        return cls(
+            rate=config['requests_per_second'],
+            burst=config.get('burst'),
+            min_rate=config.get('min_requests_per_second')
+        )
+
+    def acquire(self, tokens: float = 1, cancel_token: Optional[CancelToken] = None) -> float:
+        """Block until ``tokens`` are available; raises ``Cancelled`` if ``cancel_token`` fires first."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                delay = max(0.0, self._blocked_until - now)
+                if delay == 0.0:
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return waited
+                    delay = (tokens - self._tokens) / self.rate
+            sleep(delay, cancel_token)
+            waited += delay
+
+    def penalize(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self._refill(time.monotonic())
+            previous = self.rate
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+            self._tokens = 0.0
+        logger.warning(f"Controller throttling detected, rate {previous:.1f} -> {self.rate:.1f} req/s "
+                       f"(pausing {pause:.2f}s)")
+
+    def reward(self):
+        if self.rate >= self.base_rate:
+            return
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.recovery_step)
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
\ No newline at end of file
@@ -0,0 +1,134 @@
+import logging
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# (record type, field) pairs already reported as loading full objects
+_warned_fields = set()
+_warned_lock = threading.Lock()
+
+# Fields every projection keeps: uuid to fetch the full object later, name
+# for lookups and _last_modified for delta refresh and inventory merges.
+REQUIRED_FIELDS = ('uuid', 'name', '_last_modified')
+
+DEFAULT_FIELDS = {
+    'tenants': ('uuid', 'name'),
+    'virtual_services': ('uuid', 'name', 'enabled', 'traffic_enabled', 'oper_status', 'tenant_ref',
+                         'se_group_ref', '_last_modified'),
+    'service_engines': ('uuid', 'name', 'se_group_ref', 'oper_status', 'vs_refs')
+}
+
+class Record(Mapping):
+    """Read-only projection of a controller object.
+
+    Projected fields live in ``__slots__``; reading any other key fetches the
+    full object once through the record type's loader and caches it on the
+    record. Records behave as mappings, so code written against the JSON
+    dicts (``vs.get('name')``, ``vs['uuid']``) works unchanged.
+    """
+
+    __slots__ = ('_full',)
+    FIELDS: Tuple[str, ...] = ()
+    FIELD_SET: FrozenSet[str] = frozenset()
+    _loader: Optional[Callable[[str], Optional[Dict]]] = None
+
+    def __init__(self, obj: Dict):
+        setattr_ = object.__setattr__
+        for field in self.FIELDS:
+            value = obj.get(field, _MISSING)
+            if value is not _MISSING:
+                setattr_(self, field, value)
+        setattr_(self, '_full', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in self.FIELD_SET:
+            return getattr(self, key, default)
+        return self.full(key).get(key, default)
+
+    def __contains__(self, key) -> bool:
+        if key in self.FIELD_SET:
+            return hasattr(self, key)
+        return key in self.full(key)
+
+    def __iter__(self):
+        return (field for field in self.FIELDS if hasattr(self, field))
+
+    def __len__(self) -> int:
+        return sum(1 for field in self.FIELDS if hasattr(self, field))
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # Loaders are bound to a client, so records pickle as plain dicts
+        return dict, (self.to_dict(),)
+
+    @property
+    def loaded(self) -> bool:
+        return self._full is not None
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.FIELDS if hasattr(self, field)}
+
+    def full(self, field: Optional[str] = None) -> Dict:
+        if self._full is None:
+            full = None
+            uuid = getattr(self, 'uuid', None)
+            if self._loader is not None and uuid is not None:
+                self._log_full_load(uuid, field)
+                full = self._loader(uuid)
+            # Keep the projection if the object cannot be read; don't retry per key
+            object.__setattr__(self, '_full', full if full is not None else self.to_dict())
+        return self._full
+
+    def _log_full_load(self, uuid: str, field: Optional[str]):
+        # One GET per object: fine for a few, slow across a collection
+        name = type(self).__name__
+        logger.debug(f"Loading full {name} {uuid}" + (f" for '{field}'" if field else ''))
+        with _warned_lock:
+            if (name, field) in _warned_fields:
+                return
+            _warned_fields.add((name, field))
+        if field:
+            logger.warning(f"'{field}' is not in the {name} projection; each object is loaded in full on "
+                           f"first access (add it to api.projection.fields)")
+
+def freeze(obj: Mapping) -> Mapping:
+    """Read-only view of a shared controller object; records already are."""
+    if isinstance(obj, (Record, MappingProxyType)):
+        return obj
+    return MappingProxyType(obj)
+
+def record_type(name: str, fields: Iterable[str],
+                loader: Optional[Callable[[str], Optional[Dict]]] = None) -> type:
+    """Build a ``Record`` subclass with one slot per projected top-level field."""
+    fields = tuple(dict.fromkeys([*REQUIRED_FIELDS, *fields]))
+    for field in fields:
+        if not field.isidentifier() or hasattr(Record, field):
+            raise ValueError(f"Cannot project field '{field}' for {name}")
+    return type(name, (Record,), {
+        '__slots__': fields,
+        'FIELDS': fields,
+        'FIELD_SET': frozenset(fields),
+        '_loader': staticmethod(loader) if loader else None
+    })
\ No newline at end of file
@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class JsonlStream:
+    """JSONL results file written one line per result, flushed as each arrives,
+    so a long or interrupted run leaves everything finished so far on disk."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w')
+
+    def write(self, result: Dict):
+        self._write({'type': 'test_case', **result})
+        self.count += 1
+
+    def close(self, run_summary: Optional[Dict] = None) -> str:
+        if not self._file.closed:
+            if run_summary is not None:
+                self._write({'type': 'run_summary', **run_summary})
+            self._file.close()
+        return self.path
+
+    def _write(self, record: Dict):
+        self._file.write(json.dumps(record, default=str) + '\n')
+        self._file.flush()
+
+def write_jsonl(results: List[Dict], path: str, run_summary: Optional[Dict] = None) -> str:
+    stream = JsonlStream(path)
+    for result in results:
+        stream.write(result)
+    return stream.close(run_summary)
+
+def write_junit(results: List[Dict], path: str, suite_name: str = 'avi_test_framework',
+                run_summary: Optional[Dict] = None) -> str:
+    failures = sum(1 for r in results if r.get('status') not in ('PASS', 'SKIP'))
+    suite = ET.Element('testsuite', {
+        'name': suite_name,
+        'tests': str(len(results)),
+        'failures': str(failures),
+        'errors': '0',
+        'skipped': str(sum(1 for r in results if r.get('status') == 'SKIP')),
+        'time': f"{sum(r.get('duration', 0.0) for r in results):.3f}"
+    })
+    
+    if run_summary:
+        properties = ET.SubElement(suite, 'properties')
+        for key, value in run_summary.items():
+            if not isinstance(value, (dict, list)):
+                ET.SubElement(properties, 'property', {'name': key, 'value': str(value)})
+    
+    for result in results:
+        case = ET.SubElement(suite, 'testcase', {
+            'classname': suite_name,
+            'name': result.get('test_case_name', 'unknown'),
+            'time': f"{result.get('duration', 0.0):.3f}"
+        })
+        if result.get('status') == 'SKIP':
+            ET.SubElement(case, 'skipped', {'message': str(result.get('error', 'skipped'))})
+        elif result.get('status') != 'PASS':
+            failure = ET.SubElement(case, 'failure', {'message': str(result.get('error', 'failed'))})
+            failure.text = str(result.get('error', ''))
+        
+        stages = result.get('stages')
+        if stages:
+            case_properties = ET.SubElement(case, 'properties')
+            for stage_name, stage in stages.items():
+                for key, value in stage.items():
+                    ET.SubElement(case_properties, 'property', {
+                        'name': f"{stage_name}.{key}",
+                        'value': f"{value:.6f}" if isinstance(value, float) else str(value)
+                    })
+    
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    ET.ElementTree(suite).write(path, encoding='utf-8', xml_declaration=True)
+    return path
+
+REPORT_WRITERS = {
+    'jsonl': (write_jsonl, 'jsonl'),
+    'junit': (write_junit, 'xml')
+}
+
+def write_report(report_format: str, results: List[Dict], output_dir: str, run_id: str,
+                 run_summary: Optional[Dict] = None) -> str:
+    writer, extension = REPORT_WRITERS[report_format]
+    path = os.path.join(output_dir, f"results_{run_id}.{extension}")
+    writer(results, path, run_summary=run_summary)
+    logger.info(f"Results written to {path}")
+    return path
+
+def write_json(data: Dict, path: str) -> str:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    logger.info(f"Report written to {path}")
+    return path
\ No newline at end of file
@@ -0,0 +1,309 @@
+import logging
+import math
+import os
+import socket
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    duration REAL NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    critical_path_seconds REAL,
+    engine TEXT,
+    selection TEXT,
+    host TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_run_id ON runs (run_id);
+CREATE INDEX IF NOT EXISTS runs_by_context ON runs (engine, selection, id);
+
+CREATE TABLE IF NOT EXISTS case_results (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (run, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS case_results_by_name ON case_results (name, run);
+
+CREATE TABLE IF NOT EXISTS stage_results (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    case_name TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    duration REAL NOT NULL,
+    requests INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    bytes_sent INTEGER NOT NULL DEFAULT 0,
+    bytes_received INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run, case_name, stage)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS stage_results_by_stage ON stage_results (case_name, stage, run);
+
+CREATE TABLE IF NOT EXISTS endpoint_results (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    endpoint TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    p50 REAL,
+    p99 REAL,
+    max REAL,
+    PRIMARY KEY (run, endpoint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS endpoint_results_by_endpoint ON endpoint_results (endpoint, run);
+"""
+
+_APPEND_ONLY = """
+CREATE TRIGGER IF NOT EXISTS {table}_no_update BEFORE UPDATE ON {table}
+BEGIN SELECT RAISE(ABORT, 'result store is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS {table}_no_delete BEFORE DELETE ON {table}
+BEGIN SELECT RAISE(ABORT, 'result store is append-only'); END;
+"""
+
+_TABLES = ('runs', 'case_results', 'stage_results', 'endpoint_results')
+
+# Metric kinds compared run over run, and how each series is read for a set of runs.
+# Only passing cases count: a failed case stops early and would look faster.
+_SERIES_QUERIES = {
+    'run': "SELECT id, 'wall_time', duration FROM runs WHERE id IN ({ids})",
+    'case': "SELECT run, name, duration FROM case_results WHERE run IN ({ids}) AND status = 'PASS'",
+    'stage': (
+        "SELECT s.run, s.case_name || '/' || s.stage, s.duration FROM stage_results s "
+        "JOIN case_results c ON c.run = s.run AND c.name = s.case_name "
+        "WHERE s.run IN ({ids}) AND c.status = 'PASS'"
+    ),
+    'endpoint': "SELECT run, endpoint, mean FROM endpoint_results WHERE run IN ({ids}) AND requests > 0"
+}
+
+# Timer resolution and scheduling jitter: spread below 1% in log space is noise
+_MIN_LOG_STDEV = 0.01
+_MIN_SECONDS = 1e-6
+
+class ResultStore:
+    """Append-only SQLite history of runs: per-case and per-stage durations
+    and per-endpoint API latency, indexed for run-over-run comparison.
+
+    Rows are only ever inserted; triggers reject updates and deletes so a
+    baseline cannot be rewritten after the fact.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL lets a compare read while a concurrent CI job appends
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"{path} was written by a newer framework (schema {version})")
+        self.conn.executescript(_SCHEMA + ''.join(_APPEND_ONLY.format(table=table) for table in _TABLES))
+        self.conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    @classmethod
+    def from_config(cls, framework_config: Optional[Dict]) -> Optional['ResultStore']:
+        config = (framework_config or {}).get('results') or {}
+        if not config.get('enabled', True):
+            return None
+        return cls(config.get('path', 'logs/results.db'))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def record_run(self, run_summary: Dict, results: List[Dict]) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (run_id, started_at, duration, total, passed, failed, skipped, "
+                "critical_path_seconds, engine, selection, host) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_summary['run_id'],
+                    run_summary.get('started_at') or datetime.now().isoformat(),
+                    run_summary.get('duration', 0.0),
+                    run_summary.get('total', len(results)),
+                    run_summary.get('passed', 0),
+                    run_summary.get('failed', 0),
+                    run_summary.get('skipped', 0),
+                    run_summary.get('critical_path_seconds'),
+                    run_summary.get('engine'),
+                    run_summary.get('selection'),
+                    run_summary.get('host') or socket.gethostname()
+                )
+            )
+            run = cursor.lastrowid
+            # A name listed twice keeps its first result rather than failing the insert
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO case_results (run, name, status, duration) VALUES (?, ?, ?, ?)",
+                [(run, r['test_case_name'], r['status'], r.get('duration', 0.0)) for r in results]
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO stage_results (run, case_name, stage, duration, requests, errors, "
+                "bytes_sent, bytes_received) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run, r['test_case_name'], stage, stats.get('duration', 0.0), stats.get('requests', 0),
+                     stats.get('errors', 0), stats.get('bytes_sent', 0), stats.get('bytes_received', 0))
+                    for r in results for stage, stats in (r.get('stages') or {}).items()
+                ]
+            )
+            self.conn.executemany(
+                "INSERT INTO endpoint_results (run, endpoint, requests, errors, mean, p50, p99, max) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run, endpoint, entry.get('requests', 0), entry.get('errors', 0),
+                     entry['latency'].get('mean', 0.0), entry['latency'].get('p50'),
+                     entry['latency'].get('p99'), entry['latency'].get('max'))
+                    for endpoint, entry in (run_summary.get('endpoints') or {}).items()
+                ]
+            )
+        logger.debug(f"Recorded run {run_summary['run_id']} as #{run} in {self.path}")
+        return run
+
+    def find_run(self, run_id: Optional[str] = None) -> Optional[sqlite3.Row]:
+        if run_id is None:
+            return self.conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        # Timestamps are per second, so prefer the latest run with this id
+        return self.conn.execute("SELECT * FROM runs WHERE run_id = ? ORDER BY id DESC LIMIT 1", (run_id,)).fetchone()
+
+    def window(self, run: sqlite3.Row, count: int, before: Optional[int] = None) -> List[int]:
+        """Ids of up to ``count`` earlier runs comparable with ``run`` (same engine
+        and --test-case selection), newest first."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT id FROM runs WHERE engine IS ? AND selection IS ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (run['engine'], run['selection'], run['id'] if before is None else before, count)
+        )]
+
+    def series(self, kind: str, runs: Sequence[int]) -> Dict[str, List[float]]:
+        values: Dict[str, List[float]] = {}
+        if not runs:
+            return values
+        query = _SERIES_QUERIES[kind].format(ids=', '.join('?' * len(runs)))
+        for _, key, value in self.conn.execute(query, list(runs)):
+            values.setdefault(key, []).append(value)
+        return values
+
+    def compare(self, run_id: Optional[str] = None, baseline: int = 20, current: int = 1,
+                alpha: float = 0.01, min_slowdown: float = 0.1, min_baseline: int = 5) -> Dict:
+        """Compare the current window of runs against the baseline window
+        before it, per run, test case, stage and endpoint.
+
+        Every metric is its own test, so p-values are Holm-adjusted across
+        all of them: the chance of flagging anything in an unchanged run
+        stays at ``alpha`` however many cases and endpoints there are.
+        """
+        run = self.find_run(run_id)
+        if run is None:
+            raise ValueError(f"No run {run_id} in {self.path}" if run_id else f"No runs recorded in {self.path}")
+
+        current_runs = [run['id'], *self.window(run, max(1, current) - 1)]
+        baseline_runs = self.window(run, baseline, before=min(current_runs))
+        report = {
+            'run_id': run['run_id'],
+            'engine': run['engine'],
+            'selection': run['selection'],
+            'current_runs': len(current_runs),
+            'baseline_runs': len(baseline_runs),
+            'compared': 0,
+            'insufficient_history': 0,
+            'regressions': []
+        }
+        tests = []
+        for kind in _SERIES_QUERIES:
+            baseline_series = self.series(kind, baseline_runs)
+            for key, values in sorted(self.series(kind, current_runs).items()):
+                history = baseline_series.get(key, [])
+                if len(history) < min_baseline:
+                    report['insufficient_history'] += 1
+                    continue
+                ratio, p_value = slowdown(history, values)
+                tests.append((p_value, ratio, kind, key, history, values))
+        report['compared'] = len(tests)
+
+        tests.sort(key=lambda test: test[0])
+        for rank, (p_value, ratio, kind, key, history, values) in enumerate(tests):
+            if p_value >= alpha / (len(tests) - rank):
+                break
+            if ratio >= 1 + min_slowdown:
+                report['regressions'].append({
+                    'kind': kind,
+                    'metric': key,
+                    'baseline': _geometric_mean(history),
+                    'current': _geometric_mean(values),
+                    'ratio': ratio,
+                    'p_value': p_value,
+                    'samples': (len(history), len(values))
+                })
+        return report
+
+def _logs(values: Iterable[float]) -> List[float]:
+    return [math.log(max(value, _MIN_SECONDS)) for value in values]
+
+def _geometric_mean(values: Sequence[float]) -> float:
+    logs = _logs(values)
+    return math.exp(sum(logs) / len(logs))
+
+def slowdown(baseline: Sequence[float], current: Sequence[float]) -> Tuple[float, float]:
+    """(ratio, one-sided p-value) that ``current`` is slower than ``baseline``.
+
+    Durations are compared on a log scale, where latency noise is roughly
+    symmetric and a change reads as a ratio. The baseline window supplies the
+    spread, so a single current run can be tested. That spread is itself an
+    estimate from a handful of runs, so the p-value comes from Student's t
+    with ``n_base - 1`` degrees of freedom; a normal tail would flag several
+    times ``alpha`` of unchanged runs with five baseline samples.
+    """
+    baseline_logs, current_logs = _logs(baseline), _logs(current)
+    n_base, n_cur = len(baseline_logs), len(current_logs)
+    base_mean = sum(baseline_logs) / n_base
+    cur_mean = sum(current_logs) / n_cur
+    variance = sum((x - base_mean) ** 2 for x in baseline_logs) / (n_base - 1) if n_base > 1 else 0.0
+    stdev = max(math.sqrt(variance), _MIN_LOG_STDEV)
+    t = (cur_mean - base_mean) / (stdev * math.sqrt(1 / n_base + 1 / n_cur))
+    return math.exp(cur_mean - base_mean), _t_upper_tail(t, max(1, n_base - 1))
+
+def _t_upper_tail(t: float, df: int) -> float:
+    """P(T > t) for Student's t with ``df`` degrees of freedom."""
+    tail = 0.5 * _incomplete_beta(df / 2, 0.5, df / (df + t * t))
+    return tail if t >= 0 else 1 - tail
+
+def _incomplete_beta(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta I_x(a, b), by Lentz's continued fraction."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        # The fraction converges fast only below the mean; use the symmetry
+        return 1 - _incomplete_beta(b, a, 1 - x)
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)
+    tiny = 1e-300
+    c, d = 1.0, 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, 200):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1) < 1e-12:
+            break
+    return math.exp(log_front) * fraction / a
\ No newline at end of file
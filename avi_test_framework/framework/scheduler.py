@@ -0,0 +1,250 @@
+import fnmatch
+import heapq
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .cancellation import CancelToken
+
+logger = logging.getLogger(__name__)
+
+WRITE_ACTIONS = ('disable', 'enable', 'update')
+
+def infer_resources(test_case: Dict, write_actions: Iterable[str] = WRITE_ACTIONS) -> Tuple[Set[str], Set[str]]:
+    """(reads, writes) for a test case.
+
+    Declared ``reads``/``writes`` win. Otherwise the target VS (or the
+    selector's name glob) is written when the trigger changes it, and only
+    read otherwise. Resources are strings and may contain globs.
+    """
+    if 'reads' in test_case or 'writes' in test_case:
+        return set(test_case.get('reads') or ()), set(test_case.get('writes') or ())
+
+    if test_case.get('target_selector'):
+        resource = f"vs:{test_case['target_selector'].get('name') or '*'}"
+    elif test_case.get('target_virtual_service'):
+        resource = f"vs:{test_case['target_virtual_service']}"
+    else:
+        return set(), set()
+
+    trigger = test_case.get('stages', {}).get('trigger') or {}
+    if trigger.get('enabled', True) and trigger.get('action') in write_actions:
+        return set(), {resource}
+    return {resource}, set()
+
+def _overlaps(left: Set[str], right: Set[str]) -> bool:
+    for a in left:
+        for b in right:
+            if a == b or fnmatch.fnmatchcase(a, b) or fnmatch.fnmatchcase(b, a):
+                return True
+    return False
+
+class TestGraph:
+    """Dependency DAG over a list of test cases.
+
+    A case runs after every ``depends_on`` entry and after any earlier case
+    it conflicts with: one writes a resource the other reads or writes.
+    Cases with no path between them may run concurrently. A case whose
+    explicit dependency did not pass is skipped; ordering edges that come
+    only from resource conflicts never cause a skip.
+
+    The runners take an optional ``CancelToken``: once it is cancelled no
+    further case starts and the rest are skipped with its reason.
+    ``on_result`` sees every result as it is produced, from one thread.
+    """
+
+    def __init__(self, names: List[str], preds: List[Set[int]], hard_preds: List[Set[int]]):
+        self.names = names
+        self.preds = preds
+        self.hard_preds = hard_preds
+        self.succs: List[List[int]] = [[] for _ in names]
+        for node, node_preds in enumerate(preds):
+            for pred in sorted(node_preds):
+                self.succs[pred].append(node)
+        self.order = self._topological_order()
+
+    @classmethod
+    def build(cls, test_cases: Sequence[Dict], write_actions: Iterable[str] = WRITE_ACTIONS) -> 'TestGraph':
+        write_actions = tuple(write_actions)
+        names = [tc['name'] for tc in test_cases]
+        index = {}
+        for i, name in enumerate(names):
+            if name in index:
+                raise ValueError(f"Duplicate test case name '{name}'")
+            index[name] = i
+
+        resources = [infer_resources(tc, write_actions) for tc in test_cases]
+        preds: List[Set[int]] = [set() for _ in test_cases]
+        hard_preds: List[Set[int]] = [set() for _ in test_cases]
+        for i, tc in enumerate(test_cases):
+            depends_on = tc.get('depends_on') or []
+            for dependency in [depends_on] if isinstance(depends_on, str) else depends_on:
+                if dependency not in index:
+                    raise ValueError(f"Test case '{names[i]}' depends on unknown test case '{dependency}'")
+                hard_preds[i].add(index[dependency])
+                preds[i].add(index[dependency])
+
+            reads, writes = resources[i]
+            for j in range(i):
+                other_reads, other_writes = resources[j]
+                if _overlaps(writes, other_reads | other_writes) or _overlaps(reads, other_writes):
+                    preds[i].add(j)
+        return cls(names, preds, hard_preds)
+
+    @property
+    def edges(self) -> int:
+        return sum(len(p) for p in self.preds)
+
+    def levels(self) -> int:
+        depth = [0] * len(self.names)
+        for node in self.order:
+            depth[node] = 1 + max((depth[p] for p in self.preds[node]), default=0)
+        return max(depth, default=0)
+
+    def components(self) -> List[List[int]]:
+        """Groups of cases connected by any edge, each in declaration order."""
+        parent = list(range(len(self.names)))
+
+        def find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for node, node_preds in enumerate(self.preds):
+            for pred in node_preds:
+                parent[find(pred)] = find(node)
+        groups: Dict[int, List[int]] = {}
+        for node in range(len(self.names)):
+            groups.setdefault(find(node), []).append(node)
+        return list(groups.values())
+
+    def failed_dependency(self, node: int, results: List[Optional[Dict]]) -> Optional[str]:
+        for pred in sorted(self.hard_preds[node]):
+            result = results[pred]
+            if result is None or result.get('status') != 'PASS':
+                return self.names[pred]
+        return None
+
+    def blocked(self, node: int, results: List[Optional[Dict]],
+                cancel_token: Optional[CancelToken] = None) -> Optional[str]:
+        """Why ``node`` must not start, or None when it may."""
+        if cancel_token is not None and cancel_token.cancelled:
+            return cancel_token.reason
+        failed = self.failed_dependency(node, results)
+        return f"dependency {failed} did not pass" if failed else None
+
+    def run_sequential(self, execute: Callable[[int], Dict], skip: Callable[[int, str], Dict],
+                       cancel_token: Optional[CancelToken] = None,
+                       on_result: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
+        results: List[Optional[Dict]] = [None] * len(self.names)
+        for node in self.order:
+            reason = self.blocked(node, results, cancel_token)
+            results[node] = skip(node, reason) if reason else execute(node)
+            if on_result is not None:
+                on_result(node, results[node])
+        return results
+
+    def run_threaded(self, execute: Callable[[int], Dict], skip: Callable[[int, str], Dict],
+                     max_workers: int, cancel_token: Optional[CancelToken] = None,
+                     on_result: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
+        results: List[Optional[Dict]] = [None] * len(self.names)
+        remaining = [len(p) for p in self.preds]
+        ready = [node for node, count in enumerate(remaining) if count == 0]
+        heapq.heapify(ready)
+        running = {}
+
+        def complete(node: int, result: Dict):
+            results[node] = result
+            if on_result is not None:
+                on_result(node, result)
+            for succ in self.succs[node]:
+                remaining[succ] -= 1
+                if remaining[succ] == 0:
+                    heapq.heappush(ready, succ)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='avi-test') as executor:
+            try:
+                while ready or running:
+                    # Lowest index first keeps runs close to declaration order
+                    while ready and len(running) < max_workers:
+                        node = heapq.heappop(ready)
+                        reason = self.blocked(node, results, cancel_token)
+                        if reason:
+                            complete(node, skip(node, reason))
+                            continue
+                        running[executor.submit(execute, node)] = node
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        complete(running.pop(future), future.result())
+            except BaseException:
+                # Interrupted (Ctrl-C): abort the running cases rather than wait them out
+                if cancel_token is not None:
+                    cancel_token.cancel('interrupted')
+                raise
+        return results
+
+    def critical_path(self, durations: Sequence[float]) -> Tuple[float, List[str]]:
+        """Longest duration-weighted chain: the lower bound on wall time for this graph."""
+        finish = [0.0] * len(self.names)
+        via: List[Optional[int]] = [None] * len(self.names)
+        for node in self.order:
+            pred = max(self.preds[node], key=lambda p: finish[p], default=None)
+            finish[node] = (durations[node] or 0.0) + (finish[pred] if pred is not None else 0.0)
+            via[node] = pred
+        if not finish:
+            return 0.0, []
+
+        node = max(range(len(finish)), key=lambda n: finish[n])
+        total, path = finish[node], []
+        while node is not None:
+            path.append(self.names[node])
+            node = via[node]
+        return total, path[::-1]
+
+    def _topological_order(self) -> List[int]:
+        remaining = [len(p) for p in self.preds]
+        ready = [node for node, count in enumerate(remaining) if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            node = heapq.heappop(ready)
+            order.append(node)
+            for succ in self.succs[node]:
+                remaining[succ] -= 1
+                if remaining[succ] == 0:
+                    heapq.heappush(ready, succ)
+        if len(order) != len(self.names):
+            cycle = [self.names[node] for node, count in enumerate(remaining) if count]
+            raise ValueError(f"Dependency cycle between test cases: {', '.join(cycle)}")
+        return order
+
+
+def select_test_cases(test_cases: Sequence[Dict], names: Iterable[str]) -> List[Dict]:
+    """The named cases plus everything they transitively depend on, in file order."""
+    by_name = {tc['name']: tc for tc in test_cases}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown test case(s) {', '.join(unknown)} (available: {', '.join(by_name)})")
+
+    selected: Set[str] = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in selected or name not in by_name:
+            continue
+        selected.add(name)
+        depends_on = by_name[name].get('depends_on') or []
+        pending.extend([depends_on] if isinstance(depends_on, str) else depends_on)
+    return [tc for tc in test_cases if tc['name'] in selected]
+
+def partition(test_cases: Sequence[Dict], parts: int, write_actions: Iterable[str] = WRITE_ACTIONS) -> List[List[int]]:
+    """Split case indexes into ``parts`` groups that never separate connected
+    cases. Without any edges this is plain round-robin."""
+    groups: List[List[int]] = [[] for _ in range(max(1, parts))]
+    components = TestGraph.build(test_cases, write_actions).components()
+    for component in sorted(components, key=len, reverse=True):
+        min(groups, key=len).extend(component)
+    return [sorted(group) for group in groups]
\ No newline at end of file
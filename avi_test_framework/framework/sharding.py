@@ -0,0 +1,170 @@
+import logging
+import multiprocessing
+import multiprocessing.util
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from colorama import Fore
+
+from .cancellation import CancelToken
+from .scheduler import partition
+
+logger = logging.getLogger(__name__)
+
+_worker_runner = None
+_worker_cancel = None
+_worker_results = None
+
+def shard_test_cases(test_cases: List[Dict], shard_index: int, shard_count: int) -> List[Dict]:
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index}/{shard_count}")
+    # Cases that depend on or conflict with each other form one component and
+    # stay in one shard; components go largest first into the shard with the
+    # fewest cases so far (round-robin when no cases are connected)
+    return [test_cases[i] for i in partition(test_cases, shard_count)[shard_index]]
+
+def _init_worker(config: Dict, credentials: Dict, test_cases_config: Dict, engine: str, workers: int,
+                 fail_fast: Optional[bool] = None, cancel_event=None, result_queue=None):
+    global _worker_runner, _worker_cancel, _worker_results
+    from .api_client import APIClient
+    from .test_runner import TestRunner
+    from .utils import setup_logging, stop_logging
+    
+    # The parent's listener thread does not exist in this process. Workers
+    # append to the same file, so leave rotation to the parent.
+    log_settings = config.get('framework', {}).get('logging', {})
+    setup_logging(
+        logging.getLogger().getEffectiveLevel(),
+        log_file=log_settings.get('file', 'logs/test_execution.log'),
+        rotate=False
+    )
+    # Pool workers skip atexit handlers, so drain the queue from a finalizer
+    multiprocessing.util.Finalize(None, stop_logging, exitpriority=0)
+    
+    api_config = dict(config['api'])
+    rate_limit = api_config.get('rate_limit')
+    if rate_limit and rate_limit.get('requests_per_second'):
+        # Split the budget so the pool as a whole respects the configured rate
+        api_config['rate_limit'] = {
+            **rate_limit,
+            'requests_per_second': rate_limit['requests_per_second'] / workers,
+            'burst': max(1, int((rate_limit.get('burst') or rate_limit['requests_per_second']) / workers))
+        }
+    
+    api_client = APIClient.from_config(
+        api_config,
+        credentials,
+        concurrency=config.get('framework', {}).get('max_workers', 1)
+    )
+    if not api_client.authenticate():
+        raise RuntimeError(f"Worker {os.getpid()} failed to authenticate")
+    
+    _worker_runner = TestRunner(
+        api_client=api_client,
+        config=config,
+        test_cases_config=test_cases_config,
+        engine=engine,
+        fail_fast=fail_fast
+    )
+    _worker_cancel = cancel_event
+    _worker_results = result_queue
+
+def _watch_cancel(cancel_event, token: CancelToken):
+    cancel_event.wait()
+    token.cancel('fail-fast in another worker')
+
+def _run_chunk(chunk: List[Tuple[int, Dict]]) -> Tuple[List[Tuple[int, Dict]], Dict[str, Dict]]:
+    indexes = [index for index, _ in chunk]
+    token = CancelToken()
+    if _worker_cancel is not None:
+        # Cancelling here (fail-fast) stops every worker, and the other way round
+        token.on_cancel(_worker_cancel.set)
+        threading.Thread(target=_watch_cancel, args=(_worker_cancel, token), daemon=True).start()
+    
+    on_result = None
+    if _worker_results is not None:
+        position = {test_case['name']: index for index, test_case in chunk}
+        on_result = lambda result: _worker_results.put((position[result['test_case_name']], result))
+    
+    results = _worker_runner.run_all([test_case for _, test_case in chunk], on_result=on_result, cancel_token=token)
+    # Hand this chunk's request metrics back with its results; the parent merges them
+    return list(zip(indexes, results)), _worker_runner.api_client.metrics.drain()
+
+class ShardedRunner:
+    """Runs test cases across a pool of processes, one APIClient per process."""
+
+    def __init__(self, config: Dict, credentials: Dict, test_cases_config: Dict,
+                 workers: int, engine: Optional[str] = None, fail_fast: Optional[bool] = None,
+                 parallel: bool = False, metrics=None):
+        self.config = config
+        self.credentials = credentials
+        self.test_cases_config = test_cases_config
+        self.workers = max(1, workers)
+        # Same default as TestRunner, applied inside each worker
+        self.engine = engine or ('threaded' if parallel else 'sequential')
+        self.fail_fast = fail_fast
+        # Worker RequestMetrics are merged into this one as chunks finish
+        self.metrics = metrics
+        self.cancel_reason: Optional[str] = None
+
+    def run_all(self, test_cases: List[Dict], on_result: Optional[Callable[[Dict], None]] = None,
+                cancel_token: Optional[CancelToken] = None) -> List[Dict]:
+        self.cancel_reason = None
+        if not test_cases:
+            return []
+        
+        workers = min(self.workers, len(test_cases))
+        chunks = [
+            [(index, test_cases[index]) for index in group]
+            for group in partition(test_cases, workers) if group
+        ]
+        
+        logger.info(f"\n{Fore.YELLOW}Running {len(test_cases)} test cases across {len(chunks)} worker processes...")
+        
+        results: List[Optional[Dict]] = [None] * len(test_cases)
+        cancel_event = multiprocessing.Event()
+        # Workers report each result as it completes, not just when their chunk is done
+        result_queue = multiprocessing.Queue() if on_result is not None else None
+        if cancel_token is not None:
+            cancel_token.on_cancel(cancel_event.set)
+        
+        with ProcessPoolExecutor(
+            max_workers=len(chunks),
+            initializer=_init_worker,
+            initargs=(self.config, self.credentials, self.test_cases_config, self.engine, len(chunks),
+                      self.fail_fast, cancel_event, result_queue)
+        ) as executor:
+            futures = [executor.submit(_run_chunk, chunk) for chunk in chunks]
+            try:
+                # Every case is reported exactly once, so read until all have
+                # arrived; leaving items behind can block a worker's exit
+                streamed = set()
+                while result_queue is not None and len(streamed) < len(test_cases):
+                    try:
+                        index, result = result_queue.get(timeout=0.2)
+                    except queue.Empty:
+                        if any(future.done() and future.exception() is not None for future in futures):
+                            break
+                        continue
+                    streamed.add(index)
+                    on_result(result)
+                
+                for future in futures:
+                    chunk_results, chunk_metrics = future.result()
+                    for index, result in chunk_results:
+                        results[index] = result
+                    if self.metrics is not None:
+                        self.metrics.merge(chunk_metrics)
+            except BaseException:
+                # Interrupted (Ctrl-C): stop the workers instead of waiting them out
+                cancel_event.set()
+                raise
+        
+        if cancel_event.is_set():
+            self.cancel_reason = cancel_token.reason if cancel_token is not None and cancel_token.cancelled \
+                else 'fail-fast in a worker process'
+        logger.info(f"{Fore.GREEN}All worker processes completed")
+        return results
\ No newline at end of file
@@ -0,0 +1,292 @@
+import itertools
+import logging
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+
+from colorama import Fore
+
+from .cancellation import CancelToken
+from .metrics import LatencyHistogram
+from .scheduler import TestGraph
+from .test_runner import TestCase
+from .utils import percentile
+
+logger = logging.getLogger(__name__)
+
+class SoakRunner:
+    """Repeatedly schedules test cases against the controller for a fixed duration.
+
+    Open-loop mode (``rate``) starts cases on a fixed schedule regardless of
+    how long earlier ones take, and measures latency from the scheduled start
+    so queueing delay is not hidden. Closed-loop mode (``concurrency``) keeps
+    that many cases in flight back to back.
+
+    Cases connected in the ``TestGraph`` (dependencies or conflicting
+    reads/writes, including a writer and its own next run) form a group, and
+    at most one case per group is in flight at a time; a group's cases run in
+    file order. Every iteration runs against the state the previous one left,
+    so a suite that changes the controller must also restore it (follow a
+    ``disable`` case with the matching ``enable``), or each case after the
+    first fails its pre-validation.
+
+    The first Ctrl+C stops scheduling and lets running cases finish; the
+    second cancels the run's ``CancelToken``, aborting in-flight requests.
+    Either way the report covers what completed.
+    """
+
+    def __init__(self, runner, test_cases: List[Dict], duration: float, rate: Optional[float] = None,
+                 concurrency: Optional[int] = None, interval: float = 10.0, max_in_flight: int = 256):
+        if not test_cases:
+            raise ValueError("Soak mode needs at least one test case")
+        if not rate and not concurrency:
+            raise ValueError("Soak mode needs a target rate or concurrency")
+        self.runner = runner
+        self.test_cases = test_cases
+        self.duration = duration
+        self.rate = rate
+        self.concurrency = concurrency
+        self.interval = interval
+        self.max_in_flight = max_in_flight
+        
+        self._groups: Dict[str, int] = {}
+        components = TestGraph.build(test_cases, TestCase.UPDATE_ACTIONS).components()
+        for group, members in enumerate(components):
+            for index in members:
+                self._groups[test_cases[index]['name']] = group
+        self.group_count = len(components)
+        # Closed loop: groups take turns, each cycling through its own cases in file order
+        self._group_order = itertools.cycle(range(self.group_count))
+        self._group_cases = {
+            group: itertools.cycle([test_cases[index] for index in members])
+            for group, members in enumerate(components)
+        }
+        self._busy = set()
+        # Open loop: cases scheduled while their group is busy, oldest first
+        self._pending: Dict[int, Deque[Tuple[Dict, float]]] = {}
+        
+        self.cancel_token = CancelToken()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._cases = itertools.cycle(test_cases)
+        self._window: List[float] = []
+        self._window_errors = 0
+        self._window_dropped = 0
+        self._histogram = LatencyHistogram()
+        self._completed = 0
+        self._errors = 0
+        self._dropped = 0
+        self._cancelled = 0
+        self._in_flight = 0
+        self._warned_saturated = False
+
+    def stop(self):
+        self._stop.set()
+    
+    def abort(self, reason: str = 'soak run aborted'):
+        self._stop.set()
+        self.cancel_token.cancel(reason)
+
+    def run(self) -> Dict:
+        mode = f"open-loop {self.rate} cases/s" if self.rate else f"closed-loop concurrency {self.concurrency}"
+        logger.info(f"\n{Fore.YELLOW}Soak run: {mode} for {self.duration:.0f}s "
+                    f"(reporting every {self.interval:.0f}s, Ctrl+C to stop early)")
+        if self.concurrency and self.concurrency > self.group_count:
+            logger.warning(f"{Fore.YELLOW}Concurrency {self.concurrency} exceeds the {self.group_count} independent "
+                           f"case group(s) in the suite; at most {self.group_count} case(s) will be in flight")
+        elif self.rate:
+            logger.info(f"{Fore.BLUE}{self.group_count} independent case group(s); cases in a group run one at a "
+                        f"time, so the rate a group can sustain is bounded by its case latency")
+        
+        self.runner.prepare(self.test_cases)
+        self.runner.cancel_token = self.cancel_token
+        self.runner.api_client.bind_cancel_token(self.cancel_token)
+        previous_handler = self._install_sigint_handler()
+        reporter = threading.Thread(target=self._report_loop, name='avi-soak-report', daemon=True)
+        start = time.monotonic()
+        reporter.start()
+        try:
+            if self.rate:
+                self._run_open_loop(start)
+            else:
+                self._run_closed_loop(start)
+        finally:
+            self._stop.set()
+            reporter.join()
+            self.runner.api_client.bind_cancel_token(None)
+            self.runner.close()
+            if previous_handler is not None:
+                signal.signal(signal.SIGINT, previous_handler)
+        
+        return self._final_report(time.monotonic() - start)
+
+    def _run_open_loop(self, start: float):
+        period = 1.0 / self.rate
+        deadline = start + self.duration
+        next_start = start
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='avi-soak') as executor:
+            while not self._stop.is_set() and next_start < deadline:
+                delay = next_start - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+                test_case_config = self._schedule(next_start)
+                if test_case_config is not None:
+                    executor.submit(self._run_group, test_case_config, next_start)
+                next_start += period
+            # Let running cases finish but start none of the queued ones
+            self._stop.set()
+        # Cases still queued behind their group when the run stopped never started
+        with self._lock:
+            never_started = sum(len(pending) for pending in self._pending.values())
+            self._pending.clear()
+            self._dropped += never_started
+            self._in_flight -= never_started
+    
+    def _schedule(self, scheduled_at: float) -> Optional[Dict]:
+        # Returns the case if its group is idle; otherwise queues it behind the running one
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self._dropped += 1
+                if not self._warned_saturated:
+                    self._warned_saturated = True
+                    logger.warning(f"{Fore.RED}[soak] {self.max_in_flight} cases in flight or queued: the suite's "
+                                   f"{self.group_count} case group(s) cannot keep up with {self.rate} cases/s, "
+                                   f"dropping cases")
+                return None
+            self._in_flight += 1
+            test_case_config = next(self._cases)
+            group = self._groups[test_case_config['name']]
+            if group in self._busy:
+                self._pending.setdefault(group, deque()).append((test_case_config, scheduled_at))
+                return None
+            self._busy.add(group)
+            return test_case_config
+    
+    def _run_group(self, test_case_config: Dict, scheduled_at: float):
+        # Runs the case, then whatever queued behind it in the same group;
+        # queueing time counts towards each case's latency
+        group = self._groups[test_case_config['name']]
+        while True:
+            self._execute(test_case_config, scheduled_at)
+            with self._idle:
+                pending = self._pending.get(group)
+                if not pending or self._stop.is_set():
+                    self._busy.discard(group)
+                    self._idle.notify_all()
+                    return
+                test_case_config, scheduled_at = pending.popleft()
+
+    def _run_closed_loop(self, start: float):
+        deadline = start + self.duration
+        
+        def worker():
+            while True:
+                test_case_config = self._claim_next_case(deadline)
+                if test_case_config is None:
+                    return
+                try:
+                    self._execute(test_case_config, time.monotonic())
+                finally:
+                    with self._idle:
+                        self._busy.discard(self._groups[test_case_config['name']])
+                        self._idle.notify_all()
+        
+        # Workers beyond the group count would only wait for a busy group
+        workers = [threading.Thread(target=worker, name=f"avi-soak-{i}", daemon=True)
+                   for i in range(min(self.concurrency, self.group_count))]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    def _claim_next_case(self, deadline: float) -> Optional[Dict]:
+        # Take the next idle group's next case rather than queue behind a busy group
+        with self._idle:
+            while not self._stop.is_set() and time.monotonic() < deadline:
+                for _ in range(self.group_count):
+                    group = next(self._group_order)
+                    if group not in self._busy:
+                        self._busy.add(group)
+                        self._in_flight += 1
+                        return next(self._group_cases[group])
+                self._idle.wait(min(1.0, max(0.0, deadline - time.monotonic())))
+        return None
+
+    def _execute(self, test_case_config: Dict, scheduled_at: float):
+        # The caller holds the case's group
+        try:
+            result = self.runner.run_one(test_case_config)
+            failed = result.get('status') != 'PASS'
+        except Exception as e:
+            logger.error(f"{Fore.RED}Soak case {test_case_config.get('name')} crashed: {str(e)}")
+            failed = True
+        latency = time.monotonic() - scheduled_at
+        
+        with self._lock:
+            self._in_flight -= 1
+            if self.cancel_token.cancelled:
+                # Aborted part-way: neither a result nor a latency sample
+                self._cancelled += 1
+                return
+            self._completed += 1
+            self._errors += int(failed)
+            self._window.append(latency)
+            self._window_errors += int(failed)
+            self._histogram.record(latency)
+
+    def _report_loop(self):
+        last = time.monotonic()
+        while not self._stop.wait(self.interval):
+            now = time.monotonic()
+            self._report_window(now - last)
+            last = now
+        # Skip a sliver of a final window; its rate would be meaningless
+        if time.monotonic() - last >= self.interval * 0.1:
+            self._report_window(time.monotonic() - last)
+
+    def _report_window(self, elapsed: float):
+        with self._lock:
+            window, errors, in_flight = self._window, self._window_errors, self._in_flight
+            dropped = self._dropped - self._window_dropped
+            self._window, self._window_errors, self._window_dropped = [], 0, self._dropped
+        if not window and not in_flight and not dropped:
+            return
+        
+        throughput = len(window) / elapsed if elapsed > 0 else 0.0
+        error_rate = errors / len(window) if window else 0.0
+        logger.info(f"{Fore.RED if dropped else Fore.CYAN}[soak] {throughput:6.1f} cases/s | errors {error_rate:6.1%} | "
+                    f"p50 {percentile(window, 50) * 1000:7.1f}ms | p95 {percentile(window, 95) * 1000:7.1f}ms | "
+                    f"p99 {percentile(window, 99) * 1000:7.1f}ms | in-flight {in_flight} | dropped {dropped}")
+
+    def _final_report(self, elapsed: float) -> Dict:
+        with self._lock:
+            return {
+                'duration': elapsed,
+                'completed': self._completed,
+                'errors': self._errors,
+                'dropped': self._dropped,
+                'cancelled': self._cancelled,
+                'throughput': self._completed / elapsed if elapsed > 0 else 0.0,
+                'error_rate': self._errors / self._completed if self._completed else 0.0,
+                'latency': self._histogram.to_dict()
+            }
+
+    def _install_sigint_handler(self):
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        
+        def handle_sigint(signum, frame):
+            if self.cancel_token.cancelled:
+                raise KeyboardInterrupt
+            if self._stop.is_set():
+                logger.warning(f"{Fore.RED}Aborting in-flight cases...")
+                self.abort('soak run interrupted')
+                return
+            logger.warning(f"{Fore.YELLOW}Interrupted, waiting for in-flight cases to finish (Ctrl+C again to abort)...")
+            self._stop.set()
+        
+        return signal.signal(signal.SIGINT, handle_sigint)
\ No newline at end of file
@@ -1,81 +1,166 @@
 import logging
-import threading
 import time
-from typing import Dict, List
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
 from datetime import datetime
 from colorama import Fore
 
+from .bulk import BulkExecutor, select_virtual_services
+from .cancellation import CancelToken, Cancelled
+from .convergence import ConvergenceWaiter
+from .metrics import StageStats, stage_scope
+from .operations import OperationExecutor
+from .prefetch import PrefetchSnapshot, build_snapshot, required_components, required_fields
+from .scheduler import WRITE_ACTIONS, TestGraph
+from .utils import case_log_buffer
+from .validators import RuleSet, log_violations, rules_from_stage
+
 logger = logging.getLogger(__name__)
 
 class TestCase:
-    def __init__(self, name: str, config: Dict, api_client):
+    UPDATE_ACTIONS = WRITE_ACTIONS
+    
+    def __init__(self, name: str, config: Dict, api_client, snapshot: Optional[PrefetchSnapshot] = None,
+                 settings: Optional[Dict] = None, operations: Optional[OperationExecutor] = None):
         self.name = name
         self.config = config
         self.api_client = api_client
+        self.snapshot = snapshot
+        self.settings = settings or {}
+        self.operations = operations
         self.vs_uuid = None
+        self.bulk_targets: List[Mapping] = []
+        self.stage_metrics: Dict[str, Dict] = {}
+        self.metrics: Dict = {}
+        self._rules: Dict[str, RuleSet] = {}
     
     def execute(self) -> Dict:
-        logger.info(f"\n{Fore.CYAN}{'='*50}")
-        logger.info(f"{Fore.YELLOW}Executing Test Case: {self.name}")
-        logger.info(f"{Fore.CYAN}{'='*50}")
-        
+        self._log_header()
         start_time = datetime.now()
         
         try:
-            # Execute stages
-            self._pre_fetcher()
-            self._pre_validation()
-            self._trigger()
-            self._post_validation()
-            
-            duration = (datetime.now() - start_time).total_seconds()
-            
-            result = {
-                'test_case_name': self.name,
-                'status': 'PASS',
-                'duration': duration,
-                'timestamp': start_time.isoformat()
-            }
-            
-            logger.info(f"\n{Fore.GREEN}Test Case {self.name}: PASS ({duration:.2f}s)")
-            return result
+            for stage_name, stage in self._stages():
+                self._run_stage(stage_name, stage)
+            return self._pass_result(start_time)
             
+        except Cancelled as e:
+            return self._cancelled_result(start_time, e)
         except Exception as e:
-            logger.error(f"{Fore.RED}Test case failed: {str(e)}")
-            return {
-                'test_case_name': self.name,
-                'status': 'FAIL',
-                'error': str(e),
-                'duration': (datetime.now() - start_time).total_seconds()
+            return self._fail_result(start_time, e)
+    
+    def _stages(self):
+        return [
+            ('pre_fetcher', self._pre_fetcher),
+            ('pre_validation', self._pre_validation),
+            ('trigger', self._trigger),
+            ('post_validation', self._post_validation)
+        ]
+    
+    def _run_stage(self, stage_name: str, stage):
+        stats = StageStats()
+        start = time.perf_counter()
+        try:
+            with stage_scope(stats):
+                stage()
+        finally:
+            self.stage_metrics[stage_name] = {
+                'duration': time.perf_counter() - start,
+                **stats.to_dict()
             }
     
+    def _log_header(self):
+        logger.info(f"\n{Fore.CYAN}{'='*50}")
+        logger.info(f"{Fore.YELLOW}Executing Test Case: {self.name}")
+        logger.info(f"{Fore.CYAN}{'='*50}")
+    
+    def _pass_result(self, start_time: datetime) -> Dict:
+        duration = (datetime.now() - start_time).total_seconds()
+        
+        result = {
+            'test_case_name': self.name,
+            'status': 'PASS',
+            'duration': duration,
+            'timestamp': start_time.isoformat(),
+            'stages': dict(self.stage_metrics),
+            'metrics': dict(self.metrics)
+        }
+        
+        logger.info(f"\n{Fore.GREEN}Test Case {self.name}: PASS ({duration:.2f}s)")
+        return result
+    
+    def _fail_result(self, start_time: datetime, error: Exception) -> Dict:
+        logger.error(f"{Fore.RED}Test case failed: {str(error)}")
+        return {
+            'test_case_name': self.name,
+            'status': 'FAIL',
+            'error': str(error),
+            'duration': (datetime.now() - start_time).total_seconds(),
+            'timestamp': start_time.isoformat(),
+            'stages': dict(self.stage_metrics),
+            'metrics': dict(self.metrics)
+        }
+    
+    def _cancelled_result(self, start_time: datetime, cancelled: Cancelled) -> Dict:
+        # Stopped part-way, so neither a pass nor a failure of its own
+        logger.warning(f"{Fore.YELLOW}Test case {self.name} cancelled: {str(cancelled)}")
+        return {
+            'test_case_name': self.name,
+            'status': 'SKIP',
+            'error': f"cancelled: {str(cancelled)}",
+            'duration': (datetime.now() - start_time).total_seconds(),
+            'timestamp': start_time.isoformat(),
+            'stages': dict(self.stage_metrics),
+            'metrics': dict(self.metrics)
+        }
+    
     def _pre_fetcher(self):
         logger.info(f"\n{Fore.BLUE}[Pre-Fetcher Stage]")
         
         components = self.config['stages']['pre_fetcher']['components']
         
         for component in components:
-            if component == 'tenants':
-                tenants = self.api_client.get_tenants()
-                logger.info(f"  ✓ Fetched {len(tenants)} tenants")
-                if tenants:
-                    logger.info(f"     Sample: {[t.get('name', 'N/A') for t in tenants[:3]]}")
-                
+            if self.snapshot is not None and self.snapshot.has(component):
+                objects = self.snapshot.get(component)
+                source = " (shared snapshot)"
+            elif component == 'tenants':
+                objects = self.api_client.iter_tenants()
+                source = ""
             elif component == 'virtual_services':
-                virtual_services = self.api_client.get_virtual_services()
-                logger.info(f"  ✓ Fetched {len(virtual_services)} virtual services")
-                if virtual_services:
-                    logger.info(f"     Sample: {[vs.get('name', 'N/A') for vs in virtual_services[:3]]}")
-                
+                objects = self.api_client.get_virtual_services()
+                source = ""
             elif component == 'service_engines':
-                service_engines = self.api_client.get_service_engines()
-                logger.info(f"  ✓ Fetched {len(service_engines)} service engines")
-                if service_engines:
-                    logger.info(f"     Sample: {[se.get('name', 'N/A') for se in service_engines[:3]]}")
+                objects = self.api_client.iter_service_engines()
+                source = ""
+            else:
+                continue
+            
+            count, sample = self._count_and_sample(objects)
+            logger.info(f"  ✓ Fetched {count} {component.replace('_', ' ')}{source}")
+            if sample:
+                logger.info(f"     Sample: {sample}")
+    
+    @staticmethod
+    def _count_and_sample(objects, sample_size: int = 3):
+        count = 0
+        sample = []
+        for obj in objects:
+            if count < sample_size:
+                sample.append(obj.get('name', 'N/A'))
+            count += 1
+        return count, sample
+    
+    def _stage_rules(self, stage: str) -> RuleSet:
+        # Compiled once per test case, then evaluated against every target
+        if stage not in self._rules:
+            self._rules[stage] = rules_from_stage(self.config['stages'].get(stage))
+        return self._rules[stage]
     
     def _pre_validation(self):
         logger.info(f"\n{Fore.BLUE}[Pre-Validation Stage]")
         
+        selector = self.config.get('target_selector')
+        if selector:
+            return self._pre_validation_bulk(selector)
+        
         target_vs_name = self.config.get('target_virtual_service')
         if not target_vs_name:
             raise Exception("No target virtual service specified")
@@ -88,119 +173,298 @@ class TestCase:
         self.vs_uuid = virtual_service.get('uuid')
         logger.info(f"  ✓ Found VS '{target_vs_name}' (UUID: {self.vs_uuid})")
         
-        field = self.config['stages']['pre_validation'].get('validate')
-        expected_value = self.config['stages']['pre_validation'].get('expected_value')
+        rules = self._stage_rules('pre_validation')
+        violations = rules.check(virtual_service)
+        if violations:
+            self.metrics['violations'] = [v.to_dict() for v in violations]
+            raise Exception(f"Validation failed: {'; '.join(str(v) for v in violations)}")
+        logger.info(f"  ✓ Validation passed: {rules}")
+    
+    def _pre_validation_bulk(self, selector: Dict):
+        tenants = None
+        if selector.get('tenant'):
+            tenants = self.snapshot.get('tenants') if self.snapshot and self.snapshot.has('tenants') \
+                else self.api_client.get_tenants()
         
-        actual_value = virtual_service.get(field)
-        if actual_value == expected_value:
-            logger.info(f"  ✓ Validation passed: {field} = {actual_value}")
-        else:
-            raise Exception(f"Validation failed: {field} = {actual_value} (expected {expected_value})")
+        targets = select_virtual_services(self.api_client.get_virtual_services(), selector, tenants)
+        if not targets:
+            raise Exception(f"No virtual services match selector {selector}")
+        logger.info(f"  ✓ Selector {selector} matched {len(targets)} virtual services")
+        
+        rules = self._stage_rules('pre_validation')
+        if rules:
+            violations = rules.evaluate(targets)
+            if violations:
+                self.metrics['violations'] = [v.to_dict() for v in violations]
+                log_violations(violations)
+                failing = len({v.uuid for v in violations})
+                raise Exception(f"Validation failed for {failing}/{len(targets)} virtual services "
+                                f"({len(violations)} violations)")
+            logger.info(f"  ✓ Validation passed: {rules} on all {len(targets)}")
+        
+        self.bulk_targets = targets
     
     def _trigger(self):
         logger.info(f"\n{Fore.BLUE}[Task/Trigger Stage]")
         
-        if not self.vs_uuid:
+        if not self.vs_uuid and not self.bulk_targets:
             raise Exception("No virtual service UUID available")
         
         action = self.config['stages']['trigger'].get('action')
         payload = self.config['stages']['trigger'].get('payload', {})
         
         logger.info(f"  ⚡ Executing action: {action}")
-        logger.info(f"  📤 Payload: {payload}")
+        logger.info("  📤 Payload: %s", payload)
         
-        if action == 'disable':
+        if action in self.UPDATE_ACTIONS and self.bulk_targets:
+            self._trigger_bulk(payload)
+        elif action in self.UPDATE_ACTIONS:
             result = self.api_client.update_virtual_service(self.vs_uuid, payload)
             if result:
                 logger.info(f"  ✓ Virtual service updated successfully")
-                logger.info(f"  📥 Response: {result}")
+                logger.debug("  📥 Response: %s", result)
             else:
                 raise Exception("Failed to update virtual service")
         
-        # Mock operations
-        logger.info(f"\n{Fore.MAGENTA}[Mock Operations]")
+        self._run_operations()
+    
+    def _run_operations(self):
+        executor = self.operations or OperationExecutor()
+        logger.info(f"\n{Fore.MAGENTA}[{'Mock ' if executor.backend.name == 'mock' else ''}Operations]")
         mock_ops = self.config.get('mock_operations', [])
-        for op in mock_ops:
-            if op.get('type') == 'ssh':
-                logger.info(f"  🔐 MOCK_SSH: {op.get('operation')} - {op}")
-            elif op.get('type') == 'rdp':
-                logger.info(f"  🖥️  MOCK_RDP: {op.get('operation')} - {op}")
+        if not mock_ops:
+            return
+        
+        results = executor.run(mock_ops)
+        self.metrics['operations'] = [result.to_dict() for result in results]
+        failed = [result for result in results if not result.ok and not result.skipped]
+        for result in results:
+            if not result.ok:
+                if result.skipped:
+                    logger.warning(f"  - {result.type}/{result.operation} on {result.host}: {result.error}")
+                else:
+                    logger.error(f"  ✗ {result.type}/{result.operation} on {result.host}: {result.error}")
+        if failed:
+            skipped = sum(1 for result in results if result.skipped)
+            raise Exception(f"{len(failed)}/{len(results)} operations failed"
+                            + (f", {skipped} skipped" if skipped else ""))
+        logger.info(f"  ✓ {len(results)} operation(s) on {len({result.host for result in results})} host(s)")
+    
+    def _trigger_bulk(self, payload: Dict):
+        bulk_config = self.config['stages']['trigger'].get('bulk', {})
+        executor = BulkExecutor(
+            self.api_client,
+            concurrency=bulk_config.get('concurrency', 10),
+            rollback=bulk_config.get('rollback', True)
+        )
+        
+        result = executor.apply(self.bulk_targets, payload)
+        self.metrics['bulk'] = result.to_dict()
+        
+        if not result.ok:
+            message = f"Bulk update failed for {len(result.failed)}/{len(self.bulk_targets)} virtual services"
+            if result.rolled_back or result.rollback_failed:
+                message += (f" (rolled back {len(result.rolled_back)}, "
+                            f"rollback failed for {len(result.rollback_failed)})")
+            raise Exception(message)
+        logger.info(f"  ✓ Updated {len(result.succeeded)} virtual services")
     
     def _post_validation(self):
         logger.info(f"\n{Fore.BLUE}[Post-Validation Stage]")
         
-        if not self.vs_uuid:
+        if not self.vs_uuid and not self.bulk_targets:
             return
         
-        virtual_service = self.api_client.get_virtual_service_by_name(
-            self.config.get('target_virtual_service')
-        )
+        post_config = self.config['stages']['post_validation']
+        rules = self._stage_rules('post_validation')
+        
+        # State changes propagate asynchronously on a real controller, so poll
+        # the single object until it reflects the trigger instead of reading once.
+        convergence = {**self.settings.get('convergence', {}), **post_config.get('convergence', {})}
+        waiter = ConvergenceWaiter.from_config(self.api_client, convergence)
+        
+        if self.bulk_targets:
+            outcomes = waiter.wait_many([vs['uuid'] for vs in self.bulk_targets], rules.test)
+            pending = [o.uuid for o in outcomes.values() if not o.converged]
+            slowest = max(o.elapsed for o in outcomes.values())
+            self.metrics['convergence'] = {
+                'converged': len(outcomes) - len(pending),
+                'pending': len(pending),
+                'time_to_converge': slowest
+            }
+            if pending:
+                logger.warning(f"  ⚠ Post-validation warning: {len(pending)}/{len(outcomes)} virtual services "
+                               f"did not satisfy {rules} within {slowest:.2f}s")
+                violations = rules.evaluate(outcomes[uuid].last for uuid in pending if outcomes[uuid].last)
+                self.metrics['violations'] = [v.to_dict() for v in violations]
+                log_violations(violations, logging.WARNING)
+            else:
+                logger.info(f"  ✓ Post-validation passed: {rules} on all {len(outcomes)} "
+                            f"(converged in {slowest:.2f}s)")
+            return
         
+        outcome = waiter.wait(self.vs_uuid, rules.test)
+        self.metrics['convergence'] = outcome.to_dict()
+        
+        virtual_service = outcome.last
         if virtual_service:
-            field = self.config['stages']['post_validation'].get('validate')
-            expected_value = self.config['stages']['post_validation'].get('expected_value')
-            
-            actual_value = virtual_service.get(field)
-            if actual_value == expected_value:
-                logger.info(f"  ✓ Post-validation passed: {field} = {actual_value}")
+            if outcome.converged:
+                logger.info(f"  ✓ Post-validation passed: {rules} "
+                            f"(converged in {outcome.elapsed:.2f}s, {outcome.polls} poll(s))")
             else:
-                logger.warning(f"  ⚠ Post-validation warning: {field} = {actual_value} (expected {expected_value})")
+                violations = rules.check(virtual_service)
+                self.metrics['violations'] = [v.to_dict() for v in violations]
+                logger.warning(f"  ⚠ Post-validation warning: {'; '.join(str(v) for v in violations)} "
+                               f"(not converged after {outcome.elapsed:.2f}s)")
+        else:
+            logger.warning(f"  ⚠ Post-validation warning: could not read virtual service {self.vs_uuid}")
 
 
 class TestRunner:
-    def __init__(self, api_client, config: Dict, test_cases_config: Dict, parallel: bool = False):
+    ENGINES = ('sequential', 'threaded')
+    
+    def __init__(self, api_client, config: Dict, test_cases_config: Dict, parallel: bool = False,
+                 engine: Optional[str] = None, fail_fast: Optional[bool] = None):
         self.api_client = api_client
         self.config = config
         self.test_cases_config = test_cases_config
         self.parallel = parallel
+        self.engine = engine or ('threaded' if parallel else 'sequential')
+        if self.engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{self.engine}' (expected one of {', '.join(self.ENGINES)})")
+        self.max_workers = max(1, int(config.get('framework', {}).get('max_workers', 3)))
+        self.shared_prefetch = config.get('framework', {}).get('shared_prefetch', True)
+        self.prefetch_concurrently = config.get('framework', {}).get('prefetch_concurrently', True)
+        self.snapshot: Optional[PrefetchSnapshot] = None
+        self.operations = OperationExecutor.from_config(config.get('framework'))
+        # Hold each case's log records until it finishes when cases overlap
+        self.buffer_logs = config.get('framework', {}).get('logging', {}).get('buffer_test_cases', True)
+        self.graph: Optional[TestGraph] = None
+        if fail_fast is None:
+            fail_fast = (config.get('test_settings') or {}).get('fail_fast', False)
+        self.fail_fast = fail_fast
+        self.cancel_token: Optional[CancelToken] = None
+        self._on_result: Optional[Callable[[Dict], None]] = None
     
-    def run_all(self, test_cases: List[Dict]) -> List[Dict]:
-        if self.parallel and len(test_cases) > 1:
-            return self._run_parallel(test_cases)
-        else:
+    def run_all(self, test_cases: List[Dict], on_result: Optional[Callable[[Dict], None]] = None,
+                cancel_token: Optional[CancelToken] = None) -> List[Dict]:
+        # Built first so a bad depends_on fails before anything is fetched
+        self.graph = TestGraph.build(test_cases, TestCase.UPDATE_ACTIONS)
+        # Cancelling the token (or a failure under fail-fast) aborts running
+        # cases and skips the rest; on_result sees each result as it lands
+        self.cancel_token = cancel_token or CancelToken()
+        self._on_result = on_result
+        self.api_client.bind_cancel_token(self.cancel_token)
+        
+        try:
+            self.prepare(test_cases)
+            if self.engine == 'threaded' and len(test_cases) > 1:
+                return self._run_parallel(test_cases)
             return self._run_sequential(test_cases)
+        finally:
+            self.api_client.bind_cancel_token(None)
+            self.close()
     
-    def _run_sequential(self, test_cases: List[Dict]) -> List[Dict]:
-        results = []
-        
-        for test_case_config in test_cases:
-            test_case = TestCase(
-                name=test_case_config['name'],
-                config=test_case_config,
-                api_client=self.api_client
-            )
-            
-            result = test_case.execute()
-            results.append(result)
-            time.sleep(1)
+    def cancel(self, reason: str = 'cancelled'):
+        if self.cancel_token is not None:
+            self.cancel_token.cancel(reason)
+    
+    @property
+    def cancel_reason(self) -> Optional[str]:
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            return self.cancel_token.reason
+        return None
+    
+    def critical_path(self, results: List[Dict]) -> Tuple[float, List[str]]:
+        if self.graph is None or len(self.graph.names) != len(results):
+            return 0.0, []
+        return self.graph.critical_path([r.get('duration', 0.0) for r in results])
+    
+    def close(self):
+        # Drops pooled SSH sessions; they are reopened if the runner is reused
+        self.operations.close()
+    
+    def prepare(self, test_cases: List[Dict]):
+        # Widen a projected VS fetch to whatever the rules read, so evaluating
+        # them over the inventory never falls back to per-object loads
+        self.api_client.extend_projection('virtual_services', required_fields(test_cases))
+        self.snapshot = self._prefetch(test_cases)
+    
+    def run_one(self, test_case_config: Dict) -> Dict:
+        with case_log_buffer(self.buffer_logs):
+            return self._build_test_case(test_case_config).execute()
+    
+    def _prefetch(self, test_cases: List[Dict]) -> Optional[PrefetchSnapshot]:
+        from .api_client import CollectionFetchError
         
-        return results
+        if not self.shared_prefetch:
+            return None
+        components = required_components(test_cases)
+        if not components:
+            return None
+        try:
+            return build_snapshot(self.api_client, components, concurrent=self.prefetch_concurrently)
+        except CollectionFetchError as e:
+            # Cases fetch for themselves (or reuse the last snapshot) rather than share a partial one
+            logger.warning(f"{Fore.YELLOW}Shared pre-fetch failed, keeping previous snapshot: {str(e)}")
+            return self.snapshot
+    
+    def _build_test_case(self, test_case_config: Dict) -> TestCase:
+        return TestCase(
+            name=test_case_config['name'],
+            config=test_case_config,
+            api_client=self.api_client,
+            snapshot=self.snapshot,
+            settings=self.config.get('test_settings'),
+            operations=self.operations
+        )
+    
+    def _skip(self, test_case_config: Dict, reason: str) -> Dict:
+        logger.warning(f"{Fore.YELLOW}Skipping {test_case_config['name']}: {reason}")
+        return {
+            'test_case_name': test_case_config['name'],
+            'status': 'SKIP',
+            'error': reason,
+            'duration': 0.0,
+            'timestamp': datetime.now().isoformat(),
+            'stages': {},
+            'metrics': {}
+        }
+    
+    def _log_schedule(self):
+        if self.graph.edges:
+            logger.info(f"{Fore.BLUE}Schedule: {self.graph.edges} ordering constraint(s), "
+                        f"{self.graph.levels()} level(s)")
+    
+    def _completed(self, node: int, result: Dict):
+        if self._on_result is not None:
+            self._on_result(result)
+        if self.fail_fast and result.get('status') == 'FAIL' and not self.cancel_token.cancelled:
+            logger.error(f"{Fore.RED}Fail-fast: {result['test_case_name']} failed, cancelling remaining test cases")
+            self.cancel_token.cancel(f"fail-fast after {result['test_case_name']} failed")
+    
+    def _run_sequential(self, test_cases: List[Dict]) -> List[Dict]:
+        # Declaration order, except where depends_on points at a later case
+        return self.graph.run_sequential(
+            lambda node: self._build_test_case(test_cases[node]).execute(),
+            lambda node, reason: self._skip(test_cases[node], reason),
+            cancel_token=self.cancel_token,
+            on_result=self._completed
+        )
     
     def _run_parallel(self, test_cases: List[Dict]) -> List[Dict]:
-        results = []
-        threads = []
-        
-        def run_test_case(test_case_config, result_list):
-            test_case = TestCase(
-                name=test_case_config['name'],
-                config=test_case_config,
-                api_client=self.api_client
-            )
-            result = test_case.execute()
-            result_list.append(result)
-        
-        logger.info(f"\n{Fore.YELLOW}Running {len(test_cases)} test cases in parallel...")
-        
-        for test_case_config in test_cases:
-            thread = threading.Thread(
-                target=run_test_case,
-                args=(test_case_config, results)
-            )
-            threads.append(thread)
-            thread.start()
-        
-        for thread in threads:
-            thread.join()
+        logger.info(f"\n{Fore.YELLOW}Running {len(test_cases)} test cases in parallel "
+                    f"({self.max_workers} workers)...")
+        self._log_schedule()
+        
+        # Cases start as soon as everything they depend or conflict on has finished
+        results = self.graph.run_threaded(
+            lambda node: self.run_one(test_cases[node]),
+            lambda node, reason: self._skip(test_cases[node], reason),
+            self.max_workers,
+            cancel_token=self.cancel_token,
+            on_result=self._completed
+        )
         
         logger.info(f"{Fore.GREEN}All parallel test cases completed")
         return results
\ No newline at end of file
@@ -0,0 +1,157 @@
+import logging
+import socket
+import threading
+import weakref
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cancellation import CancelToken
+
+logger = logging.getLogger(__name__)
+
+# 429/503 are left to APIClient so the shared rate limiter sees them
+RETRY_STATUSES = (500, 502, 504)
+RETRY_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+
+class TransportRetry(Retry):
+    # urllib3 retries 413/429/503 by itself whenever they carry Retry-After,
+    # whatever status_forcelist says. Leave them to APIClient instead.
+    RETRY_AFTER_STATUS_CODES = frozenset()
+
+def build_retry(max_retries: int = 3, backoff_factor: float = 0.5, backoff_jitter: float = 0.25) -> Retry:
+    options = dict(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False,
+        respect_retry_after_header=True
+    )
+    try:
+        return TransportRetry(backoff_jitter=backoff_jitter, **options)
+    except TypeError:
+        # urllib3 < 2.0 has no jitter support
+        return TransportRetry(**options)
+
+class AbortableHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose in-flight requests can be aborted from another thread.
+
+    Every connection it opens is tracked. Once the bound ``CancelToken`` is
+    cancelled their sockets are shut down, so blocked sends and reads fail
+    at once instead of running into the read timeout, and any reconnect
+    (including urllib3's own retries) raises ``Cancelled``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.cancel_token: Optional[CancelToken] = None
+        self._connections = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: self._tracking_pool(pool_cls)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def _tracking_pool(self, pool_cls):
+        adapter = self
+
+        class TrackingConnection(pool_cls.ConnectionCls):
+            def connect(self):
+                if adapter.cancel_token is not None:
+                    adapter.cancel_token.raise_if_cancelled()
+                super().connect()
+                with adapter._connections_lock:
+                    adapter._connections.add(self)
+
+        return type(pool_cls.__name__, (pool_cls,), {'ConnectionCls': TrackingConnection})
+
+    def bind(self, token: Optional[CancelToken]):
+        self.cancel_token = token
+        if token is not None:
+            token.on_cancel(self.abort)
+
+    def abort(self) -> int:
+        with self._connections_lock:
+            connections = list(self._connections)
+        aborted = 0
+        for connection in connections:
+            sock = getattr(connection, 'sock', None)
+            if sock is None:
+                continue
+            try:
+                # Idle pooled connections go too; urllib3 reopens dropped ones on reuse
+                sock.shutdown(socket.SHUT_RDWR)
+                aborted += 1
+            except OSError:
+                pass
+        logger.debug(f"Aborted {aborted} HTTP connection(s)")
+        return aborted
+
+def bind_cancel_token(session: requests.Session, token: Optional[CancelToken]):
+    """Abort the session's requests when ``token`` is cancelled; None unbinds."""
+    for adapter in set(session.adapters.values()):
+        # The HTTP cache wraps the pooled adapter rather than replacing it
+        adapter = getattr(adapter, 'inner', adapter)
+        if isinstance(adapter, AbortableHTTPAdapter):
+            adapter.bind(token)
+
+def build_session(pool_size: int = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                  backoff_jitter: float = 0.25, gzip: bool = True) -> requests.Session:
+    session = requests.Session()
+    adapter = AbortableHTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=build_retry(max_retries, backoff_factor, backoff_jitter)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
+    session.headers.update({
+        'Connection': 'keep-alive',
+        'Accept-Encoding': 'gzip, deflate' if gzip else 'identity'
+    })
+    return session
+
+def session_from_config(api_config: Dict, concurrency: int = 1) -> requests.Session:
+    transport = api_config.get('transport', {})
+    # Every worker may hold a connection plus one for page prefetching
+    pool_size = max(int(transport.get('pool_size', 10)), concurrency + 1)
+    logger.debug(f"HTTP connection pool size: {pool_size}")
+    return build_session(
+        pool_size=pool_size,
+        max_retries=int(api_config.get('max_retries', 3)),
+        backoff_factor=float(transport.get('backoff_factor', 0.5)),
+        backoff_jitter=float(transport.get('backoff_jitter', 0.25)),
+        gzip=transport.get('gzip', True)
+    )
+
+class Timeouts:
+    def __init__(self, default: float = DEFAULT_READ_TIMEOUT, connect: float = DEFAULT_CONNECT_TIMEOUT,
+                 per_endpoint: Optional[Dict[str, float]] = None):
+        self.default = default
+        self.connect = connect
+        self.per_endpoint = dict(per_endpoint or {})
+
+    @classmethod
+    def from_config(cls, api_config: Dict) -> 'Timeouts':
+        return cls(
+            default=api_config.get('timeout', DEFAULT_READ_TIMEOUT),
+            connect=api_config.get('connect_timeout', DEFAULT_CONNECT_TIMEOUT),
+            per_endpoint=api_config.get('timeouts')
+        )
+
+    def for_endpoint(self, endpoint: Optional[str] = None) -> Tuple[float, float]:
+        read = self.per_endpoint.get(endpoint, self.default) if endpoint else self.default
+        return (min(self.connect, read), read)
\ No newline at end of file
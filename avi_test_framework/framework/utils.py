@@ -1,30 +1,214 @@
 import yaml
+import atexit
+import contextvars
+import copy
+import hashlib
+import json
 import logging
+import logging.handlers
+import math
+import os
+import queue
 import sys
+import tempfile
+from contextlib import contextmanager, suppress
+from typing import Dict, List, Optional, Sequence
 from colorama import init, Fore
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 init(autoreset=True)
 
-def load_config(config_file: str):
+CONFIG_CACHE_VERSION = 2
+
+def config_cache_dir() -> Optional[str]:
+    """Where parsed configs are cached; AVI_CONFIG_CACHE=off disables it."""
+    setting = os.environ.get('AVI_CONFIG_CACHE', '')
+    if setting.lower() in ('0', 'off', 'false', 'no'):
+        return None
+    return setting or os.path.join(os.path.expanduser('~'), '.cache', 'avi_test_framework', 'config')
+
+def load_config(config_file: str, required_keys: Sequence[str] = (), cache: bool = True):
     try:
-        with open(config_file, 'r') as f:
-            return yaml.safe_load(f)
+        config = _read_config(config_file, config_cache_dir() if cache else None)
     except FileNotFoundError:
         print(f"{Fore.RED}Error: {config_file} not found")
         sys.exit(1)
     except yaml.YAMLError as e:
         print(f"{Fore.RED}Error parsing {config_file}: {e}")
         sys.exit(1)
+    
+    missing = [key for key in required_keys if not isinstance(config, dict) or key not in config]
+    if missing:
+        print(f"{Fore.RED}Error: {config_file} is missing {', '.join(missing)}")
+        sys.exit(1)
+    return config
+
+def _read_config(config_file: str, cache_dir: Optional[str]):
+    if cache_dir is None:
+        with open(config_file, 'rb') as f:
+            return yaml.load(f, Loader=_YamlLoader)
+    
+    path = os.path.abspath(config_file)
+    stat = os.stat(path)
+    cache_path = os.path.join(cache_dir, hashlib.sha1(path.encode()).hexdigest() + '.json')
+    entry = _read_cache_entry(cache_path)
+    if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry['config']
+    
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    # A checkout or touch changes the mtime but not the content: keep the parse
+    config = entry['config'] if entry and entry['sha256'] == digest else yaml.load(raw, Loader=_YamlLoader)
+    _write_cache_entry(cache_path, {
+        'version': CONFIG_CACHE_VERSION,
+        'path': path,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': digest,
+        'config': config
+    })
+    return config
+
+def _read_cache_entry(cache_path: str) -> Optional[Dict]:
+    try:
+        with open(cache_path, 'r') as f:
+            entry = json.load(f)
+    except Exception:
+        # Missing, truncated or written by another version: parse the YAML instead
+        return None
+    if not isinstance(entry, dict) or entry.get('version') != CONFIG_CACHE_VERSION:
+        return None
+    if not {'mtime_ns', 'size', 'sha256', 'config'} <= entry.keys():
+        return None
+    return entry
+
+def _write_cache_entry(cache_path: str, entry: Dict):
+    try:
+        text = json.dumps(entry)
+    except (TypeError, ValueError):
+        return
+    if json.loads(text) != entry:
+        # YAML with non-string keys would come back different; keep parsing it
+        return
+    try:
+        # Configs may hold credentials
+        os.makedirs(os.path.dirname(cache_path), mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        # Concurrent CI jobs may race here; replace() keeps the file whole
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_case_buffer: contextvars.ContextVar[Optional[List[logging.LogRecord]]] = \
+    contextvars.ContextVar('avi_case_log_buffer', default=None)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+class LogBatch(list):
+    """Records from one test case, written out back to back by the listener."""
+
+class BufferingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the background listener, or holds them in the current
+    test case's buffer while one is active."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the args now: they may change before the listener (or the end
+        # of a buffered case) gets to the record. Records below the logger's
+        # level never get this far, so they still cost no formatting.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            buffer = _case_buffer.get()
+            prepared = self.prepare(record)
+            if buffer is not None:
+                buffer.append(prepared)
+            else:
+                self.enqueue(prepared)
+        except Exception:
+            self.handleError(record)
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    def handle(self, record):
+        if isinstance(record, LogBatch):
+            for buffered in record:
+                super().handle(buffered)
+        else:
+            super().handle(record)
+
+@contextmanager
+def case_log_buffer(enabled: bool = True):
+    """Collect log records emitted in this context and flush them as one block,
+    so output from test cases running in parallel does not interleave."""
+    if not enabled or _listener is None or _case_buffer.get() is not None:
+        yield
+        return
+    
+    buffer = LogBatch()
+    token = _case_buffer.set(buffer)
+    try:
+        yield
+    finally:
+        _case_buffer.reset(token)
+        if buffer:
+            _listener.queue.put_nowait(buffer)
+
+def setup_logging(level=logging.INFO, log_file: str = 'logs/test_execution.log',
+                  max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5, rotate: bool = True):
+    global _listener
+    
+    os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+    
+    if rotate and max_bytes:
+        file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+    else:
+        file_handler = logging.FileHandler(log_file)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    
+    # Callers only merge the message and enqueue; formatting and I/O happen on
+    # the listener thread, so parallel test cases never contend on the
+    # file/stream handler locks.
+    stop_logging()
+    log_queue = queue.SimpleQueue()
+    _listener = BatchQueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    _listener.start()
+    
+    logging.basicConfig(level=level, handlers=[BufferingQueueHandler(log_queue)], force=True)
+    # Registered once however often logging is set up
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+    return _listener
+
+def stop_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in (*_listener.handlers, *logging.getLogger().handlers):
+            handler.close()
+        _listener = None
 
-def setup_logging(level=logging.INFO):
-    import os
-    os.makedirs('logs', exist_ok=True)
-    
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('logs/test_execution.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
\ No newline at end of file
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
\ No newline at end of file
@@ -1,8 +1,286 @@
 import logging
+import re
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
+_SEGMENT = re.compile(r'([^.\[\]]*)((?:\[(?:\d+|-\d+|\*)\])*)')
+_INDEX = re.compile(r'\[(-?\d+|\*)\]')
+# dict first so plain JSON objects skip the ABC check; Mapping admits projected records
+_MAPPINGS = (dict, Mapping)
+
+OPERATORS = ('equals', 'not_equals', 'one_of', 'min', 'max', 'range', 'matches', 'contains', 'exists')
+COMBINATORS = ('all', 'any', 'not')
+
 def validate_response(response: dict, expected_keys: list) -> bool:
     if not response:
         return False
-    return all(key in response for key in expected_keys)
\ No newline at end of file
+    return all(key in response for key in expected_keys)
+
+def compile_path(path: str) -> Callable[[Any], List[Any]]:
+    """Turn ``pool.members[*].state`` into a resolver returning every value at
+    that path (empty when it does not exist). ``[n]`` indexes a list and
+    ``[*]`` fans out over all of its items."""
+    if not isinstance(path, str) or not path:
+        raise ValueError(f"Invalid rule path {path!r}")
+
+    steps = []
+    for segment in path.split('.'):
+        match = _SEGMENT.fullmatch(segment)
+        if not match or (not match.group(1) and not match.group(2)):
+            raise ValueError(f"Invalid segment '{segment}' in rule path '{path}'")
+        if match.group(1):
+            steps.append(match.group(1))
+        for index in _INDEX.findall(match.group(2)):
+            steps.append(None if index == '*' else int(index))
+
+    if len(steps) == 1 and isinstance(steps[0], str):
+        key = steps[0]
+        return lambda obj: [obj[key]] if isinstance(obj, _MAPPINGS) and key in obj else []
+
+    def resolve(obj):
+        values = [obj]
+        for step in steps:
+            found = []
+            for value in values:
+                if step is None:
+                    if isinstance(value, list):
+                        found.extend(value)
+                elif isinstance(step, int):
+                    if isinstance(value, list) and -len(value) <= step < len(value):
+                        found.append(value[step])
+                elif isinstance(value, _MAPPINGS) and step in value:
+                    found.append(value[step])
+            if not found:
+                return found
+            values = found
+        return values
+    return resolve
+
+def _root_field(path: str) -> str:
+    return path.split('.', 1)[0].split('[', 1)[0]
+
+class Rule:
+    __slots__ = ('description', 'test', 'resolve', 'fields')
+
+    def __init__(self, description: str, test: Callable[[Any], bool],
+                 resolve: Optional[Callable[[Any], List[Any]]] = None, fields: Iterable[str] = ()):
+        self.description = description
+        self.test = test
+        self.resolve = resolve
+        # Top-level keys the rule reads, so fetches can project on them
+        self.fields = frozenset(fields)
+
+    def actual(self, obj):
+        if self.resolve is None:
+            return None
+        values = self.resolve(obj)
+        if not values:
+            return '<missing>'
+        return values[0] if len(values) == 1 else values
+
+    def __repr__(self):
+        return f"Rule({self.description})"
+
+class Violation:
+    __slots__ = ('rule', 'actual', 'name', 'uuid')
+
+    def __init__(self, rule: str, actual: Any = None, name: Optional[str] = None, uuid: Optional[str] = None):
+        self.rule = rule
+        self.actual = actual
+        self.name = name
+        self.uuid = uuid
+
+    def to_dict(self) -> Dict:
+        return {'rule': self.rule, 'actual': self.actual, 'name': self.name, 'uuid': self.uuid}
+
+    def __str__(self):
+        return f"{self.rule} (actual {self.actual})"
+
+class RuleSet:
+    """Compiled validation rules; every rule must hold for an object to pass.
+
+    ``test`` short-circuits on the first failing rule and is meant for polling,
+    while ``check`` and ``evaluate`` report every violation.
+    """
+
+    def __init__(self, rules: Iterable[Rule] = ()):
+        self.rules = tuple(rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @property
+    def fields(self) -> Set[str]:
+        return set().union(*(rule.fields for rule in self.rules))
+
+    def __str__(self):
+        return ', '.join(rule.description for rule in self.rules) or 'no rules'
+
+    def test(self, obj) -> bool:
+        for rule in self.rules:
+            if not rule.test(obj):
+                return False
+        return True
+
+    def check(self, obj) -> List[Violation]:
+        name = obj.get('name') if isinstance(obj, _MAPPINGS) else None
+        uuid = obj.get('uuid') if isinstance(obj, _MAPPINGS) else None
+        return [
+            Violation(rule.description, rule.actual(obj), name, uuid)
+            for rule in self.rules if not rule.test(obj)
+        ]
+
+    def evaluate(self, objects: Iterable[Dict]) -> List[Violation]:
+        violations = []
+        rules = self.rules
+        for obj in objects:
+            for rule in rules:
+                if not rule.test(obj):
+                    violations.append(Violation(rule.description, rule.actual(obj), obj.get('name'), obj.get('uuid')))
+        return violations
+
+def compile_rule(spec: Dict) -> Rule:
+    if not isinstance(spec, dict):
+        raise ValueError(f"Rule must be a mapping, got {spec!r}")
+
+    combinators = [key for key in COMBINATORS if key in spec]
+    if combinators:
+        if len(combinators) > 1 or 'path' in spec:
+            raise ValueError(f"Rule {spec!r} mixes '{combinators[0]}' with other conditions")
+        return _compile_combinator(combinators[0], spec)
+
+    path = spec.get('path')
+    unknown = set(spec) - set(OPERATORS) - {'path', 'name', 'quantifier', 'optional'}
+    if unknown:
+        raise ValueError(f"Unknown rule keys {sorted(unknown)} in rule for '{path}'")
+    resolve = compile_path(path)
+
+    if 'exists' in spec:
+        if len(set(spec) & set(OPERATORS)) > 1:
+            raise ValueError(f"Rule for '{path}' combines 'exists' with value operators")
+        expected = bool(spec['exists'])
+        test = lambda obj: bool(resolve(obj)) is expected
+        description = spec.get('name') or f"{path} {'exists' if expected else 'is absent'}"
+        return Rule(description, test, resolve, (_root_field(path),))
+
+    checks = []
+    terms = []
+    for operator in OPERATORS:
+        if operator in spec:
+            check, term = _compile_operator(operator, spec[operator], path)
+            checks.append(check)
+            terms.append(term)
+    if not checks:
+        raise ValueError(f"Rule for '{path}' has no condition (expected one of {', '.join(OPERATORS)})")
+
+    check = checks[0] if len(checks) == 1 else (lambda value: all(c(value) for c in checks))
+    quantifier = spec.get('quantifier', 'all')
+    if quantifier not in ('all', 'any'):
+        raise ValueError(f"Unknown quantifier '{quantifier}' in rule for '{path}'")
+    reduce = all if quantifier == 'all' else any
+    optional = bool(spec.get('optional', False))
+
+    def test(obj):
+        values = resolve(obj)
+        if not values:
+            return optional
+        return reduce(map(check, values))
+
+    prefix = 'any ' if quantifier == 'any' and '[*]' in path else ''
+    description = spec.get('name') or f"{prefix}{path} {' and '.join(terms)}"
+    return Rule(description, test, resolve, (_root_field(path),))
+
+def compile_rules(specs: Optional[Iterable[Dict]]) -> RuleSet:
+    return RuleSet(compile_rule(spec) for spec in (specs or []))
+
+def rules_from_stage(stage_config: Optional[Dict]) -> RuleSet:
+    """Rules for a validation stage: ``validate``/``expected_value`` is kept as
+    shorthand for an equality rule and runs ahead of any ``rules`` list."""
+    stage_config = stage_config or {}
+    specs = []
+    if stage_config.get('validate'):
+        specs.append({'path': stage_config['validate'], 'equals': stage_config.get('expected_value')})
+    specs.extend(stage_config.get('rules') or [])
+    return compile_rules(specs)
+
+def summarize_violations(violations: List[Violation], sample_size: int = 5) -> Dict[str, Dict]:
+    summary: Dict[str, Dict] = {}
+    for violation in violations:
+        entry = summary.setdefault(violation.rule, {'count': 0, 'sample': []})
+        entry['count'] += 1
+        if len(entry['sample']) < sample_size:
+            entry['sample'].append(violation.name or violation.uuid)
+    return summary
+
+def log_violations(violations: List[Violation], level: int = logging.ERROR):
+    for rule, entry in summarize_violations(violations).items():
+        logger.log(level, "  ✗ %s: %s violation(s) (e.g. %s)", rule, entry['count'], entry['sample'])
+
+def _compile_combinator(kind: str, spec: Dict) -> Rule:
+    if kind == 'not':
+        inner = compile_rule(spec['not'])
+        inner_test = inner.test
+        return Rule(spec.get('name') or f"not ({inner.description})", lambda obj: not inner_test(obj),
+                    fields=inner.fields)
+
+    children = spec[kind]
+    if not isinstance(children, list) or not children:
+        raise ValueError(f"'{kind}' expects a non-empty list of rules")
+    rules = [compile_rule(child) for child in children]
+    tests = tuple(rule.test for rule in rules)
+    joiner = ' and ' if kind == 'all' else ' or '
+    description = spec.get('name') or f"({joiner.join(rule.description for rule in rules)})"
+    fields = set().union(*(rule.fields for rule in rules))
+    if kind == 'all':
+        return Rule(description, lambda obj: all(test(obj) for test in tests), fields=fields)
+    return Rule(description, lambda obj: any(test(obj) for test in tests), fields=fields)
+
+def _compile_operator(operator: str, argument, path: str):
+    if operator == 'equals':
+        return (lambda value: value == argument), f"= {argument}"
+    if operator == 'not_equals':
+        return (lambda value: value != argument), f"!= {argument}"
+    if operator == 'one_of':
+        if not isinstance(argument, list):
+            raise ValueError(f"'one_of' for '{path}' expects a list")
+        try:
+            choices = frozenset(argument)
+        except TypeError:
+            choices = tuple(argument)
+
+        def one_of(value):
+            try:
+                return value in choices
+            except TypeError:
+                return False
+        return one_of, f"in {argument}"
+    if operator in ('min', 'max', 'range'):
+        if operator == 'range':
+            if not isinstance(argument, list) or len(argument) != 2:
+                raise ValueError(f"'range' for '{path}' expects [low, high]")
+            low, high = argument
+        else:
+            low, high = (argument, None) if operator == 'min' else (None, argument)
+
+        def in_range(value):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return False
+            return (low is None or value >= low) and (high is None or value <= high)
+        term = {'min': f">= {low}", 'max': f"<= {high}"}.get(operator, f"in [{low}, {high}]")
+        return in_range, term
+    if operator == 'matches':
+        try:
+            pattern = re.compile(argument)
+        except (re.error, TypeError) as e:
+            raise ValueError(f"Invalid regex for '{path}': {e}")
+        return (lambda value: isinstance(value, str) and pattern.search(value) is not None), f"matches /{argument}/"
+    if operator == 'contains':
+        def contains(value):
+            try:
+                return argument in value
+            except TypeError:
+                return False
+        return contains, f"contains {argument}"
+    raise ValueError(f"Unknown operator '{operator}' in rule for '{path}'")
\ No newline at end of file
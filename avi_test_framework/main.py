@@ -3,6 +3,7 @@
 Main entry point for AVI Test Automation Framework
 """
 
+import os
 import sys
 import logging
 import argparse
@@ -11,7 +12,11 @@ from colorama import init, Fore, Style
 
 init(autoreset=True)
 
-from framework.api_client import APIClient
+# requests, numpy and the multiprocessing machinery are imported where
+# they are used, so runs that never reach them start faster
+from framework.metrics import profiling
+from framework.reporting import REPORT_WRITERS, JsonlStream, write_json, write_report
+from framework.scheduler import select_test_cases
 from framework.test_runner import TestRunner
 from framework.utils import load_config, setup_logging
 
@@ -20,34 +25,216 @@ def print_banner():
     print(f"{Fore.YELLOW}    AVI LOAD BALANCER TEST AUTOMATION FRAMEWORK")
     print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}\n")
 
+def run_soak(args, test_runner, test_cases, logger):
+    from framework.soak import SoakRunner
+    
+    if not isinstance(test_runner, TestRunner):
+        raise ValueError("--soak cannot be combined with --shard")
+    
+    soak_runner = SoakRunner(
+        test_runner,
+        test_cases,
+        duration=args.duration,
+        rate=args.rate,
+        concurrency=args.concurrency or (None if args.rate else test_runner.max_workers),
+        interval=args.report_interval
+    )
+    report = soak_runner.run()
+    latency = report['latency']
+    
+    logger.info(f"\n{Fore.CYAN}{'='*60}")
+    logger.info(f"{Fore.YELLOW}SOAK SUMMARY")
+    logger.info(f"{Fore.CYAN}{'='*60}")
+    logger.info(f"{Fore.WHITE}Duration: {report['duration']:.1f} seconds")
+    logger.info(f"{Fore.WHITE}Completed: {report['completed']} ({report['throughput']:.2f} cases/s)")
+    logger.info(f"{Fore.RED if report['errors'] else Fore.WHITE}Errors: {report['errors']} ({report['error_rate']:.1%})")
+    if report['dropped']:
+        logger.info(f"{Fore.RED}Dropped (never started): {report['dropped']}")
+    if report['cancelled']:
+        logger.info(f"{Fore.YELLOW}Cancelled (aborted in flight): {report['cancelled']}")
+    logger.info(f"{Fore.WHITE}Latency: mean {latency['mean'] * 1000:.1f}ms, p50 <= {latency['p50'] * 1000:.0f}ms, "
+                f"p99 <= {latency['p99'] * 1000:.0f}ms, max {latency['max'] * 1000:.1f}ms")
+
+def run_scan(args, api_client, logger):
+    from framework.fleet import scan_fleet
+    
+    report = scan_fleet(api_client)
+    placement = report['placement']
+    orphans = report['orphans']
+    
+    logger.info(f"\n{Fore.CYAN}{'='*60}")
+    logger.info(f"{Fore.YELLOW}FLEET HEALTH SCAN")
+    logger.info(f"{Fore.CYAN}{'='*60}")
+    logger.info(f"{Fore.WHITE}Virtual Services: {report['virtual_services']} "
+                f"({report['enabled']} enabled, {report['oper_up']} oper up)")
+    logger.info(f"{Fore.WHITE}Service Engines: {report['service_engines']}")
+    for tenant, counts in sorted(report['tenants'].items()):
+        color = Fore.RED if counts['oper_down'] else Fore.WHITE
+        logger.info(f"{color}  {tenant}: {counts['total']} total, {counts['disabled']} disabled, "
+                    f"{counts['oper_down']} oper down")
+    logger.info(f"{Fore.WHITE}Placements: {placement['placements']} "
+                f"(SEs per VS: {placement['ses_per_vs']}, VS per SE: min {placement['vs_per_se']['min']}, "
+                f"mean {placement['vs_per_se']['mean']:.1f}, max {placement['vs_per_se']['max']})")
+    if placement['unplaced']:
+        logger.info(f"{Fore.RED}Unplaced: {placement['unplaced']} ({placement['unplaced_enabled']} enabled)")
+    orphan_count = orphans['se_vs_refs'] + orphans['vs_se_group_refs'] + orphans.get('vs_tenant_refs', 0)
+    logger.info(f"{Fore.RED if orphan_count else Fore.WHITE}Orphaned refs: {orphans['se_vs_refs']} SE->VS, "
+                f"{orphans['vs_se_group_refs']} VS->SE group, {orphans.get('vs_tenant_refs', 0)} VS->tenant")
+    logger.info(f"{Fore.WHITE}Timing: fetch {report['fetch_seconds']:.2f}s, build {report['build_seconds']:.3f}s, "
+                f"scan {report['scan_seconds']:.3f}s ({report['backend']})")
+    
+    run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+    write_json(report, os.path.join(args.report_dir, f"fleet_scan_{run_id}.json"))
+
+def run_compare(args, config, logger) -> int:
+    from framework.result_store import ResultStore
+    
+    store_path = args.store or (config.get('framework', {}).get('results') or {}).get('path', 'logs/results.db')
+    if not os.path.exists(store_path):
+        raise ValueError(f"No result store at {store_path}")
+    with ResultStore(store_path) as store:
+        report = store.compare(
+            run_id=args.run,
+            baseline=args.baseline,
+            current=args.current,
+            alpha=args.alpha,
+            min_slowdown=args.min_slowdown,
+            min_baseline=args.min_baseline
+        )
+    
+    logger.info(f"\n{Fore.CYAN}{'='*60}")
+    logger.info(f"{Fore.YELLOW}RUN COMPARISON")
+    logger.info(f"{Fore.CYAN}{'='*60}")
+    logger.info(f"{Fore.WHITE}Run: {report['run_id']} ({report['engine']}), "
+                f"{report['current_runs']} current vs {report['baseline_runs']} baseline run(s)")
+    logger.info(f"{Fore.WHITE}Metrics compared: {report['compared']} "
+                f"({report['insufficient_history']} with under {args.min_baseline} baseline samples)")
+    for regression in report['regressions']:
+        logger.info(f"{Fore.RED}  ✗ {regression['kind']} {regression['metric']}: "
+                    f"{regression['baseline'] * 1000:.1f}ms → {regression['current'] * 1000:.1f}ms "
+                    f"(x{regression['ratio']:.2f}, p={regression['p_value']:.2g})")
+    logger.info(f"{Fore.RED if report['regressions'] else Fore.GREEN}Significant slowdowns: {len(report['regressions'])}")
+    
+    if args.report:
+        write_json(report, os.path.join(args.report_dir, f"compare_{report['run_id']}.json"))
+    return 1 if report['regressions'] else 0
+
+def stream_results(total, stream, logger):
+    completed = 0
+    
+    def on_result(result):
+        nonlocal completed
+        completed += 1
+        status = result['status']
+        color = Fore.GREEN if status == 'PASS' else Fore.YELLOW if status == 'SKIP' else Fore.RED
+        detail = f" - {result['error']}" if status != 'PASS' and result.get('error') else ''
+        logger.info(f"{color}[{completed}/{total}] {result['test_case_name']}: {status} "
+                    f"({result.get('duration', 0.0):.2f}s){detail}")
+        if stream is not None:
+            stream.write(result)
+    
+    return on_result
+
+def record_results(config, run_summary, results, logger):
+    from framework.result_store import ResultStore
+    
+    store = ResultStore.from_config(config.get('framework'))
+    if store is None:
+        return
+    with store:
+        store.record_run(run_summary, results)
+    logger.info(f"{Fore.BLUE}Run recorded in {store.path}")
+
 def main():
     parser = argparse.ArgumentParser(description='AVI Test Automation Framework')
     parser.add_argument('--parallel', action='store_true', help='Execute test cases in parallel')
-    parser.add_argument('--test-case', type=str, help='Run specific test case by name')
+    parser.add_argument('--engine', choices=TestRunner.ENGINES,
+                        help='Execution engine (default: threaded with --parallel, otherwise sequential)')
+    parser.add_argument('--test-case', type=str,
+                        help='Run only these test cases (comma-separated) and whatever they depend on')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
+    parser.add_argument('--fail-fast', action='store_true', default=None,
+                        help='Stop at the first failing test case (default: test_settings.fail_fast)')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes for --shard')
+    parser.add_argument('--shard', action='store_true', help='Partition test cases across --workers processes')
+    parser.add_argument('--shard-index', type=int, default=0, help='Index of this CI node (0-based)')
+    parser.add_argument('--shard-count', type=int, default=1, help='Total number of CI nodes')
+    parser.add_argument('--report', action='append', choices=sorted(REPORT_WRITERS),
+                        help='Write machine-readable results next to the log (repeatable)')
+    parser.add_argument('--report-dir', default='logs', help='Directory for --report and profiler output')
+    parser.add_argument('--profile', action='store_true', help='Run under cProfile and dump stats to --report-dir')
+    parser.add_argument('--tracemalloc', action='store_true', help='Trace allocations and log the top sites')
+    parser.add_argument('--soak', action='store_true', help='Repeatedly run the suite to load-test the controller; '
+                             'cases must restore what they change (pair disable with enable)')
+    parser.add_argument('--duration', type=float, default=300, help='Soak duration in seconds')
+    parser.add_argument('--rate', type=float, help='Soak open-loop target rate (test cases/sec)')
+    parser.add_argument('--concurrency', type=int, help='Soak closed-loop concurrency (cases in flight)')
+    parser.add_argument('--report-interval', type=float, default=10, help='Seconds between soak progress reports')
+    parser.add_argument('--scan', action='store_true', help='Scan fleet health (tenants, VS, SE placement) and exit')
+    parser.add_argument('--no-config-cache', action='store_true',
+                        help='Always re-parse the YAML configs (also AVI_CONFIG_CACHE=off)')
+    
+    subparsers = parser.add_subparsers(dest='command')
+    compare_parser = subparsers.add_parser('compare', help='Flag significant slowdowns against earlier runs')
+    compare_parser.add_argument('--run', help='Run id to check (default: the latest recorded run)')
+    compare_parser.add_argument('--store', help='Result store path (default: framework.results.path)')
+    compare_parser.add_argument('--baseline', type=int, default=20, help='Baseline window in runs')
+    compare_parser.add_argument('--current', type=int, default=1, help='Current window in runs, ending at --run')
+    compare_parser.add_argument('--alpha', type=float, default=0.01, help='Significance level (one-sided)')
+    compare_parser.add_argument('--min-slowdown', type=float, default=0.1,
+                                help='Ignore slowdowns below this fraction (0.1 = 10%%)')
+    compare_parser.add_argument('--min-baseline', type=int, default=5,
+                                help='Skip metrics with fewer baseline samples')
     
     args = parser.parse_args()
+    # Either half on its own used to fall back to a single process without a word
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and not args.shard:
+        parser.error("--workers only applies together with --shard")
+    if args.shard and args.workers == 1:
+        parser.error("--shard needs --workers greater than 1")
     
     print_banner()
     
     try:
+        # Load configurations first; they carry the logging settings
+        cache = not args.no_config_cache
+        config = load_config('config.yaml', required_keys=('api', 'framework'), cache=cache)
+        
         log_level = logging.DEBUG if args.verbose else logging.INFO
-        setup_logging(log_level)
+        log_settings = config.get('framework', {}).get('logging', {})
+        setup_logging(
+            log_level,
+            log_file=log_settings.get('file', 'logs/test_execution.log'),
+            max_bytes=log_settings.get('max_bytes', 10 * 1024 * 1024),
+            backup_count=log_settings.get('backup_count', 5)
+        )
         logger = logging.getLogger(__name__)
         
-        logger.info(f"{Fore.GREEN}=== Starting Test Automation Framework ===")
+        # compare only reads the result store: no test cases, credentials or controller
+        if args.command == 'compare':
+            sys.exit(run_compare(args, config, logger))
         
-        # Load configurations
-        logger.info(f"{Fore.BLUE}Loading configuration files...")
-        config = load_config('config.yaml')
-        test_cases_config = load_config('test_cases.yaml')
-        credentials = load_config('credentials.yaml')
+        test_cases_config = load_config('test_cases.yaml', required_keys=('test_cases',), cache=cache)
+        # Never copy secrets into the cache directory
+        credentials = load_config('credentials.yaml', required_keys=('credentials',), cache=False)
+        
+        # Filter before anything is built so a typo fails without touching the controller
+        test_cases = test_cases_config['test_cases']
+        if args.test_case:
+            test_cases = select_test_cases(test_cases, [name.strip() for name in args.test_case.split(',')])
+        
+        logger.info(f"{Fore.GREEN}=== Starting Test Automation Framework ===")
+        logger.info(f"{Fore.BLUE}Loaded configuration files")
         
         # Initialize API client
         logger.info(f"{Fore.BLUE}Initializing API client...")
-        api_client = APIClient(
-            base_url=config['api']['base_url'],
-            credentials=credentials['credentials']
+        from framework.api_client import APIClient
+        api_client = APIClient.from_config(
+            config['api'],
+            credentials['credentials'],
+            concurrency=config['framework'].get('max_workers', 1)
         )
         
         # Authenticate
@@ -58,20 +245,52 @@ def main():
             logger.error(f"{Fore.RED}Authentication failed")
             sys.exit(1)
         
+        if args.scan:
+            run_scan(args, api_client, logger)
+            return
+        
         # Initialize test runner
-        test_runner = TestRunner(
-            api_client=api_client,
-            config=config,
-            test_cases_config=test_cases_config,
-            parallel=args.parallel
-        )
+        if args.shard:
+            from framework.sharding import ShardedRunner
+            # Workers pick up the token cached by the authentication above
+            test_runner = ShardedRunner(
+                config=config,
+                credentials=credentials['credentials'],
+                test_cases_config=test_cases_config,
+                workers=args.workers,
+                engine=args.engine,
+                fail_fast=args.fail_fast,
+                parallel=args.parallel,
+                metrics=api_client.metrics
+            )
+        else:
+            test_runner = TestRunner(
+                api_client=api_client,
+                config=config,
+                test_cases_config=test_cases_config,
+                parallel=args.parallel,
+                engine=args.engine,
+                fail_fast=args.fail_fast
+            )
         
         # Execute test cases
-        test_cases = test_cases_config['test_cases']
+        if args.shard_count > 1:
+            from framework.sharding import shard_test_cases
+            test_cases = shard_test_cases(test_cases, args.shard_index, args.shard_count)
+            logger.info(f"{Fore.BLUE}Shard {args.shard_index + 1}/{args.shard_count}")
         logger.info(f"{Fore.BLUE}Executing {len(test_cases)} test case(s)...")
         
+        if args.soak:
+            run_soak(args, test_runner, test_cases, logger)
+            return
+        
         start_time = datetime.now()
-        results = test_runner.run_all(test_cases)
+        run_id = start_time.strftime('%Y%m%d_%H%M%S')
+        # The JSONL report grows as cases finish instead of being written at the end
+        stream = JsonlStream(os.path.join(args.report_dir, f"results_{run_id}.jsonl")) \
+            if 'jsonl' in (args.report or ()) else None
+        with profiling(args.report_dir, run_id, cprofile=args.profile, trace_memory=args.tracemalloc):
+            results = test_runner.run_all(test_cases, on_result=stream_results(len(test_cases), stream, logger))
         end_time = datetime.now()
         
         # Print summary
@@ -81,12 +300,54 @@ def main():
         
         total = len(results)
         passed = sum(1 for r in results if r['status'] == 'PASS')
-        failed = total - passed
+        skipped = sum(1 for r in results if r['status'] == 'SKIP')
+        failed = total - passed - skipped
         
         logger.info(f"{Fore.WHITE}Total Test Cases: {total}")
         logger.info(f"{Fore.GREEN}Passed: {passed}")
         logger.info(f"{Fore.RED if failed > 0 else Fore.WHITE}Failed: {failed}")
+        if skipped:
+            logger.info(f"{Fore.YELLOW}Skipped: {skipped}")
         logger.info(f"{Fore.WHITE}Execution Time: {(end_time - start_time).total_seconds():.2f} seconds")
+        critical_seconds, critical_path = (
+            test_runner.critical_path(results) if hasattr(test_runner, 'critical_path') else (0.0, [])
+        )
+        if critical_path:
+            logger.info(f"{Fore.WHITE}Critical Path: {critical_seconds:.2f} seconds ({' → '.join(critical_path)})")
+        if test_runner.cancel_reason:
+            logger.info(f"{Fore.YELLOW}Cancelled: {test_runner.cancel_reason}")
+        logger.info(f"{Fore.WHITE}API Requests: {api_client.metrics.total_requests}")
+        if api_client.http_cache is not None:
+            cache_stats = api_client.http_cache.stats()
+            logger.info(f"{Fore.WHITE}HTTP Cache: {cache_stats['hits']} hit(s), "
+                        f"{cache_stats['revalidated']} revalidated, {cache_stats['misses']} miss(es) "
+                        f"({cache_stats['round_trips_saved']} round-trips saved)")
+        if api_client.coalesced_requests:
+            logger.info(f"{Fore.WHITE}Coalesced Requests: {api_client.coalesced_requests}")
+        
+        run_summary = {
+            'run_id': run_id,
+            'started_at': start_time.isoformat(),
+            'engine': test_runner.engine if isinstance(test_runner, TestRunner) else f"sharded/{test_runner.engine}",
+            'total': total,
+            'passed': passed,
+            'failed': failed,
+            'skipped': skipped,
+            'duration': (end_time - start_time).total_seconds(),
+            'critical_path_seconds': critical_seconds,
+            'critical_path': critical_path,
+            'cancelled': test_runner.cancel_reason,
+            'endpoints': api_client.metrics.snapshot(),
+            'http_cache': api_client.http_cache.stats() if api_client.http_cache is not None else None,
+            'coalesced_requests': api_client.coalesced_requests
+        }
+        if stream is not None:
+            logger.info(f"Results written to {stream.close(run_summary)}")
+        for report_format in args.report or ():
+            if report_format != 'jsonl':
+                write_report(report_format, results, args.report_dir, run_id, run_summary)
+        
+        record_results(config, {**run_summary, 'selection': args.test_case}, results, logger)
         
         logger.info(f"\n{Fore.GREEN}=== Framework Execution Completed ===")
         
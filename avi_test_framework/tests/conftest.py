@@ -0,0 +1,34 @@
+import pytest
+
+from framework.api_client import APIClient
+from framework.mock_controller import MockController
+from framework.transport import Timeouts, build_session
+
+@pytest.fixture
+def controller():
+    with MockController(virtual_services=100) as mock:
+        yield mock
+
+@pytest.fixture
+def make_client(controller):
+    """Authenticated APIClient factory; retries back off instantly so tests stay fast."""
+    clients = []
+
+    def make(max_retries=3, timeouts=None, **kwargs):
+        client = APIClient(
+            controller.url,
+            {'username': 'tester', 'password': 'secret'},
+            session=build_session(max_retries=max_retries, backoff_factor=0, backoff_jitter=0),
+            timeouts=timeouts or Timeouts(default=5, connect=2),
+            **kwargs
+        )
+        assert client.authenticate()
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.session.close()
+
+def requests_to(controller, path):
+    return controller.state.request_counts.get(path, 0)
\ No newline at end of file
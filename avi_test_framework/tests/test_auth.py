@@ -0,0 +1,63 @@
+import threading
+
+from framework.auth import TokenCache
+
+from conftest import requests_to
+
+def test_concurrent_401s_refresh_token_once(controller, make_client):
+    client = make_client()
+    virtual_services = client.get_virtual_services(refresh=True)[:16]
+    assert requests_to(controller, '/login1') == 1
+    with controller.state.lock:
+        controller.state.tokens.clear()
+
+    barrier = threading.Barrier(len(virtual_services))
+    results = {}
+
+    def fetch(uuid):
+        barrier.wait()
+        results[uuid] = client.get_virtual_service(uuid)
+
+    threads = [threading.Thread(target=fetch, args=(vs['uuid'],)) for vs in virtual_services]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(results[vs['uuid']] is not None for vs in virtual_services)
+    assert requests_to(controller, '/login1') == 2
+
+def test_refresh_reuses_token_from_another_thread(controller, make_client):
+    client = make_client()
+    stale = client.token
+    with controller.state.lock:
+        controller.state.tokens.clear()
+    assert client._refresh_token(stale)
+    fresh = client.token
+
+    # A second caller that saw the same stale token must not log in again
+    assert client._refresh_token(stale)
+    assert client.token == fresh
+    assert requests_to(controller, '/login1') == 2
+
+def test_cached_token_is_reused_across_clients(controller, make_client, tmp_path):
+    cache_file = str(tmp_path / 'token_cache')
+    first = make_client(token_cache=TokenCache(cache_file))
+    second = make_client(token_cache=TokenCache(cache_file))
+
+    assert second.token == first.token
+    assert requests_to(controller, '/login1') == 1
+
+def test_rejected_cached_token_is_replaced(controller, make_client, tmp_path):
+    cache_file = str(tmp_path / 'token_cache')
+    first = make_client(token_cache=TokenCache(cache_file))
+    with controller.state.lock:
+        controller.state.tokens.clear()
+
+    second = make_client(token_cache=TokenCache(cache_file))
+    assert second.get_tenants()
+    assert second.token != first.token
+    # The next process picks up the refreshed token instead of logging in
+    third = make_client(token_cache=TokenCache(cache_file))
+    assert third.token == second.token
+    assert requests_to(controller, '/login1') == 2
\ No newline at end of file
@@ -0,0 +1,47 @@
+from framework.bulk import BulkExecutor, select_virtual_services
+
+def disabled(controller):
+    with controller.state.lock:
+        return [vs['uuid'] for vs in controller.state.virtual_services if not vs['enabled']]
+
+def test_selector_matches_name_tenant_and_se_group(controller):
+    state = controller.state
+    admin = state.tenants[0]
+    se_group = state.se_groups[0]
+
+    selected = select_virtual_services(
+        state.virtual_services,
+        {'name': 'backend-vs-t1r_1000-1*', 'tenant': 'admin', 'se_group': se_group},
+        state.tenants
+    )
+
+    assert selected
+    for vs in selected:
+        assert vs['name'].startswith('backend-vs-t1r_1000-1')
+        assert vs['tenant_ref'].endswith(admin['uuid'])
+        assert vs['se_group_ref'].endswith(se_group)
+    assert select_virtual_services(state.virtual_services, {'name': 'no-such-vs-*'}) == []
+
+def test_failed_update_rolls_back_the_rest(controller, make_client):
+    client = make_client(max_retries=0)
+    virtual_services = client.get_virtual_services(refresh=True)[:10]
+    broken = virtual_services[4]['uuid']
+    controller.inject_fault(f"/api/virtualservice/{broken}", status=400, method='PUT')
+
+    result = BulkExecutor(client, concurrency=4).apply(virtual_services, {'enabled': False})
+
+    assert list(result.failed) == [broken]
+    assert len(result.succeeded) == 9
+    assert sorted(result.rolled_back) == sorted(result.succeeded)
+    assert not result.rollback_failed
+    assert disabled(controller) == []
+
+def test_failed_update_without_rollback_keeps_changes(controller, make_client):
+    client = make_client(max_retries=0)
+    virtual_services = client.get_virtual_services(refresh=True)[:5]
+    controller.inject_fault(f"/api/virtualservice/{virtual_services[0]['uuid']}", status=400, method='PUT')
+
+    result = BulkExecutor(client, rollback=False).apply(virtual_services, {'enabled': False})
+
+    assert not result.ok
+    assert len(disabled(controller)) == 4
\ No newline at end of file
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from framework.bulk import BulkExecutor
+from framework.cancellation import CancelToken, Cancelled, shield, sleep
+from framework import scheduler
+
+from test_bulk import disabled
+
+def test_first_cancel_wins_and_runs_callbacks():
+    token = CancelToken()
+    calls = []
+    token.on_cancel(lambda: calls.append('early'))
+
+    assert token.cancel('first')
+    assert not token.cancel('second')
+    token.on_cancel(lambda: calls.append('late'))
+
+    assert token.reason == 'first'
+    assert calls == ['early', 'late']
+    with pytest.raises(Cancelled):
+        token.raise_if_cancelled()
+
+def test_shield_lets_cleanup_run():
+    token = CancelToken()
+    token.cancel('stop')
+
+    with shield():
+        token.raise_if_cancelled()
+        sleep(0, token)
+    with pytest.raises(Cancelled):
+        sleep(0, token)
+
+def test_sleep_wakes_on_cancel():
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel, args=('stop',)).start()
+
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        sleep(5, token)
+    assert time.monotonic() - start < 1
+
+def test_cancelled_graph_skips_cases_not_started():
+    test_cases = [{'name': f"case-{i}"} for i in range(6)]
+    graph = scheduler.TestGraph.build(test_cases)
+    token = CancelToken()
+
+    def execute(node):
+        if node == 1:
+            token.cancel('fail-fast: case-1 failed')
+            return {'status': 'FAIL'}
+        time.sleep(0.05)
+        return {'status': 'PASS'}
+
+    results = graph.run_threaded(execute, lambda node, reason: {'status': 'SKIP', 'error': reason}, 2, token)
+
+    assert results[1]['status'] == 'FAIL'
+    skipped = [result for result in results if result['status'] == 'SKIP']
+    assert skipped and all(result['error'] == 'fail-fast: case-1 failed' for result in skipped)
+
+def test_cancel_aborts_request_in_flight(controller, make_client):
+    client = make_client(max_retries=0)
+    token = CancelToken()
+    client.bind_cancel_token(token)
+    controller.inject_fault('/api/tenant', delay=3)
+    threading.Timer(0.2, token.cancel, args=('stop',)).start()
+
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        client.get_tenants()
+    assert time.monotonic() - start < 1
+
+def test_cancelled_run_rolls_back_then_raises(controller, make_client):
+    # Fail-fast elsewhere in the run cancels the token part way through the bulk update
+    client = make_client()
+    virtual_services = client.get_virtual_services(refresh=True)[:10]
+    token = CancelToken()
+    client.bind_cancel_token(token)
+    update = client.update_virtual_service
+    updates = []
+
+    def update_then_cancel(uuid, payload):
+        response = update(uuid, payload)
+        updates.append(uuid)
+        if len(updates) == 3:
+            token.cancel('fail-fast: another case failed')
+        return response
+
+    client.update_virtual_service = update_then_cancel
+
+    with pytest.raises(Cancelled):
+        BulkExecutor(client, concurrency=1).apply(virtual_services, {'enabled': False})
+
+    # The three applied updates were reverted under the cancelled token, nothing else was sent
+    assert len(updates) == 6
+    assert disabled(controller) == []
\ No newline at end of file
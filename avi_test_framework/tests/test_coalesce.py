@@ -0,0 +1,76 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import requests_to
+from framework.coalesce import SingleFlight
+from framework.records import DEFAULT_FIELDS
+
+def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return ('result',)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flights.do, 'key', work) for _ in range(4)]
+        while flights.executed + flights.coalesced < 4:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert calls == [1]
+    assert flights.coalesced == 3
+    assert all(result is results[0] for result in results)
+    assert flights.do('key', lambda: 'again') == 'again'
+
+def test_failure_reaches_every_waiter_and_is_not_cached():
+    flights = SingleFlight()
+
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        flights.do('key', fail)
+    assert flights.do('key', lambda: 'ok') == 'ok'
+
+def test_coalesced_gets_return_separate_responses(controller, make_client):
+    client = make_client()
+    path = '/api/virtualservice'
+    url = client._url('virtual_services')
+    before = requests_to(controller, path)
+    controller.inject_fault(path, delay=0.3)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(lambda _: client._request('GET', url, endpoint='virtual_services'),
+                                      range(4)))
+
+    assert requests_to(controller, path) - before == 1
+    assert len({id(response) for response in responses}) == 4
+    assert len({id(response.headers) for response in responses}) == 4
+    responses[0].headers['X-Test'] = 'changed'
+    assert 'X-Test' not in responses[1].headers
+    assert all(response.json() == responses[0].json() for response in responses)
+
+@pytest.mark.parametrize('projection', [None, {'virtual_services': DEFAULT_FIELDS['virtual_services']}])
+def test_shared_virtual_services_are_read_only(make_client, projection):
+    client = make_client(projection=projection)
+    vs = client.get_virtual_services(refresh=True)[0]
+
+    with pytest.raises((TypeError, AttributeError)):
+        vs['enabled'] = False
+    assert client.get_virtual_services()[0] is vs
+    assert client.get_virtual_service_by_name(vs['name']) is vs
+
+def test_reads_after_a_write_see_the_write(controller, make_client):
+    client = make_client()
+    vs = client.get_virtual_services(refresh=True)[0]
+
+    assert client.update_virtual_service(vs['uuid'], {**vs, 'enabled': False})
+    assert client.get_virtual_service_by_name(vs['name'])['enabled'] is False
\ No newline at end of file
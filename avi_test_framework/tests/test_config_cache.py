@@ -0,0 +1,64 @@
+import json
+import os
+import stat
+
+import pytest
+
+from framework import utils
+from framework.utils import load_config
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / 'cache'
+    monkeypatch.setenv('AVI_CONFIG_CACHE', str(path))
+    return path
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    real_load = utils.yaml.load
+
+    def load(*args, **kwargs):
+        calls.append(1)
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(utils.yaml, 'load', load)
+    return calls
+
+def test_unchanged_config_is_read_from_the_cache(tmp_path, cache_dir, parses):
+    config = tmp_path / 'config.yaml'
+    config.write_text('api:\n  page_size: 200\n')
+
+    assert load_config(str(config)) == {'api': {'page_size': 200}}
+    assert load_config(str(config)) == {'api': {'page_size': 200}}
+    os.utime(config, ns=(0, 0))
+    assert load_config(str(config)) == {'api': {'page_size': 200}}
+    assert len(parses) == 1
+
+    config.write_text('api:\n  page_size: 500\n')
+    assert load_config(str(config)) == {'api': {'page_size': 500}}
+    assert len(parses) == 2
+
+    [entry] = cache_dir.iterdir()
+    assert json.loads(entry.read_text())['config'] == {'api': {'page_size': 500}}
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+
+@pytest.mark.parametrize('text', ['ports:\n  80: http\n', 'released: 2026-10-18\n'])
+def test_configs_json_cannot_hold_are_not_cached(tmp_path, cache_dir, parses, text):
+    config = tmp_path / 'config.yaml'
+    config.write_text(text)
+
+    first = load_config(str(config))
+    assert load_config(str(config)) == first
+    assert len(parses) == 2
+    assert not cache_dir.exists() or not list(cache_dir.iterdir())
+
+def test_corrupt_cache_entries_are_ignored(tmp_path, cache_dir, parses):
+    config = tmp_path / 'config.yaml'
+    config.write_text('a: 1\n')
+    load_config(str(config))
+    [entry] = cache_dir.iterdir()
+    entry.write_text('{"version": 2, "config"')
+
+    assert load_config(str(config)) == {'a': 1}
+    assert len(parses) == 2
\ No newline at end of file
@@ -0,0 +1,74 @@
+from framework.mock_controller import MODIFIED_SINCE_PARAM
+
+def record_statuses(client):
+    statuses = []
+    client.session.hooks['response'].append(lambda response, *args, **kwargs: statuses.append(response.status_code))
+    return statuses
+
+def test_etag_refresh_reuses_unchanged_pages(controller, make_client):
+    client = make_client(page_size=30, delta_refresh={'enabled': True})
+    before = {vs['uuid']: vs for vs in client.get_virtual_services(refresh=True)}
+    changed = controller.state.virtual_services[40]['uuid']
+    controller.state.update_virtual_service(changed, {'enabled': False})
+    statuses = record_statuses(client)
+
+    after = {vs['uuid']: vs for vs in client.get_virtual_services(refresh=True)}
+
+    # Only page 2 (objects 30-59) changed; the rest came back 304
+    assert statuses == [304, 200, 304, 304]
+    assert after.keys() == before.keys()
+    assert after[changed]['enabled'] is False
+    assert all(after[uuid] is before[uuid] for uuid in before if uuid != changed)
+
+def test_etag_refresh_picks_up_additions_and_deletions(controller, make_client):
+    client = make_client(page_size=30, delta_refresh={'enabled': True})
+    client.get_virtual_services(refresh=True)
+    with controller.state.lock:
+        removed = controller.state.virtual_services.pop(0)
+        del controller.state.vs_by_uuid[removed['uuid']]
+
+    uuids = {vs['uuid'] for vs in client.get_virtual_services(refresh=True)}
+    assert len(uuids) == 99
+    assert removed['uuid'] not in uuids
+
+def test_failed_etag_refresh_keeps_inventory_and_timestamp(controller, make_client):
+    client = make_client(page_size=30, max_retries=0, delta_refresh={'enabled': True})
+    client.get_virtual_services(refresh=True)
+    last_full_refresh = client._last_full_refresh
+    controller.inject_fault('/api/virtualservice', status=502, page=3)
+
+    assert len(client.get_virtual_services(refresh=True)) == 100
+    assert client._last_full_refresh == last_full_refresh
+
+def test_modified_since_refresh_patches_only_changes(controller, make_client):
+    client = make_client(page_size=30, delta_refresh={
+        'enabled': True,
+        'modified_since_param': MODIFIED_SINCE_PARAM,
+        'full_refresh_interval': 3600
+    })
+    before = {vs['uuid']: vs for vs in client.get_virtual_services(refresh=True)}
+    changed = controller.state.virtual_services[7]['uuid']
+    controller.state.update_virtual_service(changed, {'enabled': False})
+    urls = []
+    client.session.hooks['response'].append(lambda response, *args, **kwargs: urls.append(response.url))
+
+    after = {vs['uuid']: vs for vs in client.get_virtual_services(refresh=True)}
+
+    # One page holding just the changed VS instead of a full walk
+    assert len(urls) == 1 and MODIFIED_SINCE_PARAM in urls[0]
+    assert after[changed]['enabled'] is False
+    assert after.keys() == before.keys()
+
+def test_failed_modified_since_refresh_keeps_marker(controller, make_client):
+    client = make_client(max_retries=0, delta_refresh={
+        'enabled': True,
+        'modified_since_param': MODIFIED_SINCE_PARAM,
+        'full_refresh_interval': 3600
+    })
+    client.get_virtual_services(refresh=True)
+    marker = client.inventory.last_modified
+    controller.state.update_virtual_service(controller.state.virtual_services[0]['uuid'], {'enabled': False})
+    controller.inject_fault('/api/virtualservice', status=500)
+
+    client.get_virtual_services(refresh=True)
+    assert client.inventory.last_modified == marker
\ No newline at end of file
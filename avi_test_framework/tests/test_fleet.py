@@ -0,0 +1,54 @@
+from collections import Counter
+
+from framework.fleet import FleetTable, scan_fleet
+
+UP = {'state': 'OPER_UP'}
+DOWN = {'state': 'OPER_DOWN'}
+
+def vs(uuid, tenant, se_group, enabled=True, oper=UP):
+    return {'uuid': uuid, 'name': f"vs-{uuid}", 'enabled': enabled, 'oper_status': oper,
+            'tenant_ref': f"https://ctrl/api/tenant/{tenant}#{tenant}",
+            'se_group_ref': f"https://ctrl/api/serviceenginegroup/{se_group}"}
+
+def se(uuid, se_group, vs_uuids):
+    return {'uuid': uuid, 'name': f"se-{uuid}", 'oper_status': UP,
+            'se_group_ref': f"/api/serviceenginegroup/{se_group}",
+            'vs_refs': [f"/api/virtualservice/{uuid}" for uuid in vs_uuids]}
+
+def test_scan_counts_tenants_placement_and_orphans():
+    virtual_services = [
+        vs('a', 'admin', 'g1'), vs('b', 'admin', 'g1', enabled=False, oper=DOWN), vs('c', 'gone', 'g1'),
+        vs('d', 'admin', 'no-ses'), vs('a', 'admin', 'g1')
+    ]
+    service_engines = [se('1', 'g1', ['a', 'b']), se('2', 'g1', ['a', 'missing'])]
+    tenants = [{'uuid': 'admin', 'name': 'admin'}]
+
+    report = FleetTable.build(virtual_services, service_engines, tenants).scan()
+
+    assert (report['virtual_services'], report['service_engines']) == (4, 2)
+    assert (report['enabled'], report['oper_up']) == (3, 3)
+    assert report['tenants']['admin'] == {'total': 3, 'enabled': 2, 'disabled': 1, 'oper_up': 2, 'oper_down': 1}
+    placement = report['placement']
+    assert placement['placements'] == 3
+    assert (placement['unplaced'], placement['unplaced_enabled']) == (2, 2)
+    assert placement['ses_per_vs'] == {'0': 2, '1': 1, '2': 1}
+    assert placement['vs_per_se'] == {'min': 1, 'mean': 1.5, 'max': 2}
+    assert placement['busiest_se'] == 'se-1'
+    orphans = report['orphans']
+    assert orphans['se_vs_refs'] == 1
+    assert orphans['vs_se_group_refs'] == 1 and orphans['vs_se_group_sample'] == ['no-ses']
+    assert orphans['vs_tenant_refs'] == 1 and orphans['vs_tenant_sample'] == ['gone']
+
+def test_scan_matches_a_direct_count_on_the_mock_fleet(controller, make_client):
+    client = make_client()
+    virtual_services = client.get_virtual_services(refresh=True)
+    service_engines = client.get_service_engines()
+
+    report = scan_fleet(client)
+
+    placements = Counter(ref.rsplit('/', 1)[-1] for se in service_engines for ref in se.get('vs_refs') or ())
+    assert report['virtual_services'] == len(virtual_services)
+    assert report['enabled'] == sum(1 for vs in virtual_services if vs.get('enabled'))
+    assert report['placement']['placements'] == sum(placements[vs['uuid']] for vs in virtual_services)
+    assert report['placement']['unplaced'] == sum(1 for vs in virtual_services if not placements[vs['uuid']])
+    assert sum(counts['total'] for counts in report['tenants'].values()) == len(virtual_services)
\ No newline at end of file
@@ -0,0 +1,51 @@
+import json
+import os
+import stat
+
+import pytest
+
+from conftest import requests_to
+from framework.http_cache import ResponseCache
+from framework.mock_controller import MockController
+
+@pytest.fixture
+def controller():
+    with MockController(virtual_services=10, cache_max_age=60) as mock:
+        yield mock
+
+def test_fresh_listing_is_served_without_a_round_trip(controller, make_client):
+    cache = ResponseCache()
+    client = make_client(http_cache=cache)
+
+    first = client.get_tenants()
+    second = client.get_tenants()
+
+    assert second == first
+    assert requests_to(controller, '/api/tenant') == 1
+    assert cache.stats()['hits'] == 1
+
+def test_disk_tier_is_private_json_shared_across_clients(controller, make_client, tmp_path):
+    disk_dir = tmp_path / 'http_cache'
+    tenants = make_client(http_cache=ResponseCache(disk_dir=str(disk_dir))).get_tenants()
+
+    later = ResponseCache(disk_dir=str(disk_dir))
+    assert make_client(http_cache=later).get_tenants() == tenants
+    assert requests_to(controller, '/api/tenant') == 1
+    assert later.stats()['disk_loads'] == 1
+
+    assert stat.S_IMODE(os.stat(disk_dir).st_mode) == 0o700
+    [path] = disk_dir.iterdir()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    data = json.loads(path.read_text())
+    assert data['entry']['status'] == 200
+
+def test_unreadable_disk_entries_are_refetched(controller, make_client, tmp_path):
+    disk_dir = tmp_path / 'http_cache'
+    make_client(http_cache=ResponseCache(disk_dir=str(disk_dir))).get_tenants()
+    [path] = disk_dir.iterdir()
+    path.write_text('{"version": 2, "entry": {"content": "not base64!"}}')
+
+    later = ResponseCache(disk_dir=str(disk_dir))
+    assert make_client(http_cache=later).get_tenants()
+    assert requests_to(controller, '/api/tenant') == 2
+    assert later.stats()['disk_loads'] == 0
\ No newline at end of file
@@ -0,0 +1,64 @@
+import logging
+
+import pytest
+
+from framework import utils
+from framework.utils import case_log_buffer, setup_logging, stop_logging
+
+@pytest.fixture
+def log_file(tmp_path):
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    path = tmp_path / 'test.log'
+    yield path
+    stop_logging()
+    root.handlers, root.level = handlers, level
+
+def lines(path):
+    return [line.split(' - ', 2)[2] for line in path.read_text().splitlines()]
+
+def test_arguments_are_captured_when_logged(log_file):
+    setup_logging(log_file=str(log_file), rotate=False)
+    logger = logging.getLogger('avi.test')
+    state = ['before']
+
+    with case_log_buffer():
+        logger.info("state %s", state)
+        state[0] = 'after'
+        logger.info("state %s", state)
+    stop_logging()
+
+    assert lines(log_file) == ["state ['before']", "state ['after']"]
+
+def test_case_buffers_do_not_interleave(log_file):
+    setup_logging(log_file=str(log_file), rotate=False)
+    logger = logging.getLogger('avi.test')
+
+    with case_log_buffer():
+        logger.info("case one: start")
+        with case_log_buffer():
+            logger.info("case one: nested")
+        logger.info("case one: end")
+        logger.info("outside the case? %s", "no")
+    stop_logging()
+
+    assert lines(log_file) == ["case one: start", "case one: nested", "case one: end", "outside the case? no"]
+
+class FakeAtexit:
+    def __init__(self):
+        self.callbacks = []
+
+    def register(self, func):
+        self.callbacks.append(func)
+
+    def unregister(self, func):
+        self.callbacks = [callback for callback in self.callbacks if callback != func]
+
+def test_setup_twice_closes_old_handlers_and_registers_atexit_once(log_file, monkeypatch):
+    fake_atexit = FakeAtexit()
+    monkeypatch.setattr(utils, 'atexit', fake_atexit)
+    first = setup_logging(log_file=str(log_file), rotate=False)
+    setup_logging(log_file=str(log_file), rotate=False)
+
+    assert fake_atexit.callbacks == [stop_logging]
+    assert all(handler.stream is None for handler in first.handlers if isinstance(handler, logging.FileHandler))
\ No newline at end of file
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from framework.operations import LocalBackend, OperationExecutor, OperationResult
+
+class SlowBackend:
+    """Each step takes ``seconds``; fails the operations named in ``failing``."""
+
+    name = 'slow'
+
+    def __init__(self, seconds: float = 0.0, failing=()):
+        self.seconds = seconds
+        self.failing = set(failing)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def run(self, host, op, timeout):
+        with self._lock:
+            self.calls.append((host, op['operation']))
+        time.sleep(self.seconds)
+        return OperationResult(host, op['type'], op['operation'], ok=op['operation'] not in self.failing,
+                               error='boom' if op['operation'] in self.failing else None)
+
+    def close(self):
+        pass
+
+def ops(host, count, **extra):
+    return [{'type': 'ssh', 'operation': f"step-{i}", 'host': host, **extra} for i in range(count)]
+
+def test_hostless_operations_follow_last_connect():
+    executor = OperationExecutor(SlowBackend())
+    plan = executor._plan([
+        {'type': 'ssh', 'operation': 'connect', 'hosts': ['a', 'b']},
+        {'type': 'ssh', 'operation': 'execute_command', 'command': 'uptime'},
+        {'type': 'rdp', 'operation': 'validate_connection'}
+    ])
+
+    assert [op['operation'] for op, _ in plan['a']] == ['connect', 'execute_command']
+    assert [op['operation'] for op, _ in plan['b']] == ['connect', 'execute_command']
+    assert [op['operation'] for op, _ in plan['localhost']] == ['validate_connection']
+
+def test_steps_after_a_failure_are_reported_as_skipped():
+    backend = SlowBackend(failing={'step-1'})
+    results = OperationExecutor(backend).run(ops('a', 4))
+
+    assert backend.calls == [('a', 'step-0'), ('a', 'step-1')]
+    assert [(r.operation, r.ok, r.skipped) for r in results] == [
+        ('step-0', True, False), ('step-1', False, False), ('step-2', False, True), ('step-3', False, True)
+    ]
+
+def test_host_budget_stops_remaining_steps():
+    # The backend overruns every timeout, so only the deadline check stops it
+    backend = SlowBackend(seconds=0.15)
+    results = OperationExecutor(backend, timeout=0.1).run(ops('a', 5))
+
+    assert len(backend.calls) < 5
+    assert len(results) == 5
+    assert results[-1].error == 'host did not finish within 0.5s'
+    assert not results[-1].skipped
+
+def test_hosts_queued_behind_other_cases_are_not_timed_out():
+    # One pool slot shared by two concurrent runs: hosts wait longer than their budget to start
+    executor = OperationExecutor(SlowBackend(seconds=0.2), max_parallel_hosts=1, timeout=0.3)
+    outcomes = []
+    runs = [threading.Thread(target=lambda host: outcomes.append(executor.run(ops(host, 1) + ops(host + '2', 1))),
+                             args=(host,)) for host in ('a', 'b')]
+    for run in runs:
+        run.start()
+    for run in runs:
+        run.join()
+    executor.close()
+
+    assert [result.ok for results in outcomes for result in results] == [True] * 4
+
+def test_local_backend_runs_argv_without_a_shell():
+    op = {'type': 'ssh', 'operation': 'execute_command', 'command': 'echo "a b" | tr a z'}
+
+    assert LocalBackend().run('host-1', op, 5).output == 'a b | tr a z\n'
+    assert LocalBackend(shell=True).run('host-1', op, 5).output == 'z b\n'
\ No newline at end of file
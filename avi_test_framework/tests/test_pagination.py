@@ -0,0 +1,50 @@
+import pytest
+
+from framework.api_client import APIClient, CollectionFetchError
+from framework.mock_controller import MockController
+
+from conftest import requests_to
+
+def test_pagination_walks_every_page(controller, make_client):
+    client = make_client(page_size=30)
+
+    virtual_services = client.get_virtual_services(refresh=True)
+    assert len({vs['uuid'] for vs in virtual_services}) == 100
+    assert requests_to(controller, '/api/virtualservice') == 4
+
+def test_pagination_with_prefetch(controller, make_client):
+    client = make_client(page_size=30, prefetch_pages=True)
+
+    assert [vs['uuid'] for vs in client.iter_virtual_services()] == \
+        [vs['uuid'] for vs in controller.state.virtual_services]
+
+def test_empty_collection_is_not_an_error():
+    with MockController(virtual_services=0) as controller:
+        client = APIClient(controller.url, {'username': 'tester', 'password': 'secret'})
+        assert client.authenticate()
+        assert client.get_virtual_services(refresh=True) == []
+
+def test_mid_walk_failure_raises(controller, make_client):
+    client = make_client(page_size=30, max_retries=0)
+    controller.inject_fault('/api/virtualservice', status=404, page=3)
+
+    with pytest.raises(CollectionFetchError) as excinfo:
+        list(client.iter_virtual_services())
+    assert excinfo.value.status == 404
+    assert 'page=3' in excinfo.value.url
+
+def test_mid_walk_failure_keeps_previous_inventory(controller, make_client):
+    client = make_client(page_size=30, max_retries=0)
+    before = client.get_virtual_services(refresh=True)
+    controller.inject_fault('/api/virtualservice', status=500, page=2)
+
+    assert len(client.get_virtual_services(refresh=True)) == len(before) == 100
+    assert requests_to(controller, '/api/virtualservice') == 4 + 2
+
+def test_mid_walk_failure_without_inventory_raises(controller, make_client):
+    client = make_client(page_size=30, max_retries=0)
+    controller.inject_fault('/api/virtualservice', status=500, page=4)
+
+    with pytest.raises(CollectionFetchError):
+        client.get_virtual_services(refresh=True)
+    assert not client.inventory.loaded
\ No newline at end of file
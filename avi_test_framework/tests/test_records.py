@@ -0,0 +1,45 @@
+import logging
+import pickle
+
+import pytest
+
+from conftest import requests_to
+from framework import records
+from framework.records import DEFAULT_FIELDS, record_type
+
+def test_records_read_like_dicts_and_load_the_rest_once():
+    loads = []
+
+    def loader(uuid):
+        loads.append(uuid)
+        return {'uuid': uuid, 'name': 'vs-1', 'pool_ref': '/api/pool/p-1'}
+
+    VsRecord = record_type('VsRecord', ['enabled'], loader)
+    vs = VsRecord({'uuid': 'vs-uuid', 'name': 'vs-1', 'enabled': True, 'pool_ref': 'dropped'})
+
+    assert vs['name'] == 'vs-1' and vs.get('enabled') is True
+    assert dict(vs) == {'uuid': 'vs-uuid', 'name': 'vs-1', 'enabled': True}
+    assert not vs.loaded
+    assert vs['pool_ref'] == '/api/pool/p-1' and 'pool_ref' in vs
+    assert loads == ['vs-uuid']
+    with pytest.raises(AttributeError):
+        vs.enabled = False
+    assert pickle.loads(pickle.dumps(vs)) == dict(vs)
+
+def test_fields_must_be_identifiers():
+    with pytest.raises(ValueError):
+        record_type('BadRecord', ['pool.name'])
+
+def test_projected_listing_warns_once_per_missing_field(controller, make_client, caplog, monkeypatch):
+    monkeypatch.setattr(records, '_warned_fields', set())
+    client = make_client(projection={'virtual_services': DEFAULT_FIELDS['virtual_services']})
+    virtual_services = client.get_virtual_services(refresh=True)[:3]
+    before = requests_to(controller, '/api/virtualservice')
+
+    with caplog.at_level(logging.WARNING, logger='framework.records'):
+        services = [vs.get('services') for vs in virtual_services]
+
+    assert all(services)
+    assert sum(requests_to(controller, f"/api/virtualservice/{vs['uuid']}") for vs in virtual_services) == 3
+    assert requests_to(controller, '/api/virtualservice') == before
+    assert caplog.text.count("'services' is not in the") == 1
\ No newline at end of file
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from framework.result_store import ResultStore, _t_upper_tail, slowdown
+
+def record(store, run_id, duration, cases=('case-a', 'case-b')):
+    results = [{'test_case_name': name, 'status': 'PASS', 'duration': duration} for name in cases]
+    store.record_run({'run_id': run_id, 'duration': duration, 'engine': 'sequential', 'selection': 'all',
+                      'passed': len(results)}, results)
+
+@pytest.mark.parametrize('t, df, expected', [(2.015, 5, 0.05), (3.365, 5, 0.01), (1.96, 10000, 0.025),
+                                             (0.0, 3, 0.5), (-2.015, 5, 0.95)])
+def test_t_tail_matches_tables(t, df, expected):
+    assert _t_upper_tail(t, df) == pytest.approx(expected, abs=5e-4)
+
+def test_false_alarm_rate_stays_at_alpha_with_small_baselines():
+    rng = random.Random(7)
+    trials = 20000
+    alarms = sum(
+        slowdown([rng.lognormvariate(0, 0.3) for _ in range(5)], [rng.lognormvariate(0, 0.3)])[1] < 0.01
+        for _ in range(trials)
+    )
+    assert alarms / trials < 0.015
+
+def test_compare_flags_a_real_slowdown(tmp_path):
+    rng = random.Random(3)
+    with ResultStore(str(tmp_path / 'results.db')) as store:
+        for i in range(10):
+            record(store, f"run-{i}", rng.uniform(0.95, 1.05))
+        record(store, 'slow', 3.0)
+
+        report = store.compare('slow')
+
+    assert report['baseline_runs'] == 10
+    assert {regression['metric'] for regression in report['regressions']} >= {'case-a', 'case-b'}
+    assert all(regression['ratio'] > 2 for regression in report['regressions'])
+
+def test_compare_ignores_normal_noise_and_short_history(tmp_path):
+    rng = random.Random(5)
+    with ResultStore(str(tmp_path / 'results.db')) as store:
+        for i in range(3):
+            record(store, f"run-{i}", rng.uniform(0.9, 1.1))
+        short = store.compare()
+        for i in range(3, 12):
+            record(store, f"run-{i}", rng.uniform(0.9, 1.1))
+        steady = store.compare()
+
+    assert short['compared'] == 0 and short['insufficient_history'] > 0
+    assert steady['compared'] > 0 and steady['regressions'] == []
\ No newline at end of file
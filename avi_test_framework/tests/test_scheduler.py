@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from framework import scheduler
+
+def case(name, action=None, vs=None, **extra):
+    test_case = {'name': name, **extra}
+    if vs:
+        test_case['target_virtual_service'] = vs
+    if action:
+        test_case['stages'] = {'trigger': {'enabled': True, 'action': action}}
+    return test_case
+
+def status(results):
+    return [result['status'] for result in results]
+
+def test_writers_order_conflicting_cases_and_readers_run_together():
+    graph = scheduler.TestGraph.build([
+        case('read-a', vs='a'), case('read-a-again', vs='a'), case('disable-a', 'disable', 'a'),
+        case('disable-b', 'disable', 'b'), case('read-all', reads=['vs:*'])
+    ])
+
+    assert graph.preds == [set(), set(), {0, 1}, set(), {2, 3}]
+    assert graph.hard_preds == [set()] * 5
+    assert graph.levels() == 3
+    assert graph.components() == [[0, 1, 2, 3, 4]]
+
+def test_a_failed_dependency_skips_only_its_dependants():
+    graph = scheduler.TestGraph.build([
+        case('create'), case('use', depends_on='create'), case('conflicting', writes=['x']),
+        case('after-conflict', writes=['x'])
+    ])
+    outcomes = {'create': 'FAIL', 'conflicting': 'FAIL'}
+
+    results = graph.run_sequential(
+        lambda node: {'status': outcomes.get(graph.names[node], 'PASS')},
+        lambda node, reason: {'status': 'SKIP', 'error': reason}
+    )
+
+    assert status(results) == ['FAIL', 'SKIP', 'FAIL', 'PASS']
+    assert results[1]['error'] == 'dependency create did not pass'
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError, match='cycle'):
+        scheduler.TestGraph.build([case('a', depends_on='b'), case('b', depends_on='a')])
+    with pytest.raises(ValueError, match='unknown'):
+        scheduler.TestGraph.build([case('a', depends_on='missing')])
+    with pytest.raises(ValueError, match='Duplicate'):
+        scheduler.TestGraph.build([case('a'), case('a')])
+
+def test_selection_pulls_in_dependencies_in_file_order():
+    test_cases = [case('base'), case('middle', depends_on='base'), case('top', depends_on=['middle']),
+                  case('other')]
+
+    assert [tc['name'] for tc in scheduler.select_test_cases(test_cases, ['top'])] == ['base', 'middle', 'top']
+    with pytest.raises(ValueError):
+        scheduler.select_test_cases(test_cases, ['nope'])
+
+def test_partition_keeps_connected_cases_together():
+    test_cases = [case('disable-a', 'disable', 'a'), case('enable-a', 'enable', 'a'), case('read-b', vs='b'),
+                  case('read-c', vs='c')]
+
+    parts = scheduler.partition(test_cases, 2)
+
+    assert [0, 1] in parts
+    assert sorted(index for part in parts for index in part) == [0, 1, 2, 3]
+    assert scheduler.partition([case(f"c{i}") for i in range(4)], 2) == [[0, 2], [1, 3]]
+
+def test_critical_path_follows_the_longest_chain():
+    graph = scheduler.TestGraph.build([case('a', writes=['x']), case('b', writes=['x']), case('c')])
+
+    assert graph.critical_path([1.0, 2.0, 2.5]) == (3.0, ['a', 'b'])
+
+def test_threaded_run_is_bounded_and_keeps_input_order():
+    graph = scheduler.TestGraph.build([{'name': f"case-{i}"} for i in range(20)])
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def execute(node):
+        with lock:
+            running.append(node)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(node)
+        return {'test_case_name': graph.names[node], 'status': 'PASS'}
+
+    results = graph.run_threaded(execute, lambda node, reason: None, 4)
+
+    assert max(peak) == 4
+    assert [result['test_case_name'] for result in results] == graph.names
\ No newline at end of file
@@ -0,0 +1,96 @@
+import logging
+import threading
+import time
+
+from framework.cancellation import sleep
+from framework.soak import SoakRunner
+
+class FakeRunner:
+    """Records which cases overlap; each case takes ``seconds`` and can be cancelled."""
+
+    def __init__(self, seconds: float = 0.01):
+        self.seconds = seconds
+        self.cancel_token = None
+        self.api_client = self
+        self.started = []
+        self.overlaps = 0
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def bind_cancel_token(self, token):
+        self.bound = token
+
+    def prepare(self, test_cases):
+        pass
+
+    def close(self):
+        pass
+
+    def run_one(self, test_case_config):
+        name = test_case_config['name']
+        group = test_case_config['writes'][0]
+        with self._lock:
+            self.started.append(name)
+            self.overlaps += group in self._running
+            self._running.add(group)
+        try:
+            sleep(self.seconds, self.cancel_token)
+        except BaseException:
+            return {'status': 'SKIP'}
+        finally:
+            with self._lock:
+                self._running.discard(group)
+        return {'status': 'PASS'}
+
+def case(name, vs):
+    return {'name': name, 'writes': [f"vs:{vs}"]}
+
+PAIR = [case('disable-a', 'a'), case('enable-a', 'a'), case('disable-b', 'b'), case('enable-b', 'b')]
+
+def order_within(started, prefix):
+    return [name for name in started if name.endswith(prefix)]
+
+def test_closed_loop_caps_concurrency_at_the_group_count(caplog):
+    runner = FakeRunner()
+    with caplog.at_level(logging.WARNING):
+        report = SoakRunner(runner, PAIR, duration=0.3, concurrency=8, interval=10).run()
+
+    assert 'exceeds the 2 independent case group(s)' in caplog.text
+    assert report['completed'] > 4 and report['errors'] == 0
+    assert runner.overlaps == 0
+    for vs in ('-a', '-b'):
+        started = order_within(runner.started, vs)
+        assert started[::2] == [f"disable{vs}"] * len(started[::2])
+        assert started[1::2] == [f"enable{vs}"] * len(started[1::2])
+
+def test_open_loop_queues_a_group_in_file_order():
+    runner = FakeRunner(seconds=0.02)
+    report = SoakRunner(runner, PAIR, duration=0.3, rate=200, interval=10).run()
+
+    assert runner.overlaps == 0
+    started = order_within(runner.started, '-a')
+    assert started[::2] == ['disable-a'] * len(started[::2])
+    assert started[1::2] == ['enable-a'] * len(started[1::2])
+    # Cases still queued behind a busy group when the run ends count as dropped
+    assert report['completed'] == len(runner.started)
+    assert report['dropped'] > 0
+
+def test_open_loop_drops_past_max_in_flight(caplog):
+    runner = FakeRunner(seconds=0.2)
+    with caplog.at_level(logging.WARNING):
+        report = SoakRunner(runner, PAIR[:1], duration=0.2, rate=100, interval=10, max_in_flight=3).run()
+
+    assert report['dropped'] > 0
+    assert 'dropping cases' in caplog.text
+
+def test_abort_cancels_in_flight_cases():
+    runner = FakeRunner(seconds=5)
+    soak = SoakRunner(runner, PAIR, duration=10, concurrency=2, interval=10)
+    threading.Timer(0.2, soak.abort).start()
+
+    start = time.monotonic()
+    report = soak.run()
+
+    assert time.monotonic() - start < 2
+    assert runner.bound is None and runner.cancel_token is soak.cancel_token
+    assert report['cancelled'] == 2 and report['completed'] == 0
\ No newline at end of file
@@ -0,0 +1,130 @@
+import socket
+import time
+
+import pytest
+import requests
+
+from framework.api_client import APIClient, CollectionFetchError
+from framework.rate_limiter import TokenBucket
+from framework.transport import Timeouts, build_session
+
+from conftest import requests_to
+
+# --- transient server errors ---
+
+@pytest.mark.parametrize('status', [500, 502, 504])
+def test_retries_transient_server_errors(controller, make_client, status):
+    client = make_client(max_retries=3)
+    controller.inject_fault('/api/tenant', status=status, times=2)
+
+    assert len(client.get_tenants()) == 5
+    assert requests_to(controller, '/api/tenant') == 3
+
+def test_gives_up_after_max_retries(controller, make_client):
+    client = make_client(max_retries=2)
+    controller.inject_fault('/api/tenant', status=502, times=5)
+
+    with pytest.raises(CollectionFetchError) as excinfo:
+        client.get_tenants()
+    assert excinfo.value.status == 502
+    assert requests_to(controller, '/api/tenant') == 3
+
+def test_client_errors_are_not_retried(controller, make_client):
+    client = make_client(max_retries=3)
+    controller.inject_fault('/api/tenant', status=400)
+
+    with pytest.raises(CollectionFetchError):
+        client.get_tenants()
+    assert requests_to(controller, '/api/tenant') == 1
+
+# --- timeouts ---
+
+def test_timeouts_per_endpoint_override():
+    timeouts = Timeouts(default=30, connect=5, per_endpoint={'tenants': 2})
+
+    assert timeouts.for_endpoint('tenants') == (2, 2)
+    assert timeouts.for_endpoint('virtual_services') == (5, 30)
+    assert timeouts.for_endpoint(None) == (5, 30)
+
+def test_timeouts_from_config():
+    timeouts = Timeouts.from_config({'timeout': 10, 'connect_timeout': 1, 'timeouts': {'service_engines': 3}})
+
+    assert timeouts.for_endpoint('service_engines') == (1, 3)
+    assert timeouts.for_endpoint('tenants') == (1, 10)
+
+def test_read_timeout_uses_endpoint_override(controller, make_client):
+    client = make_client(max_retries=0, timeouts=Timeouts(default=5, connect=1, per_endpoint={'tenants': 0.2}))
+    controller.inject_fault('/api/tenant', delay=1.0)
+    controller.inject_fault('/api/serviceengine', delay=0.5)
+
+    start = time.monotonic()
+    with pytest.raises(CollectionFetchError) as excinfo:
+        client.get_tenants()
+    assert time.monotonic() - start < 0.9
+    # With retries off urllib3 reports the read timeout wrapped in MaxRetryError
+    assert 'Read timed out' in str(excinfo.value)
+    # Endpoints without an override keep the default and ride out the delay
+    assert len(client.get_service_engines()) == 10
+
+def test_connect_timeout():
+    # A listener whose accept backlog is full drops further SYNs, so connect() hangs
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(0)
+    backlog = []
+    for _ in range(4):
+        sock = socket.socket()
+        sock.setblocking(False)
+        try:
+            sock.connect(server.getsockname())
+        except BlockingIOError:
+            pass
+        backlog.append(sock)
+    host, port = server.getsockname()
+    client = APIClient(f"http://{host}:{port}", {'username': 'tester', 'password': 'secret'},
+                       session=build_session(max_retries=0), timeouts=Timeouts(default=10, connect=0.2))
+    try:
+        start = time.monotonic()
+        with pytest.raises(CollectionFetchError) as excinfo:
+            client.get_tenants()
+        assert time.monotonic() - start < 2
+        assert isinstance(excinfo.value.__cause__, requests.exceptions.ConnectTimeout)
+    finally:
+        for sock in backlog:
+            sock.close()
+        server.close()
+
+# --- throttling (429/503) ---
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_throttling_backs_off_and_recovers(controller, make_client, status):
+    limiter = TokenBucket(rate=100, burst=100)
+    client = make_client(rate_limiter=limiter)
+    controller.inject_fault('/api/tenant', status=status, times=2, headers={'Retry-After': '0'})
+
+    assert len(client.get_tenants()) == 5
+    assert requests_to(controller, '/api/tenant') == 3
+    # Multiplicative decrease per throttled response, additive increase per success
+    assert limiter.rate == pytest.approx(100 * 0.5 * 0.5 + limiter.recovery_step)
+
+    for _ in range(20):
+        client.get_service_engines()
+    assert limiter.rate == limiter.base_rate
+
+def test_throttling_gives_up_after_throttle_retries(controller, make_client):
+    client = make_client(throttle_retries=2)
+    controller.inject_fault('/api/tenant', status=429, times=5, headers={'Retry-After': '0'})
+
+    with pytest.raises(CollectionFetchError) as excinfo:
+        client.get_tenants()
+    assert excinfo.value.status == 429
+    assert requests_to(controller, '/api/tenant') == 3
+
+def test_throttle_pause_honours_retry_after(controller, make_client):
+    limiter = TokenBucket(rate=100, burst=100)
+    client = make_client(rate_limiter=limiter)
+    controller.inject_fault('/api/tenant', status=503, headers={'Retry-After': '0.3'})
+
+    start = time.monotonic()
+    client.get_tenants()
+    assert time.monotonic() - start >= 0.3
\ No newline at end of file
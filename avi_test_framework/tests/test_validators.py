@@ -0,0 +1,61 @@
+from types import MappingProxyType
+
+import pytest
+
+from framework.validators import compile_path, compile_rule, compile_rules, rules_from_stage, summarize_violations
+
+VS = {
+    'uuid': 'vs-1',
+    'name': 'web',
+    'enabled': True,
+    'services': [{'port': 80}, {'port': 443, 'enable_ssl': True}],
+    'pool': {'members': [{'state': 'UP'}, {'state': 'DOWN'}]}
+}
+
+def test_paths_index_and_fan_out():
+    assert compile_path('services[*].port')(VS) == [80, 443]
+    assert compile_path('services[-1].enable_ssl')(VS) == [True]
+    assert compile_path('pool.members[5].state')(VS) == []
+    assert compile_path('name')(MappingProxyType(VS)) == ['web']
+    with pytest.raises(ValueError):
+        compile_path('services[x]')
+
+@pytest.mark.parametrize('spec, passes', [
+    ({'path': 'enabled', 'equals': True}, True),
+    ({'path': 'services[*].port', 'one_of': [80, 443]}, True),
+    ({'path': 'services[*].port', 'range': [1, 100]}, False),
+    ({'path': 'services[*].enable_ssl', 'equals': True}, True),
+    ({'path': 'pool.members[*].state', 'equals': 'UP', 'quantifier': 'any'}, True),
+    ({'path': 'pool.members[*].state', 'equals': 'UP'}, False),
+    ({'path': 'name', 'matches': '^w'}, True),
+    ({'path': 'health_monitor_refs', 'exists': False}, True),
+    ({'path': 'health_monitor_refs', 'equals': 1}, False),
+    ({'path': 'health_monitor_refs', 'equals': 1, 'optional': True}, True),
+    ({'any': [{'path': 'enabled', 'equals': False}, {'path': 'name', 'contains': 'we'}]}, True),
+    ({'not': {'path': 'enabled', 'equals': True}}, False)
+])
+def test_operators(spec, passes):
+    assert compile_rule(spec).test(VS) is passes
+
+def test_invalid_rules_fail_at_compile_time():
+    for spec in ({'path': 'enabled'}, {'path': 'enabled', 'equal': True}, {'path': 'name', 'matches': '('},
+                 {'all': []}, {'path': 'x', 'exists': True, 'equals': 1}):
+        with pytest.raises(ValueError):
+            compile_rule(spec)
+
+def test_stage_shorthand_runs_first_and_collects_fields():
+    rules = rules_from_stage({'validate': 'enabled', 'expected_value': False,
+                              'rules': [{'path': 'pool.members[*].state', 'equals': 'UP'}]})
+
+    assert [rule.description for rule in rules.rules] == ['enabled = False', 'pool.members[*].state = UP']
+    assert rules.fields == {'enabled', 'pool'}
+    assert [violation.actual for violation in rules.check(VS)] == [True, ['UP', 'DOWN']]
+
+def test_evaluate_reports_every_violation_by_rule():
+    rules = compile_rules([{'path': 'enabled', 'equals': True, 'name': 'enabled'}])
+    fleet = [{'name': f"vs-{i}", 'uuid': str(i), 'enabled': i % 3 != 0} for i in range(9)]
+
+    violations = rules.evaluate(fleet)
+
+    assert [violation.name for violation in violations] == ['vs-0', 'vs-3', 'vs-6']
+    assert summarize_violations(violations, sample_size=2) == {'enabled': {'count': 3, 'sample': ['vs-0', 'vs-3']}}
\ No newline at end of file